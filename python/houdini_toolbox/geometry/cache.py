@@ -0,0 +1,312 @@
+"""Module to cache point cloud trees between constructions."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from __future__ import annotations
+
+# Standard Library
+import collections
+import hashlib
+import os
+import tempfile
+from typing import Any, Optional, OrderedDict, Tuple
+
+# Third Party
+import numpy
+
+# Houdini Toolbox
+from houdini_toolbox.geometry.engines import KDTreeEngine
+
+# Houdini
+import hou
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class PointCloudCache:
+    """A least recently used cache of point cloud trees.
+
+    Trees are kept in memory keyed by the source SOP path, the data id of the
+    "P" attribute, the point count, the point pattern and the tree leaf size so
+    they can be reused between cooks as long as the point positions have not
+    changed.  Point patterns are part of these keys as text so changes to the
+    membership of a group used in a pattern will not be detected.
+
+    If a cache directory is supplied trees are also written to disk so they can
+    be shared between sessions.  Data ids are only meaningful within a session
+    so stored trees are instead keyed by a hash of the point positions and
+    numbers the tree was built from.  Only the positions and point numbers are
+    stored, as .npy files, and they are memory mapped when loaded and the tree
+    rebuilt from them.  Files which cannot be read are removed and treated as
+    missing.
+
+    :param max_size: The maximum number of trees to keep in memory.
+    :param cache_dir: Optional directory to store trees in.
+    :return:
+
+    """
+
+    def __init__(self, max_size: int = 8, cache_dir: Optional[str] = None):
+        if max_size < 1:
+            raise ValueError("max_size must be 1 or greater")
+
+        self._cache_dir = cache_dir
+        self._items: OrderedDict = collections.OrderedDict()
+        self._max_size = max_size
+
+    # -------------------------------------------------------------------------
+    # SPECIAL METHODS
+    # -------------------------------------------------------------------------
+
+    def __contains__(self, key: Tuple) -> bool:
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"<PointCloudCache {len(self)}/{self.max_size}>"
+
+    # -------------------------------------------------------------------------
+    # NON-PUBLIC METHODS
+    # -------------------------------------------------------------------------
+
+    def _get_file_paths(self, content_key: Tuple) -> Tuple[str, str]:
+        """Get the paths to the files storing the data for a content key.
+
+        :param content_key: The content key.
+        :return: The paths to the position and point number files.
+
+        """
+        digest = hashlib.sha1(repr(content_key).encode("utf-8")).hexdigest()
+
+        base_path = os.path.join(self._cache_dir, digest)  # type: ignore
+
+        return f"{base_path}.pctree.npy", f"{base_path}.pcpoints.npy"
+
+    def _load(self, content_key: Tuple) -> Optional[Tuple]:
+        """Load the data for a content key from disk.
+
+        The positions are memory mapped and the tree is rebuilt from them.  If
+        the files cannot be read they are removed so the tree will be stored
+        again.
+
+        :param content_key: The content key.
+        :return: The tree and point map, if any.
+
+        """
+        positions_path, points_path = self._get_file_paths(content_key)
+
+        if not os.path.isfile(positions_path):
+            return None
+
+        try:
+            positions = numpy.load(positions_path, mmap_mode="r")
+
+            point_map = None
+
+            if os.path.isfile(points_path):
+                point_map = numpy.load(points_path)
+
+            if positions.ndim != 2 or positions.shape[1] != 3:
+                raise ValueError("Invalid stored positions")
+
+            if point_map is not None and point_map.shape != (len(positions),):
+                raise ValueError("Invalid stored point numbers")
+
+        except (OSError, ValueError):
+            for file_path in (positions_path, points_path):
+                try:
+                    os.remove(file_path)
+
+                except OSError:
+                    pass
+
+            return None
+
+        return KDTreeEngine(positions, content_key[1]), point_map
+
+    def _set_item(self, key: Tuple, value: Any):
+        """Add data to the memory cache, evicting the least recently used data
+        if there are too many items.
+
+        :param key: The cache key.
+        :param value: The data to store.
+        :return:
+
+        """
+        self._items[key] = value
+        self._items.move_to_end(key)
+
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+    def _store(self, content_key: Tuple, value: Tuple):
+        """Write the data for a content key to disk.
+
+        Each file is written to a temporary file first so that other sessions
+        never see partially written files.  The point numbers are written
+        before the positions since the positions file marks the data as
+        complete.
+
+        :param content_key: The content key.
+        :param value: The tree and point map to store.
+        :return:
+
+        """
+        os.makedirs(self._cache_dir, exist_ok=True)  # type: ignore
+
+        tree, point_map = value
+
+        positions_path, points_path = self._get_file_paths(content_key)
+
+        for file_path, array in ((points_path, point_map), (positions_path, tree.data)):
+            if array is None:
+                continue
+
+            handle, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+
+            with os.fdopen(handle, "wb") as temp_file:
+                numpy.save(temp_file, numpy.ascontiguousarray(array))
+
+            os.replace(temp_path, file_path)
+
+    # -------------------------------------------------------------------------
+    # STATIC METHODS
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def build_content_key(
+        positions: numpy.ndarray, point_map: Optional[numpy.ndarray], leaf_size: int
+    ) -> Tuple:
+        """Build a key for storing a tree on disk from the data it is built from.
+
+        The key contains a hash of the positions and point numbers so it only
+        matches trees built from identical data, regardless of where the data
+        came from.
+
+        :param positions: An (N, 3) array of positions.
+        :param point_map: Optional array of the point numbers of the positions.
+        :param leaf_size: The tree leaf size.
+        :return: A content key.
+
+        """
+        digest = hashlib.sha1()
+
+        for array in (positions, point_map):
+            if array is not None:
+                array = numpy.ascontiguousarray(array)
+
+                digest.update(f"{array.dtype.str}{array.shape}".encode("utf-8"))
+                digest.update(array.data)
+
+        return (digest.hexdigest(), leaf_size)
+
+    @staticmethod
+    def build_key(
+        geometry: hou.Geometry, pattern: Optional[str], leaf_size: int
+    ) -> Optional[Tuple]:
+        """Build a memory cache key for the geometry.
+
+        Only geometry belonging to a SOP can be cached.  If the geometry does not
+        belong to a SOP then None is returned.
+
+        :param geometry: The source geometry.
+        :param pattern: Optional point selecting pattern.
+        :param leaf_size: The tree leaf size.
+        :return: A cache key, if one could be built.
+
+        """
+        sop_node = geometry.sopNode()
+
+        if sop_node is None:
+            return None
+
+        data_id = geometry.findPointAttrib("P").dataId()
+
+        return (
+            sop_node.path(),
+            data_id,
+            geometry.intrinsicValue("pointcount"),
+            pattern or "",
+            leaf_size,
+        )
+
+    # -------------------------------------------------------------------------
+    # PROPERTIES
+    # -------------------------------------------------------------------------
+
+    @property
+    def cache_dir(self) -> Optional[str]:
+        """The directory trees are stored in."""
+        return self._cache_dir
+
+    @property
+    def max_size(self) -> int:
+        """The maximum number of trees to keep in memory."""
+        return self._max_size
+
+    # -------------------------------------------------------------------------
+    # METHODS
+    # -------------------------------------------------------------------------
+
+    def clear(self):
+        """Remove all trees stored in memory.
+
+        :return:
+
+        """
+        self._items.clear()
+
+    def get(
+        self, key: Optional[Tuple], content_key: Optional[Tuple] = None
+    ) -> Optional[Any]:
+        """Get the data stored for a key.
+
+        If the data is not in memory and a content key is supplied it will be
+        looked for on disk.  Data found on disk will be added to the memory
+        cache.
+
+        :param key: The memory cache key.
+        :param content_key: Optional content key to look for stored data with.
+        :return: The stored data, if any.
+
+        """
+        if key is not None and key in self._items:
+            self._items.move_to_end(key)
+
+            return self._items[key]
+
+        if self._cache_dir is None or content_key is None:
+            return None
+
+        value = self._load(content_key)
+
+        if value is not None and key is not None:
+            self._set_item(key, value)
+
+        return value
+
+    def set(
+        self, key: Optional[Tuple], value: Any, content_key: Optional[Tuple] = None
+    ):
+        """Store data for a key.
+
+        The data is also written to disk if there is a cache directory and a
+        content key is supplied.
+
+        :param key: The memory cache key.
+        :param value: The data to store.
+        :param content_key: Optional content key to store the data on disk with.
+        :return:
+
+        """
+        if key is not None:
+            self._set_item(key, value)
+
+        if self._cache_dir is not None and content_key is not None:
+            self._store(content_key, value)
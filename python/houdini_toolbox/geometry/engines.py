@@ -0,0 +1,533 @@
+"""Spatial search engines used by point clouds.
+
+Each engine answers nearest neighbor and fixed radius queries over an (N, 3)
+array of positions and returns results as tree indexes into that array.
+
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from __future__ import annotations
+
+# Standard Library
+import abc
+import itertools
+from typing import Tuple
+
+# Third Party
+import numpy
+from scipy.spatial import cKDTree
+
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+# The approximate number of candidate distances to compute at once.  Queries are
+# chunked so that temporary arrays stay around this size.
+_MAX_CHUNK_ELEMENTS = 2 ** 22
+
+
+# =============================================================================
+# NON-PUBLIC FUNCTIONS
+# =============================================================================
+
+
+def _split_by_query(
+    query_indexes: numpy.ndarray,
+    indexes: numpy.ndarray,
+    num_queries: int,
+    num_elements: int,
+) -> Tuple[numpy.ndarray, ...]:
+    """Split a flat list of matches into a sorted array of indexes per query.
+
+    :param query_indexes: The index of the query each match belongs to.
+    :param indexes: The matched indexes.
+    :param num_queries: The number of queries.
+    :param num_elements: The number of elements the indexes refer to.
+    :return: An array of matched indexes for each query.
+
+    """
+    # Sorting a single combined key is much faster than a lexsort.
+    keys = numpy.sort(query_indexes.astype(numpy.int64) * num_elements + indexes)
+
+    counts = numpy.bincount(query_indexes, minlength=num_queries)
+
+    return tuple(numpy.split(keys % num_elements, numpy.cumsum(counts)[:-1]))
+
+
+def _keys_to_pairs(keys: numpy.ndarray, num_elements: int) -> numpy.ndarray:
+    """Convert combined pair keys into an array of index pairs.
+
+    :param keys: An array of keys of the form first * num_elements + second.
+    :param num_elements: The number of elements the indexes refer to.
+    :return: An (M, 2) array of index pairs.
+
+    """
+    return numpy.column_stack((keys // num_elements, keys % num_elements))
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class SpatialEngine(abc.ABC):
+    """Base class for spatial search engines.
+
+    :param data: An (N, 3) array of positions.
+    :return:
+
+    """
+
+    # The name used to select the engine.
+    name = ""
+
+    def __init__(self, data: numpy.ndarray):
+        self._data = data
+
+    # -------------------------------------------------------------------------
+    # SPECIAL METHODS
+    # -------------------------------------------------------------------------
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} num_elements={self.num_elements}>"
+
+    # -------------------------------------------------------------------------
+    # PROPERTIES
+    # -------------------------------------------------------------------------
+
+    @property
+    def data(self) -> numpy.ndarray:
+        """The positions the engine was built from."""
+        return self._data
+
+    @property
+    def num_elements(self) -> int:
+        """The number of positions the engine was built from."""
+        return len(self._data)
+
+    # -------------------------------------------------------------------------
+    # METHODS
+    # -------------------------------------------------------------------------
+
+    @abc.abstractmethod
+    def query(
+        self,
+        positions: numpy.ndarray,
+        num_points: int,
+        maxdist: float = numpy.inf,
+        workers: int = 1,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Find the closest points to each of the positions.
+
+        The results are (N, num_points) arrays of distances and indexes, ordered
+        by distance. Missing entries have an infinite distance and an index
+        equal to the number of elements.
+
+        :param positions: An (N, 3) array of search positions.
+        :param num_points: The number of points to search for.
+        :param maxdist: The maximum distance to search.
+        :param workers: The number of workers to query with.
+        :return: Arrays of distances and indexes.
+
+        """
+
+    @abc.abstractmethod
+    def query_ball_point(
+        self, positions: numpy.ndarray, maxdist: float, workers: int = 1
+    ) -> Tuple[numpy.ndarray, ...]:
+        """Find all points within the maxdist of each of the positions.
+
+        :param positions: An (N, 3) array of search positions.
+        :param maxdist: The maximum distance to search.
+        :param workers: The number of workers to query with.
+        :return: A sorted array of indexes for each position.
+
+        """
+
+    @abc.abstractmethod
+    def query_pairs(self, maxdist: float) -> numpy.ndarray:
+        """Find all pairs of points within the maxdist of each other.
+
+        :param maxdist: The maximum distance between points.
+        :return: An (M, 2) array of index pairs, with the first index of each
+                 pair less than the second, sorted by the first index.
+
+        """
+
+
+class BruteForceEngine(SpatialEngine):
+    """Engine which compares each query against every position.
+
+    This has no build cost and is the fastest option for very small clouds.
+
+    :param data: An (N, 3) array of positions.
+    :return:
+
+    """
+
+    name = "brute"
+
+    # -------------------------------------------------------------------------
+    # NON-PUBLIC METHODS
+    # -------------------------------------------------------------------------
+
+    def _iter_distances(self, positions: numpy.ndarray):
+        """Iterate over chunks of squared distances between positions and the data.
+
+        :param positions: An (N, 3) array of search positions.
+        :return: A generator of chunk start offsets and squared distances.
+
+        """
+        chunk_size = max(1, _MAX_CHUNK_ELEMENTS // max(1, self.num_elements))
+
+        for start in range(0, len(positions), chunk_size):
+            chunk = positions[start : start + chunk_size]
+
+            deltas = chunk[:, numpy.newaxis, :] - self._data[numpy.newaxis, :, :]
+
+            yield start, numpy.einsum("ijk,ijk->ij", deltas, deltas)
+
+    # -------------------------------------------------------------------------
+    # METHODS
+    # -------------------------------------------------------------------------
+
+    def query(
+        self,
+        positions: numpy.ndarray,
+        num_points: int,
+        maxdist: float = numpy.inf,
+        workers: int = 1,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        num_points = min(num_points, self.num_elements)
+
+        distances = numpy.empty((len(positions), num_points))
+        indexes = numpy.empty((len(positions), num_points), dtype=int)
+
+        for start, chunk_distances in self._iter_distances(positions):
+            # Find the closest points and then order only those.
+            nearest = numpy.argpartition(chunk_distances, num_points - 1, axis=1)
+            nearest = nearest[:, :num_points]
+
+            nearest_distances = numpy.take_along_axis(chunk_distances, nearest, 1)
+
+            order = numpy.argsort(nearest_distances, axis=1, kind="stable")
+
+            end = start + len(chunk_distances)
+            distances[start:end] = numpy.sqrt(
+                numpy.take_along_axis(nearest_distances, order, 1)
+            )
+            indexes[start:end] = numpy.take_along_axis(nearest, order, 1)
+
+        missing = distances >= maxdist
+        distances[missing] = numpy.inf
+        indexes[missing] = self.num_elements
+
+        return distances, indexes
+
+    def query_ball_point(
+        self, positions: numpy.ndarray, maxdist: float, workers: int = 1
+    ) -> Tuple[numpy.ndarray, ...]:
+        results = []
+
+        for _, chunk_distances in self._iter_distances(positions):
+            within = chunk_distances <= maxdist * maxdist
+
+            results.extend(numpy.flatnonzero(row) for row in within)
+
+        return tuple(results)
+
+    def query_pairs(self, maxdist: float) -> numpy.ndarray:
+        pairs = []
+
+        for start, chunk_distances in self._iter_distances(self._data):
+            rows, columns = numpy.nonzero(chunk_distances <= maxdist * maxdist)
+            rows += start
+
+            upper = rows < columns
+
+            pairs.append(numpy.column_stack((rows[upper], columns[upper])))
+
+        return numpy.concatenate(pairs)
+
+
+class GridEngine(SpatialEngine):
+    """Engine which hashes positions into a uniform grid of cells.
+
+    Fixed radius queries only need to examine the cells surrounding each query
+    position, which is efficient when the radius is close to the cell size and
+    many positions are queried at once.  Nearest neighbor queries are not
+    supported.
+
+    :param data: An (N, 3) array of positions.
+    :param cell_size: The size of each grid cell.
+    :return:
+
+    """
+
+    name = "grid"
+
+    def __init__(self, data: numpy.ndarray, cell_size: float):
+        super().__init__(data)
+
+        if cell_size <= 0:
+            raise ValueError("Cell size must be greater than 0")
+
+        self._cell_size = cell_size
+
+        self._origin = data.min(axis=0)
+
+        cells = self._get_cells(data)
+
+        self._dims = cells.max(axis=0) + 1
+
+        if numpy.prod(self._dims.astype(float)) >= 2 ** 62:
+            raise ValueError("Cell size is too small for the extent of the data")
+
+        keys = self._get_keys(cells)
+
+        # Sort the positions by cell so each cell is a contiguous range.
+        self._order = numpy.argsort(keys, kind="stable")
+
+        self._keys, self._starts, self._counts = numpy.unique(
+            keys[self._order], return_index=True, return_counts=True
+        )
+
+    # -------------------------------------------------------------------------
+    # NON-PUBLIC METHODS
+    # -------------------------------------------------------------------------
+
+    def _get_cells(self, positions: numpy.ndarray) -> numpy.ndarray:
+        """Get the cell coordinates of positions.
+
+        :param positions: An (N, 3) array of positions.
+        :return: An (N, 3) array of cell coordinates.
+
+        """
+        return numpy.floor((positions - self._origin) / self._cell_size).astype(
+            numpy.int64
+        )
+
+    def _get_keys(self, cells: numpy.ndarray) -> numpy.ndarray:
+        """Get the linear keys for cell coordinates.
+
+        :param cells: An (N, 3) array of cell coordinates.
+        :return: An array of cell keys.
+
+        """
+        return (cells[:, 0] * self._dims[1] + cells[:, 1]) * self._dims[2] + cells[
+            :, 2
+        ]
+
+    def _get_chunk_size(self, maxdist: float) -> int:
+        """Estimate how many queries can be processed at once while keeping the
+        candidate arrays at a reasonable size.
+
+        :param maxdist: The maximum distance to search.
+        :return: The number of queries per chunk.
+
+        """
+        rings = int(numpy.ceil(maxdist / self._cell_size))
+        mean_count = self.num_elements / len(self._keys)
+        per_query = max(1.0, mean_count * (2 * rings + 1) ** 3)
+
+        return max(1, int(_MAX_CHUNK_ELEMENTS // per_query))
+
+    def _query_chunk(
+        self, positions: numpy.ndarray, maxdist: float
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Find all points within the maxdist of each of the positions.
+
+        :param positions: An (N, 3) array of search positions.
+        :param maxdist: The maximum distance to search.
+        :return: Flat arrays of query indexes and matched indexes.
+
+        """
+        query_cells = self._get_cells(positions)
+
+        rings = int(numpy.ceil(maxdist / self._cell_size))
+
+        query_indexes = []
+        starts = []
+        counts = []
+
+        # Find the occupied cells around each query position.
+        for offset in itertools.product(range(-rings, rings + 1), repeat=3):
+            cells = query_cells + offset
+
+            valid = numpy.all((cells >= 0) & (cells < self._dims), axis=1)
+
+            keys = self._get_keys(cells)
+
+            slots = numpy.searchsorted(self._keys, keys)
+            slots = numpy.minimum(slots, len(self._keys) - 1)
+
+            found = numpy.flatnonzero(valid & (self._keys[slots] == keys))
+
+            query_indexes.append(found)
+            starts.append(self._starts[slots[found]])
+            counts.append(self._counts[slots[found]])
+
+        query_index_array = numpy.concatenate(query_indexes)
+        start_array = numpy.concatenate(starts)
+        count_array = numpy.concatenate(counts)
+
+        # Expand the cell ranges into individual candidate points.
+        total = int(count_array.sum())
+        range_offsets = numpy.repeat(numpy.cumsum(count_array) - count_array, count_array)
+        candidate_slots = (
+            numpy.repeat(start_array, count_array) + numpy.arange(total) - range_offsets
+        )
+
+        candidates = self._order[candidate_slots]
+        candidate_queries = numpy.repeat(query_index_array, count_array)
+
+        deltas = self._data[candidates] - positions[candidate_queries]
+        distances = numpy.einsum("ij,ij->i", deltas, deltas)
+
+        within = distances <= maxdist * maxdist
+
+        return candidate_queries[within], candidates[within]
+
+    # -------------------------------------------------------------------------
+    # PROPERTIES
+    # -------------------------------------------------------------------------
+
+    @property
+    def cell_size(self) -> float:
+        """The size of each grid cell."""
+        return self._cell_size
+
+    # -------------------------------------------------------------------------
+    # METHODS
+    # -------------------------------------------------------------------------
+
+    def query(
+        self,
+        positions: numpy.ndarray,
+        num_points: int,
+        maxdist: float = numpy.inf,
+        workers: int = 1,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        raise NotImplementedError("Grids do not support nearest point queries")
+
+    def query_ball_point(
+        self, positions: numpy.ndarray, maxdist: float, workers: int = 1
+    ) -> Tuple[numpy.ndarray, ...]:
+        chunk_size = self._get_chunk_size(maxdist)
+
+        query_indexes = []
+        indexes = []
+
+        for start in range(0, len(positions), chunk_size):
+            chunk_queries, chunk_indexes = self._query_chunk(
+                positions[start : start + chunk_size], maxdist
+            )
+
+            query_indexes.append(chunk_queries + start)
+            indexes.append(chunk_indexes)
+
+        return _split_by_query(
+            numpy.concatenate(query_indexes),
+            numpy.concatenate(indexes),
+            len(positions),
+            self.num_elements,
+        )
+
+    def query_pairs(self, maxdist: float) -> numpy.ndarray:
+        chunk_size = self._get_chunk_size(maxdist)
+
+        keys = []
+
+        for start in range(0, self.num_elements, chunk_size):
+            chunk_queries, chunk_indexes = self._query_chunk(
+                self._data[start : start + chunk_size], maxdist
+            )
+
+            chunk_queries += start
+
+            upper = chunk_queries < chunk_indexes
+
+            keys.append(
+                chunk_queries[upper].astype(numpy.int64) * self.num_elements
+                + chunk_indexes[upper]
+            )
+
+        return _keys_to_pairs(numpy.sort(numpy.concatenate(keys)), self.num_elements)
+
+
+class KDTreeEngine(SpatialEngine):
+    """Engine backed by a scipy.spatial.cKDTree.
+
+    :param data: An (N, 3) array of positions.
+    :param leaf_size: The tree leaf size.
+    :return:
+
+    """
+
+    name = "kdtree"
+
+    def __init__(self, data: numpy.ndarray, leaf_size: int = 10):
+        data = numpy.asarray(data)
+
+        # The tree only references contiguous float64 data rather than copying
+        # it so copy data which could be modified after the tree is built.  Read
+        # only data, such as memory mapped cache files, is shared.
+        if data.flags.writeable:
+            data = numpy.array(data, dtype=numpy.float64)
+
+        self._tree = cKDTree(data, leaf_size)
+
+        super().__init__(self._tree.data)
+
+    # -------------------------------------------------------------------------
+    # PROPERTIES
+    # -------------------------------------------------------------------------
+
+    @property
+    def tree(self) -> cKDTree:
+        """The underlying tree."""
+        return self._tree
+
+    # -------------------------------------------------------------------------
+    # METHODS
+    # -------------------------------------------------------------------------
+
+    def query(
+        self,
+        positions: numpy.ndarray,
+        num_points: int,
+        maxdist: float = numpy.inf,
+        workers: int = 1,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        num_points = min(num_points, self.num_elements)
+
+        distances, indexes = self._tree.query(
+            positions, num_points, distance_upper_bound=maxdist, workers=workers
+        )
+
+        # Single point queries return flat arrays so ensure we always have
+        # one row per position.
+        return (
+            numpy.reshape(distances, (-1, num_points)),
+            numpy.reshape(indexes, (-1, num_points)),
+        )
+
+    def query_ball_point(
+        self, positions: numpy.ndarray, maxdist: float, workers: int = 1
+    ) -> Tuple[numpy.ndarray, ...]:
+        result = self._tree.query_ball_point(
+            positions, maxdist, workers=workers, return_sorted=True
+        )
+
+        return tuple(numpy.asarray(indexes, dtype=int) for indexes in result)
+
+    def query_pairs(self, maxdist: float) -> numpy.ndarray:
+        pairs = self._tree.query_pairs(maxdist, output_type="ndarray")
+
+        # The pairs are unordered so sort them to match the other engines.
+        keys = pairs[:, 0].astype(numpy.int64) * self.num_elements + pairs[:, 1]
+
+        return _keys_to_pairs(numpy.sort(keys), self.num_elements)
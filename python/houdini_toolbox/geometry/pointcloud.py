@@ -5,74 +5,243 @@
 # =============================================================================
 
 # Standard Library
-from typing import Optional, Sequence, Tuple
+import abc
+import collections
+import concurrent.futures
+import itertools
+import os
+import time
+from typing import Callable, List, Optional, OrderedDict, Sequence, Tuple, Union
 
 # Third Party
 import numpy
-from scipy.spatial import KDTree
+
+# Houdini Toolbox
+from houdini_toolbox.geometry.cache import PointCloudCache
+from houdini_toolbox.geometry.engines import (
+    BruteForceEngine,
+    GridEngine,
+    KDTreeEngine,
+    SpatialEngine,
+)
 
 # Houdini
 import hou
 
 # =============================================================================
-# CLASSES
+# GLOBALS
+# =============================================================================
+
+# Clouds with this many points or fewer are searched by brute force when
+# automatically choosing an engine.
+_BRUTE_FORCE_MAX_POINTS = 32
+
+# Valid engine names.
+_ENGINE_NAMES = ("auto", "brute", "grid", "kdtree")
+
+# Valid attribute interpolation methods.
+_INTERPOLATION_METHODS = ("gaussian", "idw", "nearest")
+
+# The maximum number of grids, each with a different cell size, to keep.
+_MAX_GRIDS = 4
+
+# When automatically choosing an engine, fixed radius queries use a grid
+# instead of building a tree if there are at least this many points per query
+# position.
+_GRID_MIN_POINTS_PER_QUERY = 100
+
+
 # =============================================================================
+# NON-PUBLIC FUNCTIONS
+# =============================================================================
+
 
+def _get_point_positions(geometry: hou.Geometry) -> numpy.ndarray:
+    """Get the positions of all the points in the geometry as an (N, 3) array.
 
-class PointCloud:
-    """A wrapper around scipy.spatial.KDTree to represent point positions.
+    The positions are read as a raw float32 buffer which is wrapped directly by
+    the array so no intermediate Python objects are created.  The resulting
+    array is read only.
 
     :param geometry: The source geometry.
-    :param pattern: Optional point selecting pattern.
-    :param leaf_size: The tree leaf size.
+    :return: An (N, 3) array of positions.
+
+    """
+    values = geometry.pointFloatAttribValuesAsString(
+        "P", float_type=hou.numericData.Float32
+    )
+
+    return numpy.frombuffer(values, dtype=numpy.float32).reshape((-1, 3))
+
+
+def _get_interpolation_weights(
+    distances: numpy.ndarray,
+    method: str,
+    power: float,
+    bandwidth: Optional[float],
+) -> numpy.ndarray:
+    """Compute interpolation weights for neighbor distances.
+
+    Missing neighbors, which have infinite distances, receive a weight of 0.
+
+    :param distances: An (N, K) array of neighbor distances.
+    :param method: The interpolation method.
+    :param power: The inverse distance weighting power.
+    :param bandwidth: The gaussian kernel bandwidth.
+    :return: An (N, K) array of weights.
+
+    """
+    found = numpy.isfinite(distances)
+
+    if method == "nearest":
+        weights = numpy.zeros(distances.shape)
+        weights[:, 0] = found[:, 0]
+
+        return weights
+
+    # Use 0 instead of infinity so no invalid values are computed.
+    safe_distances = numpy.where(found, distances, 0)
+
+    if method == "gaussian":
+        if bandwidth is None:
+            # Scale the kernel to the farthest neighbor found for each position.
+            bandwidth = numpy.max(safe_distances, axis=1, keepdims=True) / 2
+
+        bandwidth = numpy.where(bandwidth > 0, bandwidth, 1)
+
+        weights = numpy.exp(-0.5 * (safe_distances / bandwidth) ** 2)
+
+        return numpy.where(found, weights, 0)
+
+    # Positions which coincide with a point take its value exactly.
+    exact = found & (safe_distances == 0)
+    has_exact = exact.any(axis=1, keepdims=True)
+
+    with numpy.errstate(divide="ignore"):
+        weights = numpy.where(found & ~exact, safe_distances ** -power, 0)
+
+    return numpy.where(has_exact, exact.astype(float), weights)
+
+
+def _get_query_positions(
+    positions: Union[hou.Geometry, hou.Vector3, numpy.ndarray, Sequence]
+) -> numpy.ndarray:
+    """Convert query positions to an (N, 3) array.
+
+    Positions can be a single hou.Vector3, a sequence of positions, an array
+    or a hou.Geometry, in which case the positions of all its points are used.
+
+    :param positions: The positions to convert.
+    :return: An (N, 3) array of positions.
+
+    """
+    if isinstance(positions, hou.Geometry):
+        return _get_point_positions(positions)
+
+    return numpy.asarray(positions, dtype=float).reshape((-1, 3))
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class QueryStats:
+    """Timing statistics for a batch query.
+
+    :param name: The name of the query method.
+    :param num_queries: The number of positions queried.
+    :param chunk_size: The number of positions in each chunk.
+    :param workers: The number of threads the chunks were run on.
+    :param chunk_times: The time, in seconds, taken by each chunk.
+    :param elapsed: The total time, in seconds, taken by the query.
     :return:
 
     """
 
-    def __init__(
-        self, geometry: hou.Geometry, pattern: Optional[str] = None, leaf_size: int = 10
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        num_queries: int,
+        chunk_size: int,
+        workers: int,
+        chunk_times: Sequence[float],
+        elapsed: float,
     ):
-        # The source geometry. We need this to be able to glob points.
-        self._geometry = geometry
+        self._chunk_size = chunk_size
+        self._chunk_times = tuple(chunk_times)
+        self._elapsed = elapsed
+        self._name = name
+        self._num_queries = num_queries
+        self._workers = workers
 
-        # Don't create a point map by default.
-        self._point_map = None
+    # -------------------------------------------------------------------------
+    # SPECIAL METHODS
+    # -------------------------------------------------------------------------
 
-        if pattern:
-            # Get a list of the points we want to build the tree from.
-            group_points = geometry.globPoints(pattern)
+    def __repr__(self):
+        return (
+            f"<QueryStats {self.name} queries={self.num_queries} "
+            f"chunks={self.num_chunks} workers={self.workers} "
+            f"elapsed={self.elapsed:.4f}s>"
+        )
 
-            # Create a list of all the positions of those points.
-            positions = [point.position() for point in group_points]
+    # -------------------------------------------------------------------------
+    # PROPERTIES
+    # -------------------------------------------------------------------------
 
-            # Create a map of the point numbers.  We need to do this because
-            # when returning results from queries, it only returns the index
-            # numbers. We then use those indexes to get the real point number
-            # from the point map.
-            self._point_map = [point.number() for point in group_points]
+    @property
+    def chunk_size(self) -> int:
+        """The number of positions in each chunk."""
+        return self._chunk_size
 
-            # Build our data array. Since it was created from a list of
-            # hou.Vector3's (tuples) we don't need to reshape.
-            data = numpy.array(positions)
+    @property
+    def chunk_times(self) -> Tuple[float, ...]:
+        """The time, in seconds, taken by each chunk."""
+        return self._chunk_times
 
-            self._num_elements = len(group_points)
+    @property
+    def elapsed(self) -> float:
+        """The total time, in seconds, taken by the query."""
+        return self._elapsed
 
-        else:
-            # Get the point positions as a giant list.
-            positions = geometry.pointFloatAttribValues("P")
+    @property
+    def name(self) -> str:
+        """The name of the query method."""
+        return self._name
+
+    @property
+    def num_chunks(self) -> int:
+        """The number of chunks the positions were split into."""
+        return len(self._chunk_times)
+
+    @property
+    def num_queries(self) -> int:
+        """The number of positions queried."""
+        return self._num_queries
+
+    @property
+    def workers(self) -> int:
+        """The number of threads the chunks were run on."""
+        return self._workers
+
+
+class _BasePointCloud(abc.ABC):
+    """Base class for searchable representations of point positions.
+
+    :param geometry: The source geometry.
+    :return:
 
-            # Convert the list of positions to a numpy array and reshape it to
-            # represent 3 component entries.
-            num_points = len(geometry.iterPoints())
-            data = numpy.array(positions).reshape((num_points, 3))
+    """
 
-            self._num_elements = num_points
+    def __init__(self, geometry: hou.Geometry):
+        # The source geometry. We need this to be able to glob points.
+        self._geometry = geometry
 
-        if self._num_elements == 0:
-            raise RuntimeError("Cannot create PointCloud with 0 points")
+        # Don't create a point map by default.
+        self._point_map: Optional[numpy.ndarray] = None
 
-        # Build the tree from the data.
-        self._tree = KDTree(data, leaf_size)
+        self._num_elements = 0
 
     # -------------------------------------------------------------------------
     # SPECIAL METHODS
@@ -80,133 +249,1510 @@ class PointCloud:
 
     def __repr__(self):
         if self._geometry.sopNode() is not None:
-            return f"<PointCloud for {self._geometry.sopNode().path()}>"
+            return f"<{self.__class__.__name__} for {self._geometry.sopNode().path()}>"
 
-        return "<PointCloud>"
+        return f"<{self.__class__.__name__}>"
 
     # -------------------------------------------------------------------------
     # NON-PUBLIC METHODS
     # -------------------------------------------------------------------------
 
-    def _get_result_points(self, indexes: Sequence[int]) -> Tuple[hou.Point, ...]:
-        """This method converts a list of integers into corresponding hou.Point
-        objects belonging to the geometry depending on whether a point map is
-        being used.
+    def _get_positions(self, pattern: Optional[str]) -> numpy.ndarray:
+        """Get the positions of the points to build the tree from.
 
-        :param indexes: A list of point numbers.
-        :return: A tuple of points matching the indexes.
+        If a pattern is supplied the point map will also be built.
+
+        :param pattern: Optional point selecting pattern.
+        :return: An (N, 3) array of positions.
 
         """
-        # If we have a point map set up we need to index into that and then
-        # convert to string.
-        if self._point_map:
-            pattern = " ".join([str(self._point_map[index]) for index in indexes])
+        geometry = self._geometry
 
-        # Just convert the indexes to strings.
-        else:
-            pattern = " ".join([str(index) for index in indexes])
+        # Get all the point positions.
+        data = _get_point_positions(geometry)
+
+        if pattern:
+            # Get a list of the points we want to build the tree from.
+            group_points = geometry.globPoints(pattern)
+
+            # Create a map of the point numbers.  We need to do this because
+            # when returning results from queries, it only returns the index
+            # numbers. We then use those indexes to get the real point number
+            # from the point map.
+            self._point_map = numpy.fromiter(
+                (point.number() for point in group_points),
+                dtype=int,
+                count=len(group_points),
+            )
+
+            # Gather the positions of the points using the map.
+            return data[self._point_map]
+
+        return data
+
+    def _map_indexes(self, indexes: Sequence[int]) -> numpy.ndarray:
+        """Convert tree indexes into point numbers.
+
+        If a point map is being used the indexes are looked up in it, otherwise
+        they already match the point numbers.
+
+        :param indexes: A list of tree indexes.
+        :return: An array of point numbers.
+
+        """
+        indexes = numpy.asarray(indexes, dtype=int)
 
-        # Return our matched points.
-        return self._geometry.globPoints(pattern)
+        if self._point_map is not None:
+            return self._point_map[indexes]
+
+        return indexes
+
+    # -------------------------------------------------------------------------
+    # PROPERTIES
+    # -------------------------------------------------------------------------
+
+    @property
+    def num_elements(self) -> int:
+        """The number of points in the cloud."""
+        return self._num_elements
 
     # -------------------------------------------------------------------------
     # METHODS
     # -------------------------------------------------------------------------
 
     def find_all_close_points(
-        self, position: hou.Vector3, maxdist: float
-    ) -> Tuple[hou.Point, ...]:
+        self, position: hou.Vector3, maxdist: float, return_numbers: bool = False
+    ) -> Union[Tuple[hou.Point, ...], numpy.ndarray]:
         """Find all points within the maxdist from the position.
 
+        If return_numbers is True an array of point numbers is returned instead
+        of hou.Point objects.
+
         :param position: A search position.
         :param maxdist: The maximum distance to search.
-        :return: A tuple of found points.
+        :param return_numbers: Whether to return point numbers.
+        :return: The found points.
 
         """
-        # Convert the position to a compatible ndarray.
-        positions = numpy.array([position])
+        numbers = self.find_all_close_points_batch(position, maxdist)[0]
 
-        # Perform a query based on the position and maxdist.
-        result = self._tree.query_ball_point(positions, maxdist)
-
-        # Bail out if we got no results since an empty list would be converted to ""
-        # and hou.Geometry.globPoints would return all points.
-        if not result:
-            return tuple()
+        if return_numbers:
+            return numbers
 
         # Return any points that are found.
-        return self._get_result_points(result[0])
+        return self.get_points(numbers)
+
+    @abc.abstractmethod
+    def find_all_close_points_batch(
+        self,
+        positions: Union[hou.Geometry, numpy.ndarray, Sequence],
+        maxdist: float,
+        workers: int = 1,
+    ) -> Tuple[numpy.ndarray, ...]:
+        """Find all points within the maxdist from each of the positions.
+
+        Positions can be an (N, 3) array, a sequence of positions or a
+        hou.Geometry whose point positions will be used.
+
+        :param positions: The search positions.
+        :param maxdist: The maximum distance to search.
+        :param workers: The number of workers to query with, -1 uses all cores.
+        :return: An array of found point numbers for each position.
+
+        """
 
     def find_nearest_points(
         self,
         position: hou.Vector3,
         num_points: int = 1,
         maxdist: Optional[float] = None,
-    ) -> Tuple[hou.Point, ...]:
+        return_numbers: bool = False,
+    ) -> Union[Tuple[hou.Point, ...], numpy.ndarray]:
         """Find the closest N points to the position.
 
+        If return_numbers is True an array of point numbers is returned instead
+        of hou.Point objects.
+
         :param position: A search position.
         :param num_points: The maximum number of points to search for.
         :param maxdist: The maximum distance to search.
-        :return: A tuple of found points.
+        :param return_numbers: Whether to return point numbers.
+        :return: The found points.
 
         """
-        # Return no points if we ask for an invalid number of points.
-        if num_points < 1:
-            raise ValueError("Must choose 1 or more points")
+        numbers = self.find_nearest_points_batch(position, num_points, maxdist)[0][0]
 
-        # Make sure we aren't querying for more points than we have.
-        if num_points > self._num_elements:
-            num_points = self._num_elements
+        # Remove any entries which were not found within the max distance.
+        numbers = numbers[numbers >= 0]
+
+        if return_numbers:
+            return numbers
+
+        return self.get_points(numbers)
+
+    @abc.abstractmethod
+    def find_nearest_points_batch(
+        self,
+        positions: Union[hou.Geometry, numpy.ndarray, Sequence],
+        num_points: int = 1,
+        maxdist: Optional[float] = None,
+        workers: int = 1,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Find the closest N points to each of the positions.
+
+        Positions can be an (N, 3) array, a sequence of positions or a
+        hou.Geometry whose point positions will be used.
+
+        The results are (N, num_points) arrays of point numbers and distances,
+        ordered by distance. If fewer than num_points points are found for a
+        position then the missing entries have a point number of -1 and an
+        infinite distance.
+
+        :param positions: The search positions.
+        :param num_points: The maximum number of points to search for.
+        :param maxdist: The maximum distance to search.
+        :param workers: The number of workers to query with, -1 uses all cores.
+        :return: Arrays of found point numbers and their distances.
+
+        """
 
-        # Convert the position to a compatible ndarray.
-        positions = numpy.array([position])
+    def get_points(self, numbers: Sequence[int]) -> Tuple[hou.Point, ...]:
+        """Get the hou.Point objects for a list of point numbers.
 
-        # Query the tree.
-        result = self._tree.query(positions, num_points)
+        This can be used to materialize points from the results of queries
+        which return point numbers.
 
-        # Get the list of found indexes.
-        indexes = result[1][0]
+        :param numbers: A list of point numbers.
+        :return: A tuple of points matching the numbers.
 
-        # If the maxdist is not None then we specified a maximum distance points
-        # can be within.
-        if maxdist is not None:
-            # Get the distances each match is from the target position.
-            distances = result[0][0]
+        """
+        return tuple(self._geometry.point(int(number)) for number in numbers)
+
+
+class PointCloud(_BasePointCloud):
+    """A searchable representation of point positions.
+
+    Queries are answered by a spatial search engine chosen by the engine
+    argument:
+
+    - "kdtree": a scipy.spatial.cKDTree.
+    - "grid": a uniform grid for fixed radius queries and a tree for nearest
+      point queries.
+    - "brute": compare each query against every point.
+    - "auto": use brute force for very small clouds, otherwise build a tree
+      when it is first needed.  Fixed radius queries with few query positions
+      relative to the number of points use a grid, as long as no tree has been
+      built yet, since building the grid is much cheaper.  If a grid cannot be
+      built for the query radius the tree is used instead.
+
+    If a cache is supplied the tree will be looked up in it before being built,
+    and stored in it afterwards.  The "auto" engine gets the tree when the cloud
+    is created so that it is always reused.
+
+    Point positions can be changed, and points added, with update().  Changed
+    points are searched by a separate small tree alongside the existing engines
+    until the fraction of changed points exceeds max_dirty_ratio, at which point
+    the engines are rebuilt.
+
+    :param geometry: The source geometry.
+    :param pattern: Optional point selecting pattern.
+    :param leaf_size: The tree leaf size.
+    :param cache: Optional cache to reuse trees from.
+    :param engine: The search engine to use.
+    :param max_dirty_ratio: The fraction of changed points which triggers a rebuild.
+    :return:
+
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        geometry: hou.Geometry,
+        pattern: Optional[str] = None,
+        leaf_size: int = 10,
+        cache: Optional[PointCloudCache] = None,
+        engine: str = "auto",
+        max_dirty_ratio: float = 0.1,
+    ):
+        super().__init__(geometry)
+
+        if engine not in _ENGINE_NAMES:
+            raise ValueError(f"Invalid engine: {engine}")
+
+        self._engine = engine
+
+        self._max_dirty_ratio = max_dirty_ratio
+
+        # Indexes of points whose positions have changed since the engines
+        # were built, a mask of them and a tree to search them.
+        self._dirty = numpy.empty(0, dtype=int)
+        self._dirty_mask: Optional[numpy.ndarray] = None
+        self._overlay: Optional[KDTreeEngine] = None
+
+        # Once points are updated the positions are a view of a buffer which
+        # can be modified in place and has room for added points.
+        self._buffer: Optional[numpy.ndarray] = None
+
+        # The order of the point map, used to find the indexes of point numbers.
+        self._sorter: Optional[numpy.ndarray] = None
+
+        self._leaf_size = leaf_size
+
+        # Engines are created as they are needed.
+        self._brute_force: Optional[BruteForceEngine] = None
+        self._grids: OrderedDict = collections.OrderedDict()
+        self._tree: Optional[KDTreeEngine] = None
+
+        self._cache = cache
+        self._cache_key = None
+        self._content_key = None
+
+        self._last_query_stats: Optional[QueryStats] = None
+
+        cached = None
+
+        if cache is not None:
+            self._cache_key = cache.build_key(geometry, pattern, leaf_size)
+
+            cached = cache.get(self._cache_key)
+
+        if cached is None:
+            self._data = self._get_positions(pattern)
+
+            if len(self._data) == 0:  # pylint: disable=len-as-condition
+                raise RuntimeError("Cannot create PointCloud with 0 points")
+
+            # Trees stored on disk are looked up by the data they were built from.
+            if cache is not None and cache.cache_dir is not None:
+                self._content_key = cache.build_content_key(
+                    self._data, self._point_map, leaf_size
+                )
+
+                cached = cache.get(self._cache_key, self._content_key)
+
+        if cached is not None:
+            self._tree, self._point_map = cached
+            self._data = self._tree.data  # type: ignore
+
+        self._num_elements = len(self._data)
+
+        if engine == "kdtree" or (engine == "auto" and cache is not None):
+            self._get_tree()
+
+    # -------------------------------------------------------------------------
+    # NON-PUBLIC METHODS
+    # -------------------------------------------------------------------------
+
+    def _get_nearest_engine(self) -> SpatialEngine:
+        """Get the engine to use for nearest point queries.
+
+        :return: The engine to query.
+
+        """
+        if self._use_brute_force:
+            return self._get_brute_force()
+
+        return self._get_tree()
+
+    def _get_radius_engine(self, maxdist: float, num_queries: int) -> SpatialEngine:
+        """Get the engine to use for fixed radius queries.
+
+        :param maxdist: The query radius.
+        :param num_queries: The number of positions being queried.
+        :return: The engine to query.
+
+        """
+        if self._use_brute_force:
+            return self._get_brute_force()
+
+        if maxdist > 0:
+            if self._engine == "grid":
+                return self._get_grid(maxdist)
+
+            if (
+                self._engine == "auto"
+                and self._tree is None
+                and self._num_elements >= num_queries * _GRID_MIN_POINTS_PER_QUERY
+            ):
+                try:
+                    return self._get_grid(maxdist)
+
+                # The radius is too small to grid the extent of the points.
+                except ValueError:
+                    pass
+
+        return self._get_tree()
+
+    def _get_brute_force(self) -> BruteForceEngine:
+        """Get the brute force engine, creating it if necessary.
+
+        :return: The brute force engine.
+
+        """
+        if self._brute_force is None:
+            self._brute_force = BruteForceEngine(self._data)
+
+        return self._brute_force
+
+    def _get_grid(self, cell_size: float) -> GridEngine:
+        """Get a grid engine with a specific cell size, creating it if necessary.
+
+        Grids are kept for the most recently used cell sizes.
+
+        :param cell_size: The grid cell size.
+        :return: The grid engine.
+
+        """
+        if cell_size in self._grids:
+            self._grids.move_to_end(cell_size)
 
-            # Check the type of the distances list.  If it is a numpy array
-            # then more than 1 point was found.
-            if isinstance(distances, numpy.ndarray):
-                # Filter the index list to remove those too far away.
-                indexes = [
-                    index for dist, index in zip(distances, indexes) if dist < maxdist
-                ]
+            return self._grids[cell_size]
 
-                # There are some points within the max distance so get them.
-                if indexes:
-                    near_points = self._get_result_points(indexes)
+        grid = GridEngine(self._data, cell_size)
 
-                else:
-                    near_points = ()
+        self._grids[cell_size] = grid
 
-            # Only 1 point was requested/found.
-            else:
-                # If the point is within the distances, glob and return it.
-                if distances < maxdist:
-                    near_points = self._get_result_points([indexes])
+        while len(self._grids) > _MAX_GRIDS:
+            self._grids.popitem(last=False)
 
-                else:
-                    near_points = ()
+        return grid
+
+    def _get_tree(self) -> KDTreeEngine:
+        """Get the tree engine, building it if necessary.
+
+        Newly built trees are added to the cache if one was supplied.
+
+        :return: The tree engine.
+
+        """
+        if self._tree is None:
+            self._tree = KDTreeEngine(self._data, self._leaf_size)
+
+            if self._cache_key is not None or self._content_key is not None:
+                self._cache.set(  # type: ignore
+                    self._cache_key, (self._tree, self._point_map), self._content_key
+                )
+
+        return self._tree
+
+    def _find_indexes(self, numbers: numpy.ndarray) -> numpy.ndarray:
+        """Convert point numbers into tree indexes.
+
+        :param numbers: An array of point numbers.
+        :return: An array of tree indexes, with -1 for numbers not in the cloud.
+
+        """
+        if self._point_map is None:
+            return numpy.where(
+                (numbers >= 0) & (numbers < self._num_elements), numbers, -1
+            )
+
+        if self._sorter is None:
+            self._sorter = numpy.argsort(self._point_map, kind="stable")
+
+        slots = numpy.searchsorted(self._point_map, numbers, sorter=self._sorter)
+        slots = numpy.minimum(slots, self._num_elements - 1)
+
+        indexes = self._sorter[slots]
+
+        return numpy.where(self._point_map[indexes] == numbers, indexes, -1)
+
+    def _map_queries(
+        self,
+        name: str,
+        query: Callable[[numpy.ndarray], object],
+        data: numpy.ndarray,
+        chunk_size: Optional[int],
+        workers: int,
+    ) -> List:
+        """Run a query over chunks of positions using a pool of threads.
+
+        Engines release the GIL while searching so chunks can be searched in
+        parallel.  Any engines the query needs must already exist since they
+        are not built in a thread safe manner.
+
+        :param name: The name of the query, for the stats.
+        :param query: The function to query a chunk of positions with.
+        :param data: An (N, 3) array of search positions.
+        :param chunk_size: The number of positions in each chunk.
+        :param workers: The number of threads to use, -1 uses all cores.
+        :return: The result of each chunk, in order.
+
+        """
+        if workers == -1:
+            workers = os.cpu_count() or 1
+
+        if workers < 1:
+            raise ValueError("Workers must be -1 or greater than 0")
+
+        if chunk_size is None:
+            # Default to a single chunk per worker.
+            chunk_size = -(-len(data) // workers)
+
+        elif chunk_size < 1:
+            raise ValueError("Chunk size must be greater than 0")
+
+        chunk_size = max(chunk_size, 1)
+
+        chunks = [
+            data[start : start + chunk_size] for start in range(0, len(data), chunk_size)
+        ] or [data]
+
+        workers = min(workers, len(chunks))
+
+        def run_chunk(chunk: numpy.ndarray) -> Tuple[object, float]:
+            chunk_start = time.perf_counter()
+            result = query(chunk)
+
+            return result, time.perf_counter() - chunk_start
+
+        start = time.perf_counter()
+
+        if workers == 1:
+            timed_results = [run_chunk(chunk) for chunk in chunks]
 
-        #  We don't care about the points being within a certain distance.
         else:
-            # If the point list is an array then more than one point was found.
-            if isinstance(indexes, numpy.ndarray):
-                near_points = self._get_result_points(indexes.tolist())
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+                timed_results = list(pool.map(run_chunk, chunks))
+
+        elapsed = time.perf_counter() - start
+
+        self._last_query_stats = QueryStats(
+            name,
+            len(data),
+            chunk_size,
+            workers,
+            [chunk_time for _, chunk_time in timed_results],
+            elapsed,
+        )
+
+        return [result for result, _ in timed_results]
+
+    def _query_engine(
+        self,
+        engine: SpatialEngine,
+        data: numpy.ndarray,
+        num_points: int,
+        maxdist: float,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """Find the closest points to each of the positions, discarding any
+        changed points from the results.
+
+        :param engine: The engine to query.
+        :param data: An (N, 3) array of search positions.
+        :param num_points: The number of points to search for.
+        :param maxdist: The maximum distance to search.
+        :return: Arrays of distances and tree indexes, and whether each search
+                 discarded changed points and could find more points.
+
+        """
+        distances, indexes = engine.query(data, num_points, maxdist)
+
+        missing = indexes == engine.num_elements
+        stale = ~missing & self._dirty_mask[  # type: ignore
+            numpy.where(missing, 0, indexes)
+        ]
+
+        # Searches which ran out of points within the maxdist have already found
+        # every unchanged point.
+        incomplete = stale.any(axis=1) & ~missing.any(axis=1)
+
+        invalid = missing | stale
+
+        return (
+            numpy.where(invalid, numpy.inf, distances),
+            numpy.where(invalid, self._num_elements, indexes),
+            incomplete,
+        )
+
+    def _query_nearest(
+        self,
+        engine: SpatialEngine,
+        data: numpy.ndarray,
+        num_points: int,
+        maxdist: float,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Find the closest points to each of the positions.
+
+        Results from the engine are merged with a search of any changed points.
+
+        :param engine: The engine to query.
+        :param data: An (N, 3) array of search positions.
+        :param num_points: The number of points to search for.
+        :param maxdist: The maximum distance to search.
+        :return: Arrays of distances and tree indexes.
+
+        """
+        if not len(self._dirty):  # pylint: disable=len-as-condition
+            return engine.query(data, num_points, maxdist)
+
+        overlay = self._get_overlay()
+
+        num_engine_points = min(num_points, engine.num_elements)
+
+        distances, indexes, incomplete = self._query_engine(
+            engine, data, num_engine_points, maxdist
+        )
+
+        # Any changed points the engine found have stale positions so only the
+        # positions which found them are searched again, looking for more points
+        # each time, until enough unchanged points are found.
+        pending = numpy.flatnonzero(incomplete)
+        num_search = num_engine_points
+
+        while len(pending) and num_search < engine.num_elements:
+            num_search = min(num_search * 2, engine.num_elements)
+
+            pending_distances, pending_indexes, incomplete = self._query_engine(
+                engine, data[pending], num_search, maxdist
+            )
+
+            order = numpy.argsort(pending_distances, axis=1, kind="stable")
+            order = order[:, :num_engine_points]
+
+            distances[pending] = numpy.take_along_axis(pending_distances, order, 1)
+            indexes[pending] = numpy.take_along_axis(pending_indexes, order, 1)
+
+            pending = pending[incomplete & numpy.isinf(distances[pending, -1])]
+
+        # Search the changed points at their current positions.
+        overlay_distances, overlay_indexes = overlay.query(data, num_points, maxdist)
+
+        overlay_indexes = numpy.where(
+            overlay_indexes == overlay.num_elements,
+            self._num_elements,
+            self._dirty[numpy.minimum(overlay_indexes, overlay.num_elements - 1)],
+        )
+
+        # Combine the results and keep the closest points.
+        distances = numpy.hstack((distances, overlay_distances))
+        indexes = numpy.hstack((indexes, overlay_indexes))
+
+        order = numpy.argsort(distances, axis=1, kind="stable")[:, :num_points]
+
+        return (
+            numpy.take_along_axis(distances, order, 1),
+            numpy.take_along_axis(indexes, order, 1),
+        )
+
+    def _query_radius(
+        self, engine: SpatialEngine, data: numpy.ndarray, maxdist: float
+    ) -> Tuple[numpy.ndarray, ...]:
+        """Find all points within the maxdist of each of the positions.
+
+        Results from the engine are merged with a search of any changed points.
+
+        :param engine: The engine to query.
+        :param data: An (N, 3) array of search positions.
+        :param maxdist: The maximum distance to search.
+        :return: A sorted array of tree indexes for each position.
+
+        """
+        result = engine.query_ball_point(data, maxdist)
+
+        if not len(self._dirty):  # pylint: disable=len-as-condition
+            return result
+
+        overlay_result = self._get_overlay().query_ball_point(data, maxdist)
+
+        return tuple(
+            numpy.sort(
+                numpy.concatenate(
+                    (
+                        indexes[~self._dirty_mask[indexes]],  # type: ignore
+                        self._dirty[overlay_indexes],
+                    )
+                )
+            )
+            for indexes, overlay_indexes in zip(result, overlay_result)
+        )
+
+    def _get_overlay(self) -> KDTreeEngine:
+        """Get the tree used to search changed points, creating it if necessary.
+
+        :return: The overlay tree.
+
+        """
+        if self._overlay is None:
+            self._overlay = KDTreeEngine(self._data[self._dirty], self._leaf_size)
+
+        return self._overlay
+
+    def _radius_batch(
+        self,
+        name: str,
+        data: numpy.ndarray,
+        maxdist: float,
+        chunk_size: Optional[int],
+        workers: int,
+    ) -> Tuple[numpy.ndarray, ...]:
+        """Find all points within the maxdist of each of the positions, in chunks.
+
+        :param name: The name of the query, for the stats.
+        :param data: An (N, 3) array of search positions.
+        :param maxdist: The maximum distance to search.
+        :param chunk_size: The number of positions in each chunk.
+        :param workers: The number of threads to use, -1 uses all cores.
+        :return: A sorted array of tree indexes for each position.
+
+        """
+        # Build everything the chunks need before they are run in parallel.
+        engine = self._get_radius_engine(maxdist, len(data))
+
+        if len(self._dirty):
+            self._get_overlay()
+
+        results = self._map_queries(
+            name,
+            lambda chunk: self._query_radius(engine, chunk, maxdist),
+            data,
+            chunk_size,
+            workers,
+        )
+
+        return tuple(itertools.chain.from_iterable(results))
+
+    def _reserve(self, size: int):
+        """Make sure the positions are stored in a buffer with room for at least
+        size points.
+
+        The buffer grows geometrically so that adding points a few at a time
+        does not copy every position each time.
+
+        :param size: The number of points the buffer must hold.
+        :return:
+
+        """
+        if self._buffer is not None and len(self._buffer) >= size:
+            return
+
+        capacity = size
+
+        if self._buffer is not None:
+            capacity = max(size, 2 * len(self._buffer))
+
+        # The positions may be a read only view of the geometry data or of a
+        # stored tree so we need our own copy to modify.
+        buffer = numpy.empty((capacity, 3))
+        buffer[: self._num_elements] = self._data
+
+        dirty_mask = numpy.zeros(capacity, dtype=bool)
+
+        if self._dirty_mask is not None:
+            dirty_mask[: self._num_elements] = self._dirty_mask[: self._num_elements]
+
+        self._buffer = buffer
+        self._data = buffer[: self._num_elements]
+        self._dirty_mask = dirty_mask
+
+    def _reset_engines(self):
+        """Discard all engines so they will be rebuilt from the current positions.
+
+        :return:
+
+        """
+        self._brute_force = None
+        self._grids.clear()
+        self._tree = None
+
+        self._dirty = numpy.empty(0, dtype=int)
+        self._overlay = None
+
+        if self._dirty_mask is not None:
+            self._dirty_mask[:] = False
+
+        if self._engine == "kdtree":
+            self._get_tree()
+
+    # -------------------------------------------------------------------------
+    # PROPERTIES
+    # -------------------------------------------------------------------------
+
+    @property
+    def engine(self) -> str:
+        """The name of the search engine selection mode."""
+        return self._engine
+
+    @property
+    def max_dirty_ratio(self) -> float:
+        """The fraction of changed points which triggers a rebuild."""
+        return self._max_dirty_ratio
+
+    @max_dirty_ratio.setter
+    def max_dirty_ratio(self, max_dirty_ratio: float):
+        self._max_dirty_ratio = max_dirty_ratio
+
+    @property
+    def last_query_stats(self) -> Optional[QueryStats]:
+        """Timing statistics for the most recent batch query."""
+        return self._last_query_stats
+
+    @property
+    def num_dirty(self) -> int:
+        """The number of points changed since the engines were built."""
+        return len(self._dirty)
+
+    @property
+    def _use_brute_force(self) -> bool:
+        """Whether all queries should be answered by brute force."""
+        if self._engine == "auto":
+            return self._tree is None and self._num_elements <= _BRUTE_FORCE_MAX_POINTS
+
+        return self._engine == "brute"
+
+    # -------------------------------------------------------------------------
+    # METHODS
+    # -------------------------------------------------------------------------
+
+    def find_all_close_points_batch(
+        self,
+        positions: Union[hou.Geometry, numpy.ndarray, Sequence],
+        maxdist: float,
+        workers: int = 1,
+        chunk_size: Optional[int] = None,
+    ) -> Tuple[numpy.ndarray, ...]:
+        """Find all points within the maxdist from each of the positions.
+
+        The positions are split into chunks which are queried in parallel by
+        a pool of threads.  By default there is one chunk per thread.
+        Positions can be an (N, 3) array, a sequence of positions or a
+        hou.Geometry whose point positions will be used.
+
+        :param positions: The search positions.
+        :param maxdist: The maximum distance to search.
+        :param workers: The number of threads to query with, -1 uses all cores.
+        :param chunk_size: The number of positions in each chunk.
+        :return: An array of found point numbers for each position.
+
+        """
+        # Convert the positions to a compatible ndarray.
+        data = _get_query_positions(positions)
+
+        # Perform a query based on the positions and maxdist.
+        result = self._radius_batch(
+            "find_all_close_points_batch", data, maxdist, chunk_size, workers
+        )
+
+        return tuple(self._map_indexes(indexes) for indexes in result)
+
+    def find_nearest_points_batch(
+        self,
+        positions: Union[hou.Geometry, numpy.ndarray, Sequence],
+        num_points: int = 1,
+        maxdist: Optional[float] = None,
+        workers: int = 1,
+        chunk_size: Optional[int] = None,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Find the closest N points to each of the positions.
+
+        The positions are split into chunks which are queried in parallel by
+        a pool of threads.  By default there is one chunk per thread.
+        Positions can be an (N, 3) array, a sequence of positions or a
+        hou.Geometry whose point positions will be used.
+
+        The results are (N, num_points) arrays of point numbers and distances,
+        ordered by distance. If fewer than num_points points are found for a
+        position then the missing entries have a point number of -1 and an
+        infinite distance.
+
+        :param positions: The search positions.
+        :param num_points: The maximum number of points to search for.
+        :param maxdist: The maximum distance to search.
+        :param workers: The number of threads to query with, -1 uses all cores.
+        :param chunk_size: The number of positions in each chunk.
+        :return: Arrays of found point numbers and their distances.
+
+        """
+        # Return no points if we ask for an invalid number of points.
+        if num_points < 1:
+            raise ValueError("Must choose 1 or more points")
+
+        # Make sure we aren't querying for more points than we have.
+        num_points = min(num_points, self._num_elements)
+
+        # Convert the positions to a compatible ndarray.
+        data = _get_query_positions(positions)
+
+        if maxdist is None:
+            maxdist = numpy.inf
+
+        # Build everything the chunks need before they are run in parallel.
+        engine = self._get_nearest_engine()
+
+        if len(self._dirty):
+            self._get_overlay()
+
+        results = self._map_queries(
+            "find_nearest_points_batch",
+            lambda chunk: self._query_nearest(engine, chunk, num_points, maxdist),
+            data,
+            chunk_size,
+            workers,
+        )
+
+        distances = numpy.vstack([chunk_distances for chunk_distances, _ in results])
+        indexes = numpy.vstack([chunk_indexes for _, chunk_indexes in results])
+
+        # Missing neighbors are reported with an index equal to the number of
+        # elements so they need to be masked out before mapping.
+        missing = indexes == self._num_elements
+
+        numbers = self._map_indexes(numpy.where(missing, 0, indexes))
+        numbers[missing] = -1
+
+        return numbers, distances
+
+    def find_point_pairs(self, maxdist: float) -> numpy.ndarray:
+        """Find all pairs of points in the cloud within the maxdist of each other.
+
+        The pairs are found with a single engine query.  Any pending updates
+        are applied by rebuilding the engines first.
+
+        :param maxdist: The maximum distance between points.
+        :return: An (M, 2) int32 array of point number pairs.
+
+        """
+        if len(self._dirty):  # pylint: disable=len-as-condition
+            self._reset_engines()
+
+        engine = self._get_radius_engine(maxdist, self._num_elements)
+
+        pairs = engine.query_pairs(maxdist)
+
+        return self._map_indexes(pairs).astype(numpy.int32)
+
+    def update(
+        self,
+        point_numbers: Sequence[int],
+        positions: Union[numpy.ndarray, Sequence],
+    ):
+        """Update the positions of points in the cloud.
+
+        Point numbers which are not already in the cloud will be added to it.
+        Point numbers must be unique.
+
+        Changed points are searched separately from the existing engines so
+        the cost of an update depends on the number of changed points.  Once
+        the number of changed points exceeds the max dirty ratio all engines
+        are rebuilt from the current positions.
+
+        :param point_numbers: The point numbers to update.
+        :param positions: An (N, 3) array of new positions.
+        :return:
+
+        """
+        numbers = numpy.asarray(point_numbers, dtype=int).reshape(-1)
+        data = _get_query_positions(positions)
+
+        if len(numbers) != len(data):
+            raise ValueError("Number of point numbers and positions must match")
+
+        indexes = self._find_indexes(numbers)
+
+        new_points = indexes == -1
+
+        new_numbers = numbers[new_points]
+
+        self._reserve(self._num_elements + len(new_numbers))
+
+        # Trees built before the update keep their own copy of the old
+        # positions and changed points are discarded from their results.
+        self._data[indexes[~new_points]] = data[~new_points]
+
+        if len(new_numbers):  # pylint: disable=len-as-condition
+            new_indexes = numpy.arange(
+                self._num_elements, self._num_elements + len(new_numbers)
+            )
+
+            # Points can only be added without a point map if their numbers
+            # continue on from the existing points.
+            if self._point_map is None and not numpy.array_equal(
+                new_numbers, new_indexes
+            ):
+                self._point_map = numpy.arange(self._num_elements)
+
+            if self._point_map is not None:
+                self._point_map = numpy.concatenate((self._point_map, new_numbers))
+                self._sorter = None
+
+            self._buffer[new_indexes] = data[new_points]  # type: ignore
+
+            self._num_elements += len(new_numbers)
+            self._data = self._buffer[: self._num_elements]  # type: ignore
+
+            indexes[new_points] = new_indexes
+
+        # The cloud no longer matches the cached data.
+        self._cache_key = None
+        self._content_key = None
+
+        self._dirty = numpy.union1d(self._dirty, indexes)
+        self._dirty_mask[indexes] = True  # type: ignore
+        self._overlay = None
+
+        if self._use_brute_force or (
+            len(self._dirty) > self._max_dirty_ratio * self._num_elements
+        ):
+            self._reset_engines()
+
+    def interpolate_attribute(  # pylint: disable=too-many-arguments
+        self,
+        positions: Union[hou.Geometry, numpy.ndarray, Sequence],
+        name: str,
+        method: str = "idw",
+        num_points: int = 8,
+        maxdist: Optional[float] = None,
+        power: float = 2,
+        bandwidth: Optional[float] = None,
+        workers: int = 1,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Interpolate a float point attribute of the source geometry at positions.
+
+        The attribute values are read once as an array and combined using the
+        nearest points to each position:
+
+        - "idw": inverse distance weighting using the power.
+        - "gaussian": a gaussian kernel.  If no bandwidth is supplied it is
+          half the distance to the farthest neighbor of each position.
+        - "nearest": the value of the nearest point.
+
+        Points added with update() must also exist in the source geometry.
+
+        :param positions: The positions to interpolate at.
+        :param name: The name of the point attribute.
+        :param method: The interpolation method.
+        :param num_points: The maximum number of points to interpolate from.
+        :param maxdist: The maximum distance to search.
+        :param power: The inverse distance weighting power.
+        :param bandwidth: The gaussian kernel bandwidth.
+        :param workers: The number of workers to query with, -1 uses all cores.
+        :return: An (N, size) array of values and whether any points were found
+                 for each position.
+
+        """
+        if method not in _INTERPOLATION_METHODS:
+            raise ValueError(f"Invalid interpolation method: {method}")
+
+        attrib = self._geometry.findPointAttrib(name)
+
+        if attrib is None:
+            raise hou.OperationFailed("Invalid attribute name.")
+
+        if attrib.dataType() != hou.attribData.Float:
+            raise ValueError("Attribute must be a float.")
+
+        if method == "nearest":
+            num_points = 1
+
+        values = numpy.frombuffer(
+            self._geometry.pointFloatAttribValuesAsString(
+                name, float_type=hou.numericData.Float32
+            ),
+            dtype=numpy.float32,
+        ).reshape((-1, attrib.size()))
+
+        numbers, distances = self.find_nearest_points_batch(
+            positions, num_points, maxdist, workers=workers
+        )
+
+        weights = _get_interpolation_weights(distances, method, power, bandwidth)
+
+        totals = weights.sum(axis=1)
+        found = totals > 0
+
+        # Missing neighbors have a weight of 0 so any valid point number can be
+        # used to look up their values.
+        neighbor_values = values[numpy.where(numbers >= 0, numbers, 0)]
+
+        result = numpy.einsum("ij,ijk->ik", weights, neighbor_values)
+        result[found] /= totals[found, numpy.newaxis]
+
+        return result, found
+
+    def transfer_attribute(  # pylint: disable=too-many-arguments
+        self,
+        target_geometry: hou.Geometry,
+        name: str,
+        method: str = "idw",
+        num_points: int = 8,
+        maxdist: Optional[float] = None,
+        power: float = 2,
+        bandwidth: Optional[float] = None,
+        target_name: Optional[str] = None,
+        workers: int = 1,
+    ):
+        """Transfer a float point attribute from the source geometry to the
+        points of the target geometry.
+
+        Values are interpolated with interpolate_attribute() and written to the
+        target in a single call.  The target attribute is created if it does not
+        exist.  Target points with no source points within the maxdist keep
+        their current values.
+
+        :param target_geometry: The geometry to transfer to.
+        :param name: The name of the point attribute.
+        :param method: The interpolation method.
+        :param num_points: The maximum number of points to interpolate from.
+        :param maxdist: The maximum distance to search.
+        :param power: The inverse distance weighting power.
+        :param bandwidth: The gaussian kernel bandwidth.
+        :param target_name: Optional name of the target attribute.
+        :param workers: The number of workers to query with, -1 uses all cores.
+        :return:
+
+        """
+        # Make sure the geometry is not read only.
+        if target_geometry.isReadOnly():
+            raise hou.GeometryPermissionError()
+
+        values, found = self.interpolate_attribute(
+            target_geometry,
+            name,
+            method,
+            num_points,
+            maxdist,
+            power,
+            bandwidth,
+            workers,
+        )
+
+        if target_name is None:
+            target_name = name
+
+        target_attrib = target_geometry.findPointAttrib(target_name)
+
+        if target_attrib is None:
+            source_attrib = self._geometry.findPointAttrib(name)
+
+            target_attrib = target_geometry.addAttrib(
+                hou.attribType.Point, target_name, source_attrib.defaultValue()
+            )
+
+        if target_attrib.size() != values.shape[1]:
+            raise ValueError("Target attribute size does not match the source.")
+
+        if not found.all():
+            current = numpy.frombuffer(
+                target_geometry.pointFloatAttribValuesAsString(
+                    target_name, float_type=hou.numericData.Float32
+                ),
+                dtype=numpy.float32,
+            ).reshape(values.shape)
+
+            values[~found] = current[~found]
+
+        target_geometry.setPointFloatAttribValuesFromString(
+            target_name,
+            values.astype(numpy.float32).tobytes(),
+            float_type=hou.numericData.Float32,
+        )
+
+    def sparse_distance_matrix(
+        self,
+        positions: Union[hou.Geometry, numpy.ndarray, Sequence],
+        maxdist: float,
+        workers: int = 1,
+        chunk_size: Optional[int] = None,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """Find the distances between positions and all points within the maxdist.
+
+        The result is a sparse distance matrix in coordinate form: for each
+        position and point within the maxdist there is an entry containing the
+        position index, the point number and the distance between them.
+
+        :param positions: The search positions.
+        :param maxdist: The maximum distance to search.
+        :param workers: The number of threads to query with, -1 uses all cores.
+        :param chunk_size: The number of positions in each chunk.
+        :return: int32 arrays of position indexes and point numbers and an array
+                 of distances.
+
+        """
+        data = _get_query_positions(positions)
+
+        result = self._radius_batch(
+            "sparse_distance_matrix", data, maxdist, chunk_size, workers
+        )
+
+        counts = numpy.fromiter(
+            (len(indexes) for indexes in result), dtype=int, count=len(result)
+        )
+
+        rows = numpy.repeat(numpy.arange(len(data)), counts)
+        indexes = numpy.concatenate(result).astype(int)
+
+        distances = numpy.linalg.norm(self._data[indexes] - data[rows], axis=1)
+
+        return (
+            rows.astype(numpy.int32),
+            self._map_indexes(indexes).astype(numpy.int32),
+            distances,
+        )
+
+
+class TiledPointCloud(_BasePointCloud):
+    """A point cloud which partitions space into bricks searched by separate trees.
+
+    Trees are only built for bricks as queries need them and the least recently
+    used trees are discarded once their estimated memory use exceeds the memory
+    budget.  This allows clouds which are too large for a single tree to be
+    searched, at the cost of rebuilding trees for bricks which are revisited.
+
+    Positions are stored as float32 values sorted by brick.
+
+    :param geometry: The source geometry.
+    :param brick_size: The size of each brick.
+    :param pattern: Optional point selecting pattern.
+    :param memory_budget: The maximum memory, in bytes, to use for trees.
+    :param leaf_size: The tree leaf size.
+    :return:
+
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        geometry: hou.Geometry,
+        brick_size: float,
+        pattern: Optional[str] = None,
+        memory_budget: int = 2 ** 29,
+        leaf_size: int = 10,
+    ):
+        super().__init__(geometry)
+
+        if brick_size <= 0:
+            raise ValueError("Brick size must be greater than 0")
+
+        self._brick_size = brick_size
+        self._leaf_size = leaf_size
+        self._memory_budget = memory_budget
+
+        # Built trees and their estimated memory use, by brick slot.
+        self._trees: OrderedDict = collections.OrderedDict()
+        self._memory_used = 0
+
+        data = self._get_positions(pattern)
+
+        if len(data) == 0:  # pylint: disable=len-as-condition
+            raise RuntimeError("Cannot create TiledPointCloud with 0 points")
+
+        self._num_elements = len(data)
+
+        self._origin = data.min(axis=0).astype(float)
+
+        cells = self._get_cells(data)
+
+        self._dims = cells.max(axis=0) + 1
+
+        keys = self._get_keys(cells)
+
+        # Sort the positions by brick so each brick is a contiguous range.
+        self._order = numpy.argsort(keys, kind="stable")
+        self._data = numpy.ascontiguousarray(data[self._order], dtype=numpy.float32)
+
+        self._keys, self._starts, self._counts = numpy.unique(
+            keys[self._order], return_index=True, return_counts=True
+        )
+
+    # -------------------------------------------------------------------------
+    # NON-PUBLIC METHODS
+    # -------------------------------------------------------------------------
+
+    def _find_bricks(self, cells: numpy.ndarray) -> numpy.ndarray:
+        """Find the occupied bricks for cell coordinates.
+
+        :param cells: An (N, 3) array of cell coordinates.
+        :return: An array of brick slots, with -1 for empty cells.
+
+        """
+        valid = numpy.all((cells >= 0) & (cells < self._dims), axis=1)
+
+        keys = self._get_keys(cells)
+
+        slots = numpy.searchsorted(self._keys, keys)
+        slots = numpy.minimum(slots, len(self._keys) - 1)
+
+        return numpy.where(valid & (self._keys[slots] == keys), slots, -1)
+
+    def _get_cells(self, positions: numpy.ndarray) -> numpy.ndarray:
+        """Get the brick cell coordinates of positions.
+
+        :param positions: An (N, 3) array of positions.
+        :return: An (N, 3) array of cell coordinates.
+
+        """
+        return numpy.floor((positions - self._origin) / self._brick_size).astype(
+            numpy.int64
+        )
+
+    def _get_keys(self, cells: numpy.ndarray) -> numpy.ndarray:
+        """Get the linear keys for cell coordinates.
+
+        :param cells: An (N, 3) array of cell coordinates.
+        :return: An array of cell keys.
+
+        """
+        return (cells[:, 0] * self._dims[1] + cells[:, 1]) * self._dims[2] + cells[
+            :, 2
+        ]
+
+    def _get_tree(self, slot: int) -> KDTreeEngine:
+        """Get the tree for a brick, building it if necessary.
+
+        Building a tree may cause the least recently used trees to be discarded.
+
+        :param slot: The brick slot.
+        :return: The brick's tree.
+
+        """
+        if slot in self._trees:
+            self._trees.move_to_end(slot)
+
+            return self._trees[slot][0]
+
+        start = self._starts[slot]
+        count = self._counts[slot]
+
+        tree = KDTreeEngine(self._data[start : start + count], self._leaf_size)
+
+        # Estimate the size of the tree's data, indexes and nodes.
+        size = count * 32 + (count // self._leaf_size + 1) * 2 * 128
+
+        self._trees[slot] = (tree, size)
+        self._memory_used += size
+
+        # Discard old trees, always keeping the one we just built.
+        while self._memory_used > self._memory_budget and len(self._trees) > 1:
+            _, (_, old_size) = self._trees.popitem(last=False)
+            self._memory_used -= old_size
+
+        return tree
+
+    def _group_by_brick(self, query_indexes: numpy.ndarray, slots: numpy.ndarray):
+        """Group queries by the brick they need to search.
+
+        :param query_indexes: The query indexes.
+        :param slots: The brick slot for each query, or -1 for none.
+        :return: A generator of brick slots and the queries which search them.
+
+        """
+        valid = slots >= 0
+
+        query_indexes = query_indexes[valid]
+        slots = slots[valid]
+
+        order = numpy.argsort(slots, kind="stable")
+
+        unique_slots, starts = numpy.unique(slots[order], return_index=True)
+
+        for slot, group in zip(unique_slots, numpy.split(query_indexes[order], starts[1:])):
+            yield slot, group
+
+    def _to_tree_indexes(self, slot: int, local_indexes: numpy.ndarray) -> numpy.ndarray:
+        """Convert indexes into a brick's tree into tree indexes for the cloud.
+
+        :param slot: The brick slot.
+        :param local_indexes: Indexes into the brick's tree.
+        :return: Indexes into the positions the cloud was built from.
+
+        """
+        return self._order[self._starts[slot] + local_indexes]
+
+    # -------------------------------------------------------------------------
+    # PROPERTIES
+    # -------------------------------------------------------------------------
+
+    @property
+    def brick_size(self) -> float:
+        """The size of each brick."""
+        return self._brick_size
+
+    @property
+    def memory_budget(self) -> int:
+        """The maximum memory, in bytes, to use for trees."""
+        return self._memory_budget
+
+    @memory_budget.setter
+    def memory_budget(self, memory_budget: int):
+        self._memory_budget = memory_budget
+
+    @property
+    def memory_used(self) -> int:
+        """The estimated memory, in bytes, used by built trees."""
+        return self._memory_used
+
+    @property
+    def num_bricks(self) -> int:
+        """The number of occupied bricks."""
+        return len(self._keys)
+
+    @property
+    def num_trees(self) -> int:
+        """The number of bricks which currently have a built tree."""
+        return len(self._trees)
+
+    # -------------------------------------------------------------------------
+    # METHODS
+    # -------------------------------------------------------------------------
+
+    def find_all_close_points_batch(
+        self,
+        positions: Union[hou.Geometry, numpy.ndarray, Sequence],
+        maxdist: float,
+        workers: int = 1,
+    ) -> Tuple[numpy.ndarray, ...]:
+        """Find all points within the maxdist from each of the positions.
+
+        Each brick within the maxdist of a position is searched, with all the
+        positions searching a brick queried with a single tree call.
+
+        :param positions: The search positions.
+        :param maxdist: The maximum distance to search.
+        :param workers: The number of workers to query with, -1 uses all cores.
+        :return: An array of found point numbers for each position.
+
+        """
+        data = _get_query_positions(positions)
+
+        query_cells = self._get_cells(data)
+
+        rings = int(numpy.ceil(maxdist / self._brick_size))
+
+        all_queries = numpy.arange(len(data))
+
+        query_indexes = [numpy.empty(0, dtype=int)]
+        indexes = [numpy.empty(0, dtype=int)]
+
+        # Search every brick which could contain points within the maxdist.
+        for offset in itertools.product(range(-rings, rings + 1), repeat=3):
+            slots = self._find_bricks(query_cells + offset)
+
+            for slot, group in self._group_by_brick(all_queries, slots):
+                result = self._get_tree(slot).query_ball_point(
+                    data[group], maxdist, workers=workers
+                )
+
+                counts = [len(local_indexes) for local_indexes in result]
+
+                query_indexes.append(numpy.repeat(group, counts))
+                indexes.append(self._to_tree_indexes(slot, numpy.concatenate(result)))
+
+        query_index_array = numpy.concatenate(query_indexes)
+        index_array = numpy.concatenate(indexes).astype(int)
+
+        # Sort the matches for each query.
+        keys = numpy.sort(query_index_array * self._num_elements + index_array)
+
+        counts = numpy.bincount(query_index_array, minlength=len(data))
+
+        return tuple(
+            self._map_indexes(tree_indexes)
+            for tree_indexes in numpy.split(
+                keys % self._num_elements, numpy.cumsum(counts)[:-1]
+            )
+        )
+
+    def find_nearest_points_batch(  # pylint: disable=too-many-locals
+        self,
+        positions: Union[hou.Geometry, numpy.ndarray, Sequence],
+        num_points: int = 1,
+        maxdist: Optional[float] = None,
+        workers: int = 1,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Find the closest N points to each of the positions.
+
+        Bricks are searched in rings of increasing size around the brick
+        containing each position until no unsearched brick could contain a
+        closer point.
+
+        The results are (N, num_points) arrays of point numbers and distances,
+        ordered by distance. If fewer than num_points points are found for a
+        position then the missing entries have a point number of -1 and an
+        infinite distance.
+
+        :param positions: The search positions.
+        :param num_points: The maximum number of points to search for.
+        :param maxdist: The maximum distance to search.
+        :param workers: The number of workers to query with, -1 uses all cores.
+        :return: Arrays of found point numbers and their distances.
+
+        """
+        if num_points < 1:
+            raise ValueError("Must choose 1 or more points")
+
+        num_points = min(num_points, self._num_elements)
+
+        data = _get_query_positions(positions)
+
+        if maxdist is None:
+            maxdist = numpy.inf
+
+        num_queries = len(data)
+
+        distances = numpy.full((num_queries, num_points), numpy.inf)
+        indexes = numpy.full((num_queries, num_points), self._num_elements)
+
+        # Center the search rings on the closest brick cell to each position.
+        centers = numpy.clip(self._get_cells(data), 0, self._dims - 1)
+
+        # The distance from each position to the edges of its center cell.
+        lower = data - (self._origin + centers * self._brick_size)
+        upper = self._brick_size - lower
+        edge_distances = numpy.min(numpy.minimum(lower, upper), axis=1)
+
+        pending = numpy.arange(num_queries)
+
+        ring = 0
+        max_ring = int(self._dims.max())
+
+        while len(pending) and ring <= max_ring:
+            for offset in itertools.product(range(-ring, ring + 1), repeat=3):
+                # Only search the shell of the ring since the inside has already
+                # been searched.
+                if max(abs(value) for value in offset) != ring:
+                    continue
+
+                slots = self._find_bricks(centers[pending] + offset)
+
+                for slot, group in self._group_by_brick(pending, slots):
+                    tree = self._get_tree(slot)
+
+                    brick_distances, local_indexes = tree.query(
+                        data[group], num_points, maxdist, workers=workers
+                    )
+
+                    brick_indexes = numpy.where(
+                        local_indexes == tree.num_elements,
+                        self._num_elements,
+                        self._to_tree_indexes(
+                            slot, numpy.minimum(local_indexes, tree.num_elements - 1)
+                        ),
+                    )
+
+                    # Merge with the closest points found so far.
+                    merged_distances = numpy.hstack((distances[group], brick_distances))
+                    merged_indexes = numpy.hstack((indexes[group], brick_indexes))
+
+                    order = numpy.argsort(merged_distances, axis=1, kind="stable")
+                    order = order[:, :num_points]
+
+                    distances[group] = numpy.take_along_axis(merged_distances, order, 1)
+                    indexes[group] = numpy.take_along_axis(merged_indexes, order, 1)
+
+            # Any unsearched point is at least this far from each position.
+            searched_distance = numpy.maximum(
+                edge_distances[pending] + ring * self._brick_size, 0
+            )
+
+            done = (distances[pending, -1] <= searched_distance) | (
+                searched_distance >= maxdist
+            )
+
+            pending = pending[~done]
+
+            ring += 1
+
+        missing = indexes == self._num_elements
 
-            else:
-                # We found a single point, so pass it along in a tuple..
-                near_points = self._get_result_points([indexes])
+        numbers = self._map_indexes(numpy.where(missing, 0, indexes))
+        numbers[missing] = -1
 
-        # Return the tuple of points.
-        return near_points
+        return numbers, distances
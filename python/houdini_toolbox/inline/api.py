@@ -15,8 +15,22 @@ from __future__ import annotations
 
 # Standard Library
 import ast
+import ctypes
 import math
-from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+import os
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+# Third Party
+import numpy
 
 # Houdini Toolbox
 from houdini_toolbox.inline import utils
@@ -32,6 +46,74 @@ if TYPE_CHECKING:
     StringTuple = Tuple[str, ...]
 
 
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+# Mapping between adjacency relationships and their inline function ids and the
+# expected number of entries for each vertex, used to size the indices.
+_ADJACENCY_TYPES = {
+    "point_point": (0, 2),
+    "prim_prim_by_point": (1, 4),
+    "prim_prim_by_edge": (2, 1),
+    "point_prim": (3, 1),
+}
+
+# Mapping between primitive measurements and their inline function ids and the
+# number of values they produce for each primitive.
+_PRIM_MEASUREMENTS = {
+    "area": (0, 1),
+    "perimeter": (1, 1),
+    "volume": (2, 1),
+    "bary_center": (3, 3),
+    "bounds": (4, 6),
+}
+
+# Mapping between parameter snapshot columns and their inline flag values.
+_PARM_SNAPSHOT_FLAGS = {
+    "is_string": 1,
+    "has_channel": 2,
+    "is_time_dependent": 4,
+    "is_multiparm_instance": 8,
+}
+
+# Mapping between batch user data operations and their inline function ids.
+_USER_DATA_OPERATIONS = {
+    "set": 0,
+    "delete": 1,
+    "clear": 2,
+}
+
+# Node events which change the parameters of a node.
+_MULTIPARM_NODE_EVENTS = (
+    hou.nodeEventType.BeingDeleted,
+    hou.nodeEventType.SpareParmTemplatesChanged,
+)
+
+# Asset events which can change installed definitions or the parameters of a
+# node type.
+_ASSET_EVENTS = (
+    hou.hdaEventType.AssetCreated,
+    hou.hdaEventType.AssetDeleted,
+    hou.hdaEventType.AssetSaved,
+    hou.hdaEventType.LibraryInstalled,
+    hou.hdaEventType.LibraryUninstalled,
+)
+
+# Whether the asset event callback has been registered.
+_ASSET_CALLBACK_REGISTERED = False
+
+# Installed asset libraries, meta sources and definitions.
+_HDA_INDEX: Dict[str, Dict] = {}
+
+# Multiparm data resolved from parameter template groups.  Data is keyed by node
+# type, or by node for nodes with spare parameters, and then by template name.
+_MULTIPARM_RESOLVERS: Dict[Tuple, Dict[str, Tuple]] = {}
+
+# The resolver key for each node, keyed by node session id.
+_MULTIPARM_NODE_KEYS: Dict[int, Tuple] = {}
+
+
 # =============================================================================
 # EXCEPTIONS
 # =============================================================================
@@ -81,6 +163,219 @@ def _assert_prim_vertex_index(prim: hou.Prim, index: int):
         raise IndexError(f"Invalid index: {index}")
 
 
+def _assert_indices(indices: ctypes.Array, count: int):
+    """Validate that element indices are valid for a number of elements.
+
+    If any index is not valid an IndexError will be raised.
+
+    :param indices: The element indices.
+    :param count: The number of elements.
+    :return:
+
+    """
+    # View the ctypes array so the check does not touch each value in Python.
+    values = numpy.frombuffer(indices, dtype=numpy.intc)
+
+    if values.size and (values.min() < 0 or values.max() >= count):
+        raise IndexError("Indices must be between 0 and the number of elements.")
+
+
+def _build_adjacency(
+    geometry: hou.Geometry, adjacency_type: str, num_rows: int
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Build compressed sparse row adjacency arrays for the geometry.
+
+    The adjacency is built in a single pass into an indices array sized from the
+    number of vertices.  Only if the entries do not fit is the adjacency built
+    again into an array of the exact size.
+
+    :param geometry: The source geometry.
+    :param adjacency_type: The name of the relationship.
+    :param num_rows: The number of rows.
+    :return: The int32 row offsets and column indices.
+
+    """
+    adjacency_id, entries_per_vertex = _ADJACENCY_TYPES[adjacency_type]
+
+    offsets = numpy.zeros(num_rows + 1, dtype=numpy.int32)
+    indices = numpy.zeros(
+        num_vertices(geometry) * entries_per_vertex, dtype=numpy.int32
+    )
+
+    # The arrays are written directly into their memory.
+    c_offsets = utils.build_c_int_array(offsets)
+
+    while True:
+        c_indices = utils.build_c_int_array(indices)
+
+        num_entries = _cpp_methods.buildAdjacency(
+            geometry,
+            adjacency_id,
+            c_offsets,
+            len(c_offsets),
+            c_indices,
+            len(c_indices),
+        )
+
+        if num_entries <= len(indices):
+            break
+
+        indices = numpy.zeros(num_entries, dtype=numpy.int32)
+
+    return offsets, indices[:num_entries]
+
+
+def _point_instance_transforms(
+    geometry: hou.Geometry, use_prims: bool
+) -> numpy.ndarray:
+    """Get transform matrices for all the points in the geometry.
+
+    :param geometry: The source geometry.
+    :param use_prims: Whether to use the transforms of bound primitives.
+    :return: An (N, 4, 4) array of point transforms.
+
+    """
+    values = numpy.zeros((num_points(geometry), 4, 4), dtype=numpy.float64)
+
+    # The values are written directly into the array's memory.
+    c_values = utils.build_c_double_array(values)
+
+    raw_point = _cpp_methods.pointInstanceTransforms(
+        geometry, use_prims, c_values, len(c_values)
+    )
+
+    if raw_point != -1:
+        raise hou.OperationFailed(f"Point {raw_point} is bound to raw geometry")
+
+    return values
+
+
+def _split_bounding_boxes(
+    bboxes: numpy.ndarray,
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Split an array of bounding boxes into minimum and maximum bounds.
+
+    :param bboxes: An (..., 2, 3) array of minimum and maximum bounds.
+    :return: The (..., 3) minimum and maximum bounds.
+
+    """
+    bboxes = numpy.asarray(bboxes, dtype=numpy.float64)
+
+    if bboxes.ndim < 2 or bboxes.shape[-2:] != (2, 3):
+        raise ValueError("Bounding boxes must be an (N, 2, 3) array.")
+
+    return bboxes[..., 0, :], bboxes[..., 1, :]
+
+
+def _get_group_element_count(
+    group: Union[hou.PointGroup, hou.PrimGroup, hou.VertexGroup]
+) -> int:
+    """Get the number of elements of the type a group contains.
+
+    :param group: The group.
+    :return: The number of points, primitives or vertices in the geometry.
+
+    """
+    geometry = group.geometry()
+
+    if isinstance(group, hou.PointGroup):
+        return num_points(geometry)
+
+    if isinstance(group, hou.PrimGroup):
+        return num_prims(geometry)
+
+    if isinstance(group, hou.VertexGroup):
+        return num_vertices(geometry)
+
+    raise ValueError("Group must be a point, primitive or vertex group.")
+
+
+def _get_element_count(geometry: hou.Geometry, attrib_type: hou.attribType) -> int:
+    """Get the number of elements in the geometry which own an attribute type.
+
+    :param geometry: The geometry to get the element count for.
+    :param attrib_type: The attribute type.
+    :return: The number of elements.
+
+    """
+    if attrib_type == hou.attribType.Point:
+        return num_points(geometry)
+
+    if attrib_type == hou.attribType.Prim:
+        return num_prims(geometry)
+
+    if attrib_type == hou.attribType.Vertex:
+        return num_vertices(geometry)
+
+    raise ValueError("Attribute must be a point, primitive or vertex attribute.")
+
+
+def _measure_prims(
+    geometry: hou.Geometry, group: Optional[hou.PrimGroup], measurement: str
+) -> numpy.ndarray:
+    """Measure the primitives in the geometry in a single parallel pass.
+
+    :param geometry: The geometry to measure.
+    :param group: Optional group of primitives to measure.
+    :param measurement: The name of the measurement.
+    :return: An (N, size) array of measured values.
+
+    """
+    group_name = ""
+
+    if group is not None:
+        if not isinstance(group, hou.PrimGroup):
+            raise ValueError("Group is not a primitive group.")
+
+        group_name = group.name()
+        num_elements = group_size(group)
+
+    else:
+        num_elements = num_prims(geometry)
+
+    measurement_id, size = _PRIM_MEASUREMENTS[measurement]
+
+    values = numpy.zeros((num_elements, size), dtype=numpy.float64)
+
+    # The values are written directly into the array's memory.
+    c_values = utils.build_c_double_array(values)
+
+    result = _cpp_methods.measurePrimitives(
+        geometry,
+        utils.string_encode(group_name),
+        measurement_id,
+        c_values,
+        len(c_values),
+    )
+
+    if not result:
+        raise hou.OperationFailed(f"Primitive group {group_name} does not exist.")
+
+    return values
+
+
+def _decode_string_array(values: Sequence[Union[bytes, str]]) -> numpy.ndarray:
+    """Decode a sequence of strings into an object array.
+
+    Byte strings are joined and decoded in a single call rather than one at a
+    time.  An object array only stores references to the strings so a single
+    long string does not increase the size of every element like a fixed width
+    string array would.
+
+    :param values: The values to decode.
+    :return: The decoded strings.
+
+    """
+    result = numpy.empty(len(values), dtype=object)
+
+    if values and isinstance(values[0], bytes):
+        values = b"\0".join(values).decode("utf-8").split("\0")
+
+    result[:] = values
+
+    return result
+
+
 def _get_names_in_folder(parent_template: hou.FolderParmTemplate) -> StringTuple:
     """Get a list of template names inside a template folder.
 
@@ -113,6 +408,226 @@ def _get_names_in_folder(parent_template: hou.FolderParmTemplate) -> StringTuple
     return tuple(str(name) for name in names)
 
 
+def _batch_modify_user_data(
+    paths: Sequence[str],
+    operation: str,
+    node_indices: Sequence[int],
+    names: Sequence[str],
+    values: Sequence[str],
+    block_events: bool,
+):
+    """Modify user data on a list of nodes.
+
+    No nodes are modified if any of the paths do not exist.
+
+    :param paths: The node paths.
+    :param operation: The user data operation.
+    :param node_indices: The index of the node in the paths for each item.
+    :param names: The user data name for each item.
+    :param values: The user data value for each item.
+    :param block_events: Whether to send a single change event per node after
+        all items have been processed.
+    :return:
+
+    """
+    missing = _cpp_methods.batchModifyUserData(
+        utils.build_c_string_array(paths),
+        len(paths),
+        _USER_DATA_OPERATIONS[operation],
+        utils.build_c_int_array(node_indices),
+        utils.build_c_string_array(names),
+        utils.build_c_string_array(values),
+        len(names),
+        block_events,
+    )
+
+    if missing:
+        missing_paths = ", ".join(paths[idx] for idx in missing)
+
+        raise hou.OperationFailed(f"Could not find nodes: {missing_paths}")
+
+
+def _get_multiparm_info(
+    node: hou.Node, name: str
+) -> Tuple[hou.parmData, Tuple[int, ...], Optional[str]]:
+    """Get the data needed to resolve a multiparm template name on a node.
+
+    The data is resolved from the node's parameter template group once and then
+    cached until the node's spare parameters or the node type's definition
+    changes.
+
+    :param node: The node with the multiparm.
+    :param name: The multiparm template name.
+    :return: The parameter data type, the containing multiparm offsets and the
+        name of the innermost containing multiparm folder.
+
+    """
+    resolver = _MULTIPARM_RESOLVERS.setdefault(_get_multiparm_resolver_key(node), {})
+
+    info = resolver.get(name)
+
+    if info is None:
+        ptg = node.parmTemplateGroup()
+
+        parm_template = ptg.find(name)
+
+        if parm_template is None:
+            raise ValueError(f"Name {name} does not map to a parameter on {node.path()}")
+
+        folders = utils.get_multiparm_containing_folders(name, ptg)
+
+        info = (
+            parm_template.dataType(),
+            utils.get_multiparm_container_offsets(name, ptg),
+            folders[0].name() if folders else None,
+        )
+
+        resolver[name] = info
+
+    return info
+
+
+def _get_multiparm_resolver_key(node: hou.Node) -> Tuple:
+    """Get the key of the cached multiparm data for a node.
+
+    Nodes without spare parameters share the data for their node type.  The key
+    is cached for each node until its spare parameters change.
+
+    :param node: The node to get the key for.
+    :return: The cache key.
+
+    """
+    _register_asset_event_callback()
+
+    session_id = node.sessionId()
+
+    key = _MULTIPARM_NODE_KEYS.get(session_id)
+
+    if key is None:
+        if node.spareParms():
+            key = ("node", session_id)
+
+        else:
+            key = ("type", node.type().nameWithCategory())
+
+        node.addEventCallback(_MULTIPARM_NODE_EVENTS, _on_multiparm_node_event)
+
+        _MULTIPARM_NODE_KEYS[session_id] = key
+
+    return key
+
+
+def _get_hda_index() -> Dict[str, Dict]:
+    """Get the index of installed asset libraries and definitions.
+
+    The index is built with a single query of the asset library manager and
+    cached until asset definitions or libraries change.
+
+    :return: The asset index.
+
+    """
+    if not _HDA_INDEX:
+        _register_asset_event_callback()
+
+        result = _cpp_methods.getHdaIndex()
+
+        library_paths = [utils.string_decode(value) for value in result.library_paths]
+        meta_sources = [utils.string_decode(value) for value in result.meta_sources]
+
+        library_meta_sources: Dict[str, str] = {}
+        meta_source_libraries: Dict[str, List[str]] = {}
+
+        for library_path, meta_source in zip(library_paths, meta_sources):
+            # Match the library manager by using the first library with a path.
+            library_meta_sources.setdefault(
+                _normalize_library_path(library_path), meta_source
+            )
+
+            meta_source_libraries.setdefault(meta_source, []).append(library_path)
+
+        dummy_definitions: Dict[Tuple[str, str, str], bool] = {}
+
+        for library_idx, category, name, is_dummy in zip(
+            result.definition_libraries,
+            result.definition_categories,
+            result.definition_names,
+            result.definition_dummies,
+        ):
+            key = (
+                _normalize_library_path(library_paths[library_idx]),
+                utils.string_decode(category),
+                utils.string_decode(name),
+            )
+
+            dummy_definitions.setdefault(key, bool(is_dummy))
+
+        _HDA_INDEX["dummy_definitions"] = dummy_definitions
+        _HDA_INDEX["library_meta_sources"] = library_meta_sources
+        _HDA_INDEX["meta_source_libraries"] = {
+            meta_source: tuple(paths)
+            for meta_source, paths in meta_source_libraries.items()
+        }
+
+    return _HDA_INDEX
+
+
+def _normalize_library_path(file_path: str) -> str:
+    """Normalize a library file path so equivalent paths match in the index.
+
+    Variables such as $HH are expanded and absolute paths are normalized.
+    Other values, such as "Embedded", are returned unchanged.
+
+    :param file_path: The path to normalize.
+    :return: The normalized path.
+
+    """
+    file_path = hou.text.expandString(file_path)
+
+    if os.path.isabs(file_path):
+        file_path = os.path.normpath(file_path)
+
+    return file_path
+
+
+def _on_asset_event(**kwargs):  # pylint: disable=unused-argument
+    """Clear cached data when asset definitions or libraries change.
+
+    :return:
+
+    """
+    clear_hda_index()
+    clear_multiparm_cache()
+
+
+def _on_multiparm_node_event(node: hou.Node, **kwargs):  # pylint: disable=unused-argument
+    """Clear cached multiparm data for a node when its parameters change.
+
+    :param node: The node which changed.
+    :return:
+
+    """
+    session_id = node.sessionId()
+
+    _MULTIPARM_NODE_KEYS.pop(session_id, None)
+    _MULTIPARM_RESOLVERS.pop(("node", session_id), None)
+
+    # The callback is added again when the node's data is next resolved.
+    node.removeEventCallback(_MULTIPARM_NODE_EVENTS, _on_multiparm_node_event)
+
+
+def _register_asset_event_callback():
+    """Register the callback which clears cached data when assets change.
+
+    :return:
+
+    """
+    global _ASSET_CALLBACK_REGISTERED  # pylint: disable=global-statement
+
+    if not _ASSET_CALLBACK_REGISTERED:
+        hou.hda.addEventCallback(_ASSET_EVENTS, _on_asset_event)
+        _ASSET_CALLBACK_REGISTERED = True
+
+
 # =============================================================================
 # FUNCTIONS
 # =============================================================================
@@ -216,6 +731,114 @@ def delete_user_data(node: hou.Node, name: str):
     _cpp_methods.deleteUserData(node, name)
 
 
+def batch_clear_user_data(paths: Sequence[str], block_events: bool = True):
+    """Clear all user data on a list of nodes.
+
+    This does not create an Undo event.
+
+    If block_events is True each node sends a single change event after all
+    the nodes have been processed.
+
+    No nodes are modified if any of the paths do not exist.
+
+    :param paths: The paths of the nodes to clear the user data from.
+    :param block_events: Whether to block change events until the batch completes.
+    :return:
+
+    """
+    _batch_modify_user_data(paths, "clear", [], [], [], block_events)
+
+
+def batch_has_user_data(paths: Sequence[str], name: str) -> Tuple[bool, ...]:
+    """Check if a list of nodes have user data under the supplied name.
+
+    :param paths: The paths of the nodes to check for user data on.
+    :param name: The user data name.
+    :return: Whether or not each node has user data of the given name.
+
+    """
+    results = _cpp_methods.batchHasUserData(
+        utils.build_c_string_array(paths), len(paths), utils.string_encode(name)
+    )
+
+    if -1 in results:
+        missing_paths = ", ".join(
+            path for path, result in zip(paths, results) if result == -1
+        )
+
+        raise hou.OperationFailed(f"Could not find nodes: {missing_paths}")
+
+    return tuple(bool(result) for result in results)
+
+
+def batch_set_user_data(
+    paths: Sequence[str],
+    data: Union[Dict[str, str], Sequence[Dict[str, str]]],
+    block_events: bool = True,
+):
+    """Set user data on a list of nodes.
+
+    The data can be a single dictionary which is set on every node, or a list of
+    dictionaries containing the data for each node.
+
+    This does not create an Undo event.
+
+    If block_events is True each node sends a single change event after all
+    the data has been set.
+
+    No nodes are modified if any of the paths do not exist.
+
+    :param paths: The paths of the nodes to set user data on.
+    :param data: The user data names and values.
+    :param block_events: Whether to block change events until the batch completes.
+    :return:
+
+    """
+    if isinstance(data, dict):
+        data = [data] * len(paths)
+
+    if len(data) != len(paths):
+        raise ValueError("Length of data must equal the number of paths.")
+
+    node_indices = []
+    names = []
+    values = []
+
+    for idx, node_data in enumerate(data):
+        for name, value in node_data.items():
+            node_indices.append(idx)
+            names.append(name)
+            values.append(value)
+
+    _batch_modify_user_data(paths, "set", node_indices, names, values, block_events)
+
+
+def batch_delete_user_data(
+    paths: Sequence[str], names: Sequence[str], block_events: bool = True
+):
+    """Deletes any user data under the supplied names on a list of nodes.
+
+    This does not create an Undo event.
+
+    If block_events is True each node sends a single change event after all
+    the data has been deleted.
+
+    No nodes are modified if any of the paths do not exist.
+
+    :param paths: The paths of the nodes to delete user data from.
+    :param names: The user data names.
+    :param block_events: Whether to block change events until the batch completes.
+    :return:
+
+    """
+    node_indices = [idx for idx in range(len(paths)) for _ in names]
+    item_names = list(names) * len(paths)
+
+    _batch_modify_user_data(
+        paths, "delete", node_indices, item_names, [""] * len(item_names), block_events
+    )
+
+
 def hash_string(value: str) -> int:
     """Generate a hash value from a string.
 
@@ -406,24 +1029,51 @@ def num_prim_vertices(prim: hou.Prim) -> int:
 
 
 def sort_geometry_by_values(
-    geometry: hou.Geometry, geometry_type: hou.geometryType, values: List[float]
-):
+    geometry: hou.Geometry,
+    geometry_type: hou.geometryType,
+    values: Union[List[float], Sequence[Sequence[float]], numpy.ndarray],
+    return_permutation: bool = False,
+) -> Optional[numpy.ndarray]:
     """Sort points or primitives based on a list of corresponding values.
 
     The list of values must be the same length as the number of geometry
-    elements to be sourced.
+    elements to be sourced.  numpy arrays are passed without per element
+    conversion.
+
+    Multiple keys can be sorted by passing a sequence of value lists, or a
+    2D array with a row per key.  Elements are sorted by the first key, then
+    by the second key where the first are equal and so on.  The sort is stable
+    so elements with all equal keys keep their original order.  All values
+    must be finite.
+
+    If return_permutation is True the geometry is not modified and the order
+    the elements would be sorted into is returned instead.
 
     :param geometry: The geometry to sort.
     :param geometry_type: The type of geometry to sort.
-    :param values: The values to sort by.
-    :return:
+    :param values: The values, or list of key values, to sort by.
+    :param return_permutation: Whether to return the sorted order instead of
+        sorting the geometry.
+    :return: The sorted element numbers if return_permutation is True.
 
     """
     # Make sure the geometry is not read only.
-    if geometry.isReadOnly():
+    if not return_permutation and geometry.isReadOnly():
         raise hou.GeometryPermissionError()
 
-    num_values = len(values)
+    keys = numpy.asarray(values, dtype=numpy.float64)
+
+    if keys.ndim == 1:
+        keys = keys.reshape(1, -1)
+
+    if keys.ndim != 2 or not len(keys):
+        raise ValueError("Values must be a list of values or a list of keys.")
+
+    # NaN values cannot be ordered so they would make the sort order arbitrary.
+    if not numpy.isfinite(keys).all():
+        raise ValueError("Values must be finite.")
+
+    num_keys, num_values = keys.shape
 
     if geometry_type == hou.geometryType.Points:
         # Check we have enough points.
@@ -442,12 +1092,25 @@ def sort_geometry_by_values(
     else:
         raise ValueError("Geometry type must be points or primitives.")
 
+    order = numpy.zeros(num_values, dtype=numpy.int32)
+
+    # The order is written directly into the array's memory.
+    c_order = utils.build_c_int_array(order)
+
+    _cpp_methods.getSortPermutation(
+        utils.build_c_double_array(keys), num_keys, num_values, c_order
+    )
+
+    if return_permutation:
+        return order
+
     attrib_owner = utils.get_attrib_owner_from_geometry_type(geometry_type)
 
-    # Construct a ctypes double array to pass the values.
-    c_values = utils.build_c_double_array(values)
+    _cpp_methods.sortGeometryByPermutation(
+        geometry, attrib_owner, c_order, num_values
+    )
 
-    _cpp_methods.sortGeometryByValues(geometry, attrib_owner, c_values)
+    return None
 
 
 def create_point_at_position(
@@ -489,6 +1152,74 @@ def create_n_points(geometry: hou.Geometry, npoints: int) -> Tuple[hou.Point, ..
     return tuple(geometry.points()[-npoints:])
 
 
+def create_points_from_arrays(
+    geometry: hou.Geometry,
+    positions: numpy.ndarray,
+    attrib_values: Optional[Dict[str, numpy.ndarray]] = None,
+) -> int:
+    """Create new points from an array of positions.
+
+    Optional attribute values can be passed as a dictionary of existing
+    numeric point attribute names and arrays containing a value for each new
+    point.
+
+    :param geometry: The geometry to create points for.
+    :param positions: An (N, 3) array of point positions.
+    :param attrib_values: Optional attribute values to set.
+    :return: The point number of the first new point.
+
+    """
+    # Make sure the geometry is not read only.
+    if geometry.isReadOnly():
+        raise hou.GeometryPermissionError()
+
+    positions = numpy.asarray(positions, dtype=numpy.float64)
+
+    if positions.ndim != 2 or positions.shape[1] != 3 or not len(positions):
+        raise ValueError("Positions must be an (N, 3) array.")
+
+    num_points = len(positions)
+
+    names = []
+    sizes = []
+    arrays = []
+
+    for name, values in (attrib_values or {}).items():
+        attrib = geometry.findPointAttrib(name)
+
+        if attrib is None:
+            raise hou.OperationFailed(f"Point attribute {name} does not exist.")
+
+        if attrib.dataType() not in (hou.attribData.Float, hou.attribData.Int):
+            raise ValueError(f"Attribute {name} must be a float or int attribute.")
+
+        values = numpy.asarray(values, dtype=numpy.float64).reshape(-1)
+
+        if len(values) != num_points * attrib.size():
+            raise ValueError(f"Incorrect value array size for attribute {name}.")
+
+        names.append(name)
+        sizes.append(attrib.size())
+        arrays.append(values)
+
+    if arrays:
+        values = numpy.concatenate(arrays)
+
+    else:
+        values = numpy.zeros(0, dtype=numpy.float64)
+
+    return _cpp_methods.createPointsFromArrays(
+        geometry,
+        utils.build_c_double_array(positions),
+        positions.size,
+        utils.build_c_string_array(names),
+        utils.build_c_int_array(sizes),
+        len(names),
+        utils.build_c_double_array(values),
+        len(values),
+    )
+
+
 def merge_point_group(geometry: hou.Geometry, group: hou.PointGroup):
     """Merges points from a group into the geometry.
 
@@ -526,6 +1257,32 @@ def merge_points(geometry: hou.Geometry, points: List[hou.Point]):
     _cpp_methods.mergePoints(geometry, points[0].geometry(), c_values, len(c_values))
 
 
+def merge_points_by_indices(
+    geometry: hou.Geometry,
+    source_geometry: hou.Geometry,
+    indices: Union[List[int], numpy.ndarray],
+):
+    """Merge points from a detail into the geometry by their point numbers.
+
+    numpy arrays are passed without per element conversion.
+
+    :param geometry: The geometry to merge into.
+    :param source_geometry: The geometry to merge from.
+    :param indices: The point numbers to merge.
+    :return:
+
+    """
+    # Make sure the geometry is not read only.
+    if geometry.isReadOnly():
+        raise hou.GeometryPermissionError()
+
+    c_values = utils.build_c_int_array(indices)
+
+    _assert_indices(c_values, num_points(source_geometry))
+
+    _cpp_methods.mergePoints(geometry, source_geometry, c_values, len(c_values))
+
+
 def merge_prim_group(geometry: hou.Geometry, group: hou.PrimGroup):
     """Merges primitives from a group into the geometry.
 
@@ -563,6 +1320,32 @@ def merge_prims(geometry: hou.Geometry, prims: List[hou.Prim]):
     _cpp_methods.mergePrims(geometry, prims[0].geometry(), c_values, len(c_values))
 
 
+def merge_prims_by_indices(
+    geometry: hou.Geometry,
+    source_geometry: hou.Geometry,
+    indices: Union[List[int], numpy.ndarray],
+):
+    """Merge primitives from a detail into the geometry by their numbers.
+
+    numpy arrays are passed without per element conversion.
+
+    :param geometry: The geometry to merge into.
+    :param source_geometry: The geometry to merge from.
+    :param indices: The primitive numbers to merge.
+    :return:
+
+    """
+    # Make sure the geometry is not read only.
+    if geometry.isReadOnly():
+        raise hou.GeometryPermissionError()
+
+    c_values = utils.build_c_int_array(indices)
+
+    _assert_indices(c_values, num_prims(source_geometry))
+
+    _cpp_methods.mergePrims(geometry, source_geometry, c_values, len(c_values))
+
+
 def copy_attribute_values(
     source_element: GeometryEntity,
     source_attribs: List[hou.Attrib],
@@ -620,14 +1403,16 @@ def copy_attribute_values(
 def batch_copy_attributes_by_indices(
     source_geometry: hou.Geometry,
     source_type: GeometryEntity,
-    source_indices: Union[List[int], Tuple[int]],
+    source_indices: Union[List[int], Tuple[int], numpy.ndarray],
     source_attribs: Union[List[hou.Attrib], Tuple[hou.Attrib]],
     target_geometry: hou.Geometry,
     target_type: GeometryEntity,
-    target_indices: Union[List[int], Tuple[int]],
+    target_indices: Union[List[int], Tuple[int], numpy.ndarray],
 ):
     """Batch copy attributes given lists of indices.
 
+    numpy arrays of indices are passed without per element conversion.
+
     :param source_geometry: The geometry to copy attributes from.
     :param source_type: The source entity type.
     :param source_indices: Source entity indices.
@@ -1027,6 +1812,68 @@ def connected_points(point: hou.Point) -> Tuple[hou.Point, ...]:
     return utils.get_points_from_list(geometry, result)
 
 
+def point_point_adjacency(
+    geometry: hou.Geometry,
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Get the points which share an edge with each point.
+
+    The result is in compressed sparse row form: the connected point numbers for
+    point i are indices[offsets[i]:offsets[i + 1]], in ascending order.  Only
+    face primitives have edges.
+
+    :param geometry: The source geometry.
+    :return: The int32 row offsets and point numbers.
+
+    """
+    return _build_adjacency(geometry, "point_point", num_points(geometry))
+
+
+def point_prim_adjacency(
+    geometry: hou.Geometry,
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Get the primitives which reference each point.
+
+    The result is in compressed sparse row form: the primitive numbers for point
+    i are indices[offsets[i]:offsets[i + 1]], in ascending order.
+
+    :param geometry: The source geometry.
+    :return: The int32 row offsets and primitive numbers.
+
+    """
+    return _build_adjacency(geometry, "point_prim", num_points(geometry))
+
+
+def prim_prim_by_edge_adjacency(
+    geometry: hou.Geometry,
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Get the primitives which share an edge with each primitive.
+
+    The result is in compressed sparse row form: the adjacent primitive numbers
+    for primitive i are indices[offsets[i]:offsets[i + 1]], in ascending order.
+    Only face primitives have edges.
+
+    :param geometry: The source geometry.
+    :return: The int32 row offsets and primitive numbers.
+
+    """
+    return _build_adjacency(geometry, "prim_prim_by_edge", num_prims(geometry))
+
+
+def prim_prim_by_point_adjacency(
+    geometry: hou.Geometry,
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Get the primitives which share a point with each primitive.
+
+    The result is in compressed sparse row form: the adjacent primitive numbers
+    for primitive i are indices[offsets[i]:offsets[i + 1]], in ascending order.
+
+    :param geometry: The source geometry.
+    :return: The int32 row offsets and primitive numbers.
+
+    """
+    return _build_adjacency(geometry, "prim_prim_by_point", num_prims(geometry))
+
+
 def prims_connected_to_point(point: hou.Point) -> Tuple[hou.Prim, ...]:
     """Get all primitives that reference the point.
 
@@ -1146,6 +1993,103 @@ def set_vertex_string_attrib_values(
     )
 
 
+def indexed_string_attrib_values(
+    attrib: hou.Attrib,
+) -> Tuple[StringTuple, numpy.ndarray]:
+    """Get a string attribute's values as a table of strings and an index into
+    the table for each element.
+
+    This is much cheaper than getting a string for each element when there are
+    many elements but few unique values.  Elements with empty values have an
+    index of -1.  Attributes with more than one tuple component have a column
+    of indices for each component.
+
+    :param attrib: The point, primitive or vertex string attribute.
+    :return: The unique strings and an int32 array of indices.
+
+    """
+    if attrib.dataType() != hou.attribData.String:
+        raise ValueError("Attribute must be a string.")
+
+    geometry = attrib.geometry()
+
+    num_elements = _get_element_count(geometry, attrib.type())
+
+    indices = numpy.empty((num_elements, attrib.size()), dtype=numpy.int32)
+
+    # The indices are written directly into the array's memory.
+    c_indices = utils.build_c_int_array(indices)
+
+    results = _cpp_methods.getIndexedStringAttribValues(
+        geometry,
+        utils.get_attrib_owner(attrib.type()),
+        utils.string_encode(attrib.name()),
+        c_indices,
+        num_elements,
+    )
+
+    if attrib.size() == 1:
+        indices = indices.reshape(-1)
+
+    return utils.clean_string_values(results), indices
+
+
+def set_indexed_string_attrib_values(
+    attrib: hou.Attrib,
+    strings: Sequence[str],
+    indices: Union[Sequence[int], numpy.ndarray],
+):
+    """Set a string attribute's values from a table of strings and an index into
+    the table for each element.
+
+    Elements with an index of -1 are set to an empty value.  Attributes with
+    more than one tuple component need an (N, size) array with a column of
+    indices for each component.
+
+    :param attrib: The point, primitive or vertex string attribute.
+    :param strings: The unique strings.
+    :param indices: An index into the strings for each element.
+    :return:
+
+    """
+    geometry = attrib.geometry()
+
+    # Make sure the geometry is not read only.
+    if geometry.isReadOnly():
+        raise hou.GeometryPermissionError()
+
+    if attrib.dataType() != hou.attribData.String:
+        raise ValueError("Attribute must be a string.")
+
+    num_elements = _get_element_count(geometry, attrib.type())
+
+    indices = numpy.asarray(indices)
+
+    shape = (num_elements, attrib.size())
+
+    if indices.shape != shape and (attrib.size() > 1 or indices.shape != shape[:1]):
+        raise ValueError("Incorrect attribute index sequence size.")
+
+    c_indices = utils.build_c_int_array(indices)
+
+    values = numpy.frombuffer(c_indices, dtype=numpy.intc)
+
+    if values.size and (values.min() < -1 or values.max() >= len(strings)):
+        raise IndexError("Indices must be -1 or a valid string index.")
+
+    c_strings = utils.build_c_string_array(strings)
+
+    _cpp_methods.setIndexedStringAttribValues(
+        geometry,
+        utils.get_attrib_owner(attrib.type()),
+        utils.string_encode(attrib.name()),
+        c_strings,
+        len(c_strings),
+        c_indices,
+        num_elements,
+    )
+
+
 def set_shared_point_string_attrib(
     geometry: hou.Geometry,
     name: str,
@@ -1425,6 +2369,67 @@ def primitive_volume(prim: hou.Prim) -> float:
     return prim.intrinsicValue("measuredvolume")
 
 
+def primitive_areas(
+    geometry: hou.Geometry, group: Optional[hou.PrimGroup] = None
+) -> numpy.ndarray:
+    """Get the areas of all the primitives in the geometry.
+
+    The areas match the "measuredarea" intrinsic values returned by
+    primitive_area().
+
+    :param geometry: The geometry to measure.
+    :param group: Optional group of primitives to measure.
+    :return: An array of primitive areas.
+
+    """
+    return _measure_prims(geometry, group, "area")[:, 0]
+
+
+def primitive_perimeters(
+    geometry: hou.Geometry, group: Optional[hou.PrimGroup] = None
+) -> numpy.ndarray:
+    """Get the perimeters of all the primitives in the geometry.
+
+    The perimeters match the "measuredperimeter" intrinsic values returned by
+    primitive_perimeter().
+
+    :param geometry: The geometry to measure.
+    :param group: Optional group of primitives to measure.
+    :return: An array of primitive perimeters.
+
+    """
+    return _measure_prims(geometry, group, "perimeter")[:, 0]
+
+
+def primitive_volumes(
+    geometry: hou.Geometry, group: Optional[hou.PrimGroup] = None
+) -> numpy.ndarray:
+    """Get the volumes of all the primitives in the geometry.
+
+    The volumes match the "measuredvolume" intrinsic values returned by
+    primitive_volume().
+
+    :param geometry: The geometry to measure.
+    :param group: Optional group of primitives to measure.
+    :return: An array of primitive volumes.
+
+    """
+    return _measure_prims(geometry, group, "volume")[:, 0]
+
+
+def primitive_bary_centers(
+    geometry: hou.Geometry, group: Optional[hou.PrimGroup] = None
+) -> numpy.ndarray:
+    """Get the barycenters of all the primitives in the geometry.
+
+    :param geometry: The geometry to measure.
+    :param group: Optional group of primitives to measure.
+    :return: An (N, 3) array of primitive barycenters.
+
+    """
+    return _measure_prims(geometry, group, "bary_center")
+
+
 def reverse_prim(prim: hou.Prim):
     """Reverse the vertex order of the primitive.
 
@@ -1508,36 +2513,209 @@ def primitive_bounding_box(prim: hou.Prim) -> hou.BoundingBox:
     )
 
 
-def destroy_empty_groups(geometry: hou.Geometry, attrib_type: hou.attribType):
-    """Remove any empty groups of the specified type.
+def primitive_bounding_boxes(
+    geometry: hou.Geometry, group: Optional[hou.PrimGroup] = None
+) -> numpy.ndarray:
+    """Get the bounding boxes of all the primitives in the geometry.
+
+    :param geometry: The geometry to measure.
+    :param group: Optional group of primitives to measure.
+    :return: An (N, 2, 3) array of minimum and maximum bounds.
+
+    """
+    return _measure_prims(geometry, group, "bounds").reshape((-1, 2, 3))
+
+
+def destroy_empty_groups(geometry: hou.Geometry, attrib_type: hou.attribType):
+    """Remove any empty groups of the specified type.
+
+    :param geometry: The geometry to destroy empty groups for.
+    :param attrib_type: The type of groups to destroy.
+    :return:
+
+    """
+    # Make sure the geometry is not read only.
+    if geometry.isReadOnly():
+        raise hou.GeometryPermissionError()
+
+    if attrib_type == hou.attribType.Global:
+        raise ValueError("Attribute type must be point, primitive or vertex.")
+
+    # Get the corresponding attribute type id.
+    attrib_owner = utils.get_attrib_owner(attrib_type)
+
+    _cpp_methods.destroyEmptyGroups(geometry, attrib_owner)
+
+
+def rename_group(
+    group: Union[hou.EdgeGroup, hou.PointGroup, hou.PrimGroup], new_name: str
+) -> Optional[Union[hou.EdgeGroup, hou.PointGroup, hou.PrimGroup]]:
+    """Rename a group.
+
+    :param group: The group to rename.
+    :param new_name: The new group name.
+    :return: The new group, if it was renamed, otherwise None.
+
+
+    """
+    geometry = group.geometry()
+
+    # Make sure the geometry is not read only.
+    if geometry.isReadOnly():
+        raise hou.GeometryPermissionError()
+
+    # Ensure the new group doesn't have the same name.
+    if new_name == group.name():
+        raise hou.OperationFailed("Cannot rename to same name.")
+
+    group_type = utils.get_group_type(group)
+
+    success = _cpp_methods.renameGroup(
+        geometry,
+        utils.string_encode(group.name()),
+        utils.string_encode(new_name),
+        group_type,
+    )
+
+    if success:
+        return utils.find_group(geometry, group_type, new_name)
+
+    return None
+
+
+def group_bounding_box(
+    group: Union[hou.EdgeGroup, hou.PointGroup, hou.PrimGroup]
+) -> hou.BoundingBox:
+    """Get the bounding box of the group.
+
+    :param group: The group to get the bounding box for.
+    :return: The bounding box for the group.
+
+    """
+    group_type = utils.get_group_type(group)
+
+    # Calculate the bounds for the group.
+    bounds = _cpp_methods.groupBoundingBox(
+        group.geometry(), group_type, utils.string_encode(group.name())
+    )
+
+    return hou.BoundingBox(*bounds)
+
+
+def group_bounding_boxes(
+    groups: Sequence[Union[hou.EdgeGroup, hou.PointGroup, hou.PrimGroup]]
+) -> numpy.ndarray:
+    """Get the bounding boxes of a list of groups.
+
+    The groups must all belong to the same geometry.  Empty groups do not have
+    valid bounds so their bounding boxes are NaN, which makes any measurements
+    of them NaN and any comparisons with them False.
+
+    :param groups: The groups to get the bounding boxes for.
+    :return: An (N, 2, 3) array of minimum and maximum bounds.
+
+    """
+    values = numpy.zeros((len(groups), 2, 3), dtype=numpy.float64)
+
+    if not groups:
+        return values
+
+    geometry = groups[0].geometry()
+
+    for group in groups[1:]:
+        if not utils.geo_details_match(geometry, group.geometry()):
+            raise ValueError("Groups must belong to the same geometry.")
+
+    for group in groups:
+        if not isinstance(group, (hou.EdgeGroup, hou.PointGroup, hou.PrimGroup)):
+            raise ValueError("Groups must be point, primitive or edge groups.")
+
+    group_types = [utils.get_group_type(group) for group in groups]
+
+    # The values are written directly into the array's memory.
+    c_values = utils.build_c_double_array(values)
+
+    _cpp_methods.groupBoundingBoxes(
+        geometry,
+        utils.build_c_int_array(group_types),
+        utils.build_c_string_array([group.name() for group in groups]),
+        len(groups),
+        c_values,
+        len(c_values),
+    )
+
+    # Empty groups have inverted bounds.
+    values[numpy.any(values[:, 0] > values[:, 1], axis=1)] = numpy.nan
+
+    return values
+
+
+def group_size(group: Union[hou.EdgeGroup, hou.PointGroup, hou.PrimGroup]) -> int:
+    """Get the number of elements in this group.
+
+    :param group: The group to get the size of.
+    :return: The group size.
+
+    """
+    group_type = utils.get_group_type(group)
+
+    return _cpp_methods.groupSize(
+        group.geometry(), utils.string_encode(group.name()), group_type
+    )
+
+
+def group_membership(
+    group: Union[hou.PointGroup, hou.PrimGroup, hou.VertexGroup], packed: bool = False
+) -> numpy.ndarray:
+    """Get the membership of a group as an array.
 
-    :param geometry: The geometry to destroy empty groups for.
-    :param attrib_type: The type of groups to destroy.
-    :return:
+    The result contains an entry for every point, primitive or vertex in the
+    geometry which is True if the element is in the group.  If packed is True
+    the entries are packed into the bits of a uint8 array with numpy.packbits().
+
+    :param group: The point, primitive or vertex group.
+    :param packed: Whether to pack the entries into bits.
+    :return: A bool, or packed uint8, array of membership.
 
     """
-    # Make sure the geometry is not read only.
-    if geometry.isReadOnly():
-        raise hou.GeometryPermissionError()
+    num_elements = _get_group_element_count(group)
 
-    if attrib_type == hou.attribType.Global:
-        raise ValueError("Attribute type must be point, primitive or vertex.")
+    values = numpy.zeros(num_elements, dtype=numpy.intc)
 
-    # Get the corresponding attribute type id.
-    attrib_owner = utils.get_attrib_owner(attrib_type)
+    # The values are written directly into the array's memory.
+    c_values = utils.build_c_int_array(values)
 
-    _cpp_methods.destroyEmptyGroups(geometry, attrib_owner)
+    _cpp_methods.getGroupMembership(
+        group.geometry(),
+        utils.get_group_type(group),
+        utils.string_encode(group.name()),
+        c_values,
+        num_elements,
+    )
 
+    result = values.astype(bool)
 
-def rename_group(
-    group: Union[hou.EdgeGroup, hou.PointGroup, hou.PrimGroup], new_name: str
-) -> Optional[Union[hou.EdgeGroup, hou.PointGroup, hou.PrimGroup]]:
-    """Rename a group.
+    if packed:
+        return numpy.packbits(result)
 
-    :param group: The group to rename.
-    :param new_name: The new group name.
-    :return: The new group, if it was renamed, otherwise None.
+    return result
+
+
+def set_group_membership(
+    group: Union[hou.PointGroup, hou.PrimGroup, hou.VertexGroup],
+    values: numpy.ndarray,
+    packed: bool = False,
+):
+    """Set the membership of a group from an array.
+
+    The values contain an entry for every point, primitive or vertex in the
+    geometry which is True if the element should be in the group.  If packed is
+    True the values are bits packed with numpy.packbits().
 
+    :param group: The point, primitive or vertex group.
+    :param values: A bool, or packed uint8, array of membership.
+    :param packed: Whether the entries are packed into bits.
+    :return:
 
     """
     geometry = group.geometry()
@@ -1546,55 +2724,82 @@ def rename_group(
     if geometry.isReadOnly():
         raise hou.GeometryPermissionError()
 
-    # Ensure the new group doesn't have the same name.
-    if new_name == group.name():
-        raise hou.OperationFailed("Cannot rename to same name.")
+    num_elements = _get_group_element_count(group)
 
-    group_type = utils.get_group_type(group)
+    values = numpy.asarray(values)
 
-    success = _cpp_methods.renameGroup(
+    if packed:
+        if len(values) != (num_elements + 7) // 8:
+            raise ValueError("Incorrect packed membership array size.")
+
+        values = numpy.unpackbits(values.astype(numpy.uint8), count=num_elements)
+
+    elif len(values) != num_elements:
+        raise ValueError("Incorrect membership array size.")
+
+    c_values = utils.build_c_int_array(values != 0)
+
+    _cpp_methods.setGroupMembership(
         geometry,
+        utils.get_group_type(group),
         utils.string_encode(group.name()),
-        utils.string_encode(new_name),
-        group_type,
+        c_values,
+        num_elements,
     )
 
-    if success:
-        return utils.find_group(geometry, group_type, new_name)
 
-    return None
+def edge_group_points(group: hou.EdgeGroup) -> numpy.ndarray:
+    """Get the edges in an edge group as an array of point numbers.
 
+    :param group: The edge group.
+    :return: An (N, 2) int32 array of edge point numbers.
 
-def group_bounding_box(
-    group: Union[hou.EdgeGroup, hou.PointGroup, hou.PrimGroup]
-) -> hou.BoundingBox:
-    """Get the bounding box of the group.
+    """
+    if not isinstance(group, hou.EdgeGroup):
+        raise ValueError("Group is not an edge group.")
 
-    :param group: The group to get the bounding box for.
-    :return: The bounding box for the group.
+    values = numpy.zeros((group_size(group), 2), dtype=numpy.int32)
 
-    """
-    group_type = utils.get_group_type(group)
+    # The values are written directly into the array's memory.
+    c_values = utils.build_c_int_array(values)
 
-    # Calculate the bounds for the group.
-    bounds = _cpp_methods.groupBoundingBox(
-        group.geometry(), group_type, utils.string_encode(group.name())
+    _cpp_methods.getEdgeGroupPoints(
+        group.geometry(), utils.string_encode(group.name()), c_values, len(c_values)
     )
 
-    return hou.BoundingBox(*bounds)
+    return values
 
 
-def group_size(group: Union[hou.EdgeGroup, hou.PointGroup, hou.PrimGroup]) -> int:
-    """Get the number of elements in this group.
+def set_edge_group_points(group: hou.EdgeGroup, points: numpy.ndarray):
+    """Set the edges in an edge group from an array of point numbers.
 
-    :param group: The group to get the size of.
-    :return: The group size.
+    Any existing edges are removed from the group.
+
+    :param group: The edge group.
+    :param points: An (N, 2) array of edge point numbers.
+    :return:
 
     """
-    group_type = utils.get_group_type(group)
+    if not isinstance(group, hou.EdgeGroup):
+        raise ValueError("Group is not an edge group.")
 
-    return _cpp_methods.groupSize(
-        group.geometry(), utils.string_encode(group.name()), group_type
+    geometry = group.geometry()
+
+    # Make sure the geometry is not read only.
+    if geometry.isReadOnly():
+        raise hou.GeometryPermissionError()
+
+    points = numpy.asarray(points)
+
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError("Points must be an (N, 2) array.")
+
+    c_values = utils.build_c_int_array(points)
+
+    _assert_indices(c_values, num_points(geometry))
+
+    _cpp_methods.setEdgeGroupPoints(
+        geometry, utils.string_encode(group.name()), c_values, len(c_values)
     )
 
 
@@ -1969,6 +3174,102 @@ def bounding_box_volume(bbox: hou.BoundingBox) -> float:
     return _cpp_methods.boundingBoxVolume(bbox)
 
 
+def batch_bounding_box_is_inside(
+    source_bboxes: numpy.ndarray, target_bboxes: numpy.ndarray
+) -> numpy.ndarray:
+    """Determine if bounding boxes are totally enclosed by other boxes.
+
+    Bounding boxes are (N, 2, 3) arrays of minimum and maximum bounds, such as
+    those from primitive_bounding_boxes() or group_bounding_boxes().  The
+    arrays are broadcast against each other so a single box can be tested
+    against many, or every pair tested by adding an axis to either array.
+
+    :param source_bboxes: The bounding boxes to check for being enclosed.
+    :param target_bboxes: The bounding boxes to check for enclosure.
+    :return: Whether or not each box is totally enclosed by the other box.
+
+    """
+    source_min, source_max = _split_bounding_boxes(source_bboxes)
+    target_min, target_max = _split_bounding_boxes(target_bboxes)
+
+    return numpy.all((source_min >= target_min) & (source_max <= target_max), axis=-1)
+
+
+def batch_bounding_boxes_intersect(
+    bboxes1: numpy.ndarray, bboxes2: numpy.ndarray
+) -> numpy.ndarray:
+    """Determine if pairs of bounding boxes intersect.
+
+    The arrays are broadcast against each other like
+    batch_bounding_box_is_inside().
+
+    :param bboxes1: The bounding boxes to check for intersection with.
+    :param bboxes2: The bounding boxes to check for intersection with.
+    :return: Whether or not each pair of boxes intersect.
+
+    """
+    min1, max1 = _split_bounding_boxes(bboxes1)
+    min2, max2 = _split_bounding_boxes(bboxes2)
+
+    return numpy.all((min1 <= max2) & (max1 >= min2), axis=-1)
+
+
+def batch_compute_bounding_box_intersection(
+    bboxes1: numpy.ndarray, bboxes2: numpy.ndarray
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Compute the intersections of pairs of bounding boxes.
+
+    The arrays are broadcast against each other like
+    batch_bounding_box_is_inside().  Unlike compute_bounding_box_intersection()
+    the boxes are not modified.  The bounds of pairs which do not intersect are
+    not valid.
+
+    :param bboxes1: The boxes to compute intersection with.
+    :param bboxes2: The boxes to compute intersection with.
+    :return: The intersection bounds and whether each pair of boxes intersect.
+
+    """
+    min1, max1 = _split_bounding_boxes(bboxes1)
+    min2, max2 = _split_bounding_boxes(bboxes2)
+
+    intersection_min = numpy.maximum(min1, min2)
+    intersection_max = numpy.minimum(max1, max2)
+
+    intersects = numpy.all(intersection_min <= intersection_max, axis=-1)
+
+    return numpy.stack((intersection_min, intersection_max), axis=-2), intersects
+
+
+def batch_bounding_box_area(bboxes: numpy.ndarray) -> numpy.ndarray:
+    """Calculate the surface areas of bounding boxes.
+
+    :param bboxes: An (N, 2, 3) array of minimum and maximum bounds.
+    :return: The area of each box.
+
+    """
+    bbox_min, bbox_max = _split_bounding_boxes(bboxes)
+
+    size = bbox_max - bbox_min
+
+    return 2 * (
+        size[..., 0] * size[..., 1]
+        + size[..., 1] * size[..., 2]
+        + size[..., 2] * size[..., 0]
+    )
+
+
+def batch_bounding_box_volume(bboxes: numpy.ndarray) -> numpy.ndarray:
+    """Calculate the volumes of bounding boxes.
+
+    :param bboxes: An (N, 2, 3) array of minimum and maximum bounds.
+    :return: The volume of each box.
+
+    """
+    bbox_min, bbox_max = _split_bounding_boxes(bboxes)
+
+    return numpy.prod(bbox_max - bbox_min, axis=-1)
+
+
 def is_parm_tuple_vector(parm_tuple: hou.ParmTuple) -> bool:
     """Check if the tuple is a vector parameter.
 
@@ -2271,20 +3572,13 @@ def eval_multiparm_instance(
     if "#" not in name:
         raise ValueError("Parameter name must contain at least one #")
 
-    ptg = node.parmTemplateGroup()
-
-    parm_template = ptg.find(name)
-
-    if parm_template is None:
-        raise ValueError(f"Name {name} does not map to a parameter on {node.path}")
+    _, offsets, _ = _get_multiparm_info(node, name)
 
     # Handle directly passing a single index.
     if not isinstance(indices, (list, tuple)):
         indices = [indices]
 
     if not raw_indices:
-        offsets = utils.get_multiparm_container_offsets(name, ptg)
-
         # Adjust any supplied offsets with the multiparm offset.
         indices = [idx + offset for idx, offset in zip(indices, offsets)]
 
@@ -2308,6 +3602,128 @@ def eval_multiparm_instance(
     return tuple(values)
 
 
+def eval_multiparm_instances(
+    node: hou.Node,
+    name: str,
+    index_range: Optional[Iterable[int]] = None,
+    parent_indices: Sequence[int] = (),
+    raw_indices: bool = False,
+) -> Tuple[Union[Tuple, float, int, str, hou.Ramp], ...]:
+    """Evaluate a multiparm parameter for a range of instances.
+
+    The name should include the # value(s) which will be replaced by the indices.
+
+    The index range contains the indices of the innermost multiparm to evaluate.
+    If the index range is None then all instances are evaluated.  For nested
+    multiparms the indices of the containing multiparms must be passed as the
+    parent indices.
+
+    The indices should be the multiparm indices, not including any start offset.
+
+    This function raises an IndexError if any of the indices do not resolve to a
+    valid parameter name on the node.
+
+    # Float
+    >>> eval_multiparm_instances(node, "float#")
+    (0.53, 1.0)
+    # Int in a nested multiparm
+    >>> eval_multiparm_instances(node, "leaf#_#", range(2), parent_indices=[1])
+    (5, 6)
+
+    :param node: The node to evaluate the parameters on.
+    :param name: The base parameter name.
+    :param index_range: Optional indices of the instances to evaluate.
+    :param parent_indices: The indices of any containing multiparms.
+    :param raw_indices: Whether or not the indices are 'raw' and should not try and take the folder offset into account.
+    :return: The evaluated parameter values.
+
+    """
+    if "#" not in name:
+        raise ValueError("Parameter name must contain at least one #")
+
+    _, offsets, folder_name = _get_multiparm_info(node, name)
+
+    if folder_name is None:
+        raise ValueError(f"Parameter {name} is not in a multiparm")
+
+    if len(parent_indices) != len(offsets) - 1:
+        raise ValueError(
+            f"Parameter {name} expects {len(offsets) - 1} parent indices, {len(parent_indices)} provided."
+        )
+
+    parent_indices = list(parent_indices)
+
+    if not raw_indices:
+        parent_indices = [idx + offset for idx, offset in zip(parent_indices, offsets)]
+
+    if index_range is None:
+        # Evaluate the number of instances from the containing multiparm.
+        if "#" in folder_name:
+            folder_name = resolve_multiparm_tokens(folder_name, parent_indices)
+
+        index_range = range(node.evalParm(folder_name))
+
+        if raw_indices:
+            index_range = range(offsets[-1], offsets[-1] + len(index_range))
+
+    indices = numpy.array(list(index_range), dtype=numpy.intc)
+
+    if not len(indices):
+        return ()
+
+    if not raw_indices:
+        indices += offsets[-1]
+
+    # Build a row of indices for each instance.
+    rows = numpy.empty((len(indices), len(offsets)), dtype=numpy.intc)
+    rows[:, :-1] = parent_indices
+    rows[:, -1] = indices
+
+    # Validate that enough indices were passed.
+    utils.validate_multiparm_resolve_values(name, rows[0])
+
+    full_names = _cpp_methods.resolveMultiparmTokensBulk(
+        utils.string_encode(name),
+        utils.build_c_int_array(rows),
+        len(offsets),
+        len(rows),
+    )
+
+    results = []
+
+    for full_name in full_names:
+        full_name = utils.string_decode(full_name)
+
+        parm_tuple = node.parmTuple(full_name)
+
+        if parm_tuple is None:
+            raise IndexError(f"Invalid indices: {full_name} does not exist")
+
+        values = parm_tuple.eval()
+
+        # Use single values for non-tuple parms.
+        if len(values) == 1:
+            results.append(values[0])
+
+        else:
+            results.append(tuple(values))
+
+    return tuple(results)
+
+
+def clear_multiparm_cache():
+    """Clear any cached data used to resolve multiparm names.
+
+    Data is cleared automatically when a node's spare parameters or asset
+    definitions change so this only needs to be called when a node type's
+    parameters are changed by other means.
+
+    :return:
+
+    """
+    _MULTIPARM_RESOLVERS.clear()
+
+
 def unexpanded_string_multiparm_instance(
     node: hou.Node, name: str, indices: Union[List[int], int], raw_indices: bool = False
 ) -> Union[StringTuple, str]:
@@ -2340,14 +3756,9 @@ def unexpanded_string_multiparm_instance(
     if "#" not in name:
         raise ValueError("Parameter name must contain at least one #")
 
-    ptg = node.parmTemplateGroup()
-
-    parm_template = ptg.find(name)
-
-    if parm_template is None:
-        raise ValueError(f"Name {name} does not map to a parameter on {node.path()}")
+    data_type, offsets, _ = _get_multiparm_info(node, name)
 
-    if parm_template.dataType() != hou.parmData.String:
+    if data_type != hou.parmData.String:
         raise TypeError("Parameter must be a string parameter")
 
     # Handle directly passing a single index.
@@ -2355,8 +3766,6 @@ def unexpanded_string_multiparm_instance(
         indices = [indices]
 
     if not raw_indices:
-        offsets = utils.get_multiparm_container_offsets(name, ptg)
-
         # Adjust any supplied offsets with the multiparm offset.
         indices = [idx + offset for idx, offset in zip(indices, offsets)]
 
@@ -2379,6 +3788,84 @@ def unexpanded_string_multiparm_instance(
     return values
 
 
+def get_parm_snapshot(
+    node: hou.Node, recurse: bool = True
+) -> Dict[str, numpy.ndarray]:
+    """Get a snapshot of the parameters of a node and its children.
+
+    The snapshot contains an entry for each parameter component as columns of
+    arrays.  The string columns are object arrays of str:
+
+    path: The full path to the parameter.
+    raw_value: The unexpanded value of string parameters or the expression of
+        numeric parameters with channels.
+    value: The value of numeric parameters at the current time, or NaN for string
+        parameters.
+    is_string: Whether the parameter is a string parameter.
+    has_channel: Whether the parameter has an expression or keyframes.
+    is_time_dependent: Whether the parameter is time dependent.
+    is_multiparm_instance: Whether the parameter is a multiparm instance.
+
+    :param node: The node to get the parameters of.
+    :param recurse: Whether to include all the node's children.
+    :return: The snapshot columns.
+
+    """
+    result = _cpp_methods.getParmSnapshot(node, recurse, hou.time())
+
+    snapshot = {
+        "path": _decode_string_array(result.paths),
+        "raw_value": _decode_string_array(result.raw_values),
+        "value": numpy.array(result.values, dtype=numpy.float64),
+    }
+
+    flags = numpy.array(result.flags, dtype=numpy.intc)
+
+    for name, flag in _PARM_SNAPSHOT_FLAGS.items():
+        snapshot[name] = (flags & flag) != 0
+
+    snapshot["value"][snapshot["is_string"]] = numpy.nan
+
+    return snapshot
+
+
+def diff_parm_snapshots(
+    snapshot1: Dict[str, numpy.ndarray], snapshot2: Dict[str, numpy.ndarray]
+) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """Compare two parameter snapshots.
+
+    Parameters are considered changed if their raw value or value differs.
+
+    :param snapshot1: The original snapshot.
+    :param snapshot2: The snapshot to compare.
+    :return: The paths of parameters which were added, removed and changed.
+
+    """
+    paths1 = snapshot1["path"]
+    paths2 = snapshot2["path"]
+
+    added = numpy.setdiff1d(paths2, paths1, assume_unique=True)
+    removed = numpy.setdiff1d(paths1, paths2, assume_unique=True)
+
+    common, indices1, indices2 = numpy.intersect1d(
+        paths1, paths2, assume_unique=True, return_indices=True
+    )
+
+    values1 = snapshot1["value"][indices1]
+    values2 = snapshot2["value"][indices2]
+
+    # NaN values are used for string parameters so treat them as equal.
+    values_match = (values1 == values2) | (numpy.isnan(values1) & numpy.isnan(values2))
+
+    raw_values_match = (
+        snapshot1["raw_value"][indices1] == snapshot2["raw_value"][indices2]
+    )
+
+    changed = common[~(values_match & raw_values_match)]
+
+    return added, removed, changed
+
+
 def disconnect_all_inputs(node: hou.Node):
     """Disconnect all of this node's inputs.
 
@@ -2720,6 +4207,33 @@ def get_oriented_point_transform(point: hou.Point) -> hou.Matrix4:
     return point_instance_transform(point)
 
 
+def get_oriented_point_transforms(geometry: hou.Geometry) -> numpy.ndarray:
+    """Get transform matrices for all the points in the geometry.
+
+    Like get_oriented_point_transform(), points with non-raw geometry
+    primitives bound to them use the transform of the first primitive and
+    other points use their instance transform.  The transforms are computed in
+    parallel.
+
+    :param geometry: The source geometry.
+    :return: An (N, 4, 4) array of point transforms.
+
+    """
+    return _point_instance_transforms(geometry, True)
+
+
+def point_instance_transforms(geometry: hou.Geometry) -> numpy.ndarray:
+    """Get the instance transforms for all the points in the geometry.
+
+    The transforms are computed in parallel from the point instance attributes.
+
+    :param geometry: The source geometry.
+    :return: An (N, 4, 4) array of instance transforms.
+
+    """
+    return _point_instance_transforms(geometry, False)
+
+
 def point_instance_transform(point: hou.Point) -> hou.Matrix4:
     """Get a point's instance transform based on existing attributes.
 
@@ -2821,15 +4335,32 @@ def asset_file_meta_source(file_path: str) -> Optional[str]:
     the current session.  Examples include "Scanned OTL Directories", "Current
     Hip File", "Fallback Libraries" or specific OPlibraries files.
 
+    Like the asset library manager, variables in the path are expanded and the
+    path is normalized before it is looked up.
+
     :param file_path: The path to get the install location for.
     :return: The meta install location, if any.
 
     """
-    if file_path not in hou.hda.loadedFiles():
-        return None
+    return _get_hda_index()["library_meta_sources"].get(
+        _normalize_library_path(file_path)
+    )
 
-    return utils.string_decode(
-        _cpp_methods.getMetaSourceForPath(utils.string_encode(file_path))
+
+def batch_asset_file_meta_source(
+    file_paths: Sequence[str],
+) -> Tuple[Optional[str], ...]:
+    """Get the meta install locations for a list of files.
+
+    :param file_paths: The paths to get the install locations for.
+    :return: The meta install location of each file, if any.
+
+    """
+    library_meta_sources = _get_hda_index()["library_meta_sources"]
+
+    return tuple(
+        library_meta_sources.get(_normalize_library_path(file_path))
+        for file_path in file_paths
     )
 
 
@@ -2847,6 +4378,20 @@ def get_definition_meta_source(definition: hou.HDADefinition) -> Optional[str]:
     return asset_file_meta_source(definition.libraryFilePath())
 
 
+def batch_get_definition_meta_source(
+    definitions: Sequence[hou.HDADefinition],
+) -> Tuple[Optional[str], ...]:
+    """Get the meta install locations of a list of asset definitions.
+
+    :param definitions: The definitions to get the meta sources for.
+    :return: The meta install location of each definition, if any.
+
+    """
+    return batch_asset_file_meta_source(
+        [definition.libraryFilePath() for definition in definitions]
+    )
+
+
 def remove_meta_source(meta_source: str) -> bool:
     """Attempt to remove a meta source.
 
@@ -2856,7 +4401,11 @@ def remove_meta_source(meta_source: str) -> bool:
     :return: Whether or not the source was removed.
 
     """
-    return _cpp_methods.removeMetaSource(utils.string_encode(meta_source))
+    result = _cpp_methods.removeMetaSource(utils.string_encode(meta_source))
+
+    clear_hda_index()
+
+    return result
 
 
 def libraries_in_meta_source(meta_source: str) -> StringTuple:
@@ -2866,11 +4415,7 @@ def libraries_in_meta_source(meta_source: str) -> StringTuple:
     :return: A list of paths in the source.
 
     """
-    # Get the any libraries in the meta source.
-    result = _cpp_methods.getLibrariesInMetaSource(utils.string_encode(meta_source))
-
-    # Return a tuple of the valid values.
-    return utils.clean_string_values(result)
+    return _get_hda_index()["meta_source_libraries"].get(meta_source, ())
 
 
 def is_dummy_definition(definition: hou.HDADefinition) -> bool:
@@ -2883,8 +4428,41 @@ def is_dummy_definition(definition: hou.HDADefinition) -> bool:
     :return: Whether or not the asset definition is a dummy definition.
 
     """
-    return _cpp_methods.isDummyDefinition(
-        utils.string_encode(definition.libraryFilePath()),
-        utils.string_encode(definition.nodeTypeCategory().name()),
-        utils.string_encode(definition.nodeTypeName()),
+    return batch_is_dummy_definition([definition])[0]
+
+
+def batch_is_dummy_definition(
+    definitions: Sequence[hou.HDADefinition],
+) -> Tuple[bool, ...]:
+    """Check if a list of definitions are dummy definitions.
+
+    :param definitions: The definitions to check.
+    :return: Whether or not each asset definition is a dummy definition.
+
+    """
+    dummy_definitions = _get_hda_index()["dummy_definitions"]
+
+    return tuple(
+        dummy_definitions.get(
+            (
+                _normalize_library_path(definition.libraryFilePath()),
+                definition.nodeTypeCategory().name(),
+                definition.nodeTypeName(),
+            ),
+            False,
+        )
+        for definition in definitions
     )
+
+
+def clear_hda_index():
+    """Clear the cached index of asset libraries and definitions.
+
+    The index is cleared automatically when asset definitions or libraries
+    change so this only needs to be called when they are changed by other
+    means.
+
+    :return:
+
+    """
+    _HDA_INDEX.clear()
@@ -0,0 +1,400 @@
+"""This module provides a shared cache of compiled inline libraries.
+
+Compiling the inline libraries can take a long time so they can be compiled
+once per Houdini build and stored in a shared directory.  Sessions which have
+the HT_INLINE_CACHE_DIR variable set will copy verified libraries from the
+shared directory into the local inlinecpp directory before creating them so that
+inlinecpp can load them instead of compiling.
+
+Cached libraries are stored under <cache dir>/<Houdini version>/<library
+name>/<content hash> along with a manifest of the files and their sha256 hashes.
+
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+from __future__ import annotations
+
+# Standard Library
+import ctypes
+import glob
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+# Houdini
+import hou
+
+if TYPE_CHECKING:
+    from houdini_toolbox.inline.lib import _InlineLibrary
+
+_logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+# The variable containing the shared cache directory.
+_CACHE_DIR_VARIABLE = "HT_INLINE_CACHE_DIR"
+
+_MANIFEST_FILE = "manifest.json"
+
+
+# =============================================================================
+# NON-PUBLIC FUNCTIONS
+# =============================================================================
+
+
+def _copy_file(source_path: str, target_dir: str):
+    """Copy a file into a directory so it is never seen partially written.
+
+    :param source_path: The file to copy.
+    :param target_dir: The directory to copy the file into.
+    :return:
+
+    """
+    handle, temp_path = tempfile.mkstemp(dir=target_dir, suffix=".tmp")
+    os.close(handle)
+
+    try:
+        shutil.copyfile(source_path, temp_path)
+        os.replace(temp_path, os.path.join(target_dir, os.path.basename(source_path)))
+
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        raise
+
+
+def _get_file_hash(path: str) -> str:
+    """Get the sha256 hash of a file's contents.
+
+    :param path: The file path.
+    :return: The hex digest of the file contents.
+
+    """
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(2 ** 20), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+def _get_library_files(library_dir: str, name: str) -> List[str]:
+    """Get the compiled files for a library in a directory.
+
+    inlinecpp names the files it compiles after the library name followed by
+    the build and a checksum of the source.
+
+    :param library_dir: The directory to search.
+    :param name: The library name.
+    :return: A list of file paths.
+
+    """
+    if sys.platform.startswith("win"):
+        extension = ".dll"
+
+    elif sys.platform == "darwin":
+        extension = ".dylib"
+
+    else:
+        extension = ".so"
+
+    return sorted(glob.glob(os.path.join(library_dir, f"{name}_*{extension}")))
+
+
+def _get_loaded_library_file(
+    library: _InlineLibrary, library_files: List[str], existing_files: List[str]
+) -> str:
+    """Get the compiled file an inlinecpp library was loaded from.
+
+    The local directory may contain files compiled from older sources.  If the
+    library was compiled when it was loaded the new file is used.  Otherwise the
+    shared library handle held by the inlinecpp library is checked and, failing
+    that, the only compiled file is used.
+
+    :param library: The loaded library.
+    :param library_files: The compiled files for the library.
+    :param existing_files: The compiled files which existed before the library
+        was loaded.
+    :return: The path of the loaded file.
+
+    """
+    new_files = sorted(set(library_files) - set(existing_files))
+
+    if len(new_files) == 1:
+        return new_files[0]
+
+    normalized = {
+        os.path.normcase(os.path.realpath(file_path)): file_path
+        for file_path in library_files
+    }
+
+    for value in getattr(library.library, "__dict__", {}).values():
+        if not isinstance(value, ctypes.CDLL):
+            continue
+
+        # ctypes keeps the path each library was loaded from.
+        loaded_path = getattr(value, "_name", None)
+
+        if loaded_path:
+            loaded_path = os.path.normcase(os.path.realpath(loaded_path))
+
+            if loaded_path in normalized:
+                return normalized[loaded_path]
+
+    if len(library_files) == 1:
+        return library_files[0]
+
+    raise RuntimeError(
+        f"Could not determine which compiled file {library.name} was loaded from: "
+        f"{', '.join(library_files)}.  Remove the files compiled from older "
+        "sources and try again."
+    )
+
+
+def _get_local_library_dir() -> str:
+    """Get the directory inlinecpp stores compiled libraries in.
+
+    :return: The local inlinecpp directory.
+
+    """
+    return os.path.join(hou.getenv("HOUDINI_USER_PREF_DIR"), "inlinecpp")
+
+
+def _verify_cached_library(
+    library: _InlineLibrary, library_path: str
+) -> Optional[Dict]:
+    """Verify a cached library against its manifest.
+
+    The manifest must be for the current library sources and every file it lists
+    must exist and match its hash.
+
+    :param library: The library to verify.
+    :param library_path: The cached library directory.
+    :return: The manifest data, if the cached library is valid.
+
+    """
+    manifest = _read_manifest(library_path)
+
+    if manifest is None:
+        return None
+
+    if manifest.get("content_hash") != library.content_hash or not manifest.get(
+        "files"
+    ):
+        _logger.warning("Inline library manifest does not match %s", library.name)
+
+        return None
+
+    for file_name, file_hash in manifest["files"].items():
+        file_path = os.path.join(library_path, file_name)
+
+        if not os.path.isfile(file_path) or _get_file_hash(file_path) != file_hash:
+            _logger.warning(
+                "Cached inline library file %s failed verification", file_path
+            )
+
+            return None
+
+    return manifest
+
+
+def _read_manifest(library_path: str) -> Optional[Dict]:
+    """Read the manifest for a cached library.
+
+    :param library_path: The cached library directory.
+    :return: The manifest data, if any.
+
+    """
+    manifest_path = os.path.join(library_path, _MANIFEST_FILE)
+
+    if not os.path.isfile(manifest_path):
+        return None
+
+    try:
+        with open(manifest_path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    except (OSError, ValueError):
+        _logger.warning("Could not read inline library manifest %s", manifest_path)
+
+        return None
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def get_cache_dir() -> Optional[str]:
+    """Get the shared inline library cache directory.
+
+    :return: The shared cache directory, if one is set.
+
+    """
+    return os.environ.get(_CACHE_DIR_VARIABLE) or None
+
+
+def get_library_cache_path(cache_dir: str, library: _InlineLibrary) -> str:
+    """Get the directory a library is cached in.
+
+    :param cache_dir: The shared cache directory.
+    :param library: The library to get the path for.
+    :return: The cached library directory.
+
+    """
+    return os.path.join(
+        cache_dir,
+        hou.applicationVersionString(),
+        library.name,
+        library.content_hash,
+    )
+
+
+def install_cached_library(
+    library: _InlineLibrary, cache_dir: Optional[str] = None
+) -> bool:
+    """Copy a library from the shared cache into the local inlinecpp directory.
+
+    Each cached file is verified against the manifest before anything is
+    copied.  If there is no cached library, or it fails verification, nothing is
+    copied and the library will be compiled locally when it is created.
+
+    :param library: The library to install.
+    :param cache_dir: Optional shared cache directory.
+    :return: Whether the cached library was installed.
+
+    """
+    if cache_dir is None:
+        cache_dir = get_cache_dir()
+
+    if cache_dir is None:
+        return False
+
+    library_path = get_library_cache_path(cache_dir, library)
+
+    manifest = _verify_cached_library(library, library_path)
+
+    if manifest is None:
+        return False
+
+    local_dir = _get_local_library_dir()
+
+    os.makedirs(local_dir, exist_ok=True)
+
+    for file_name, file_hash in manifest["files"].items():
+        local_path = os.path.join(local_dir, file_name)
+
+        # Skip files which have already been installed.
+        if os.path.isfile(local_path) and _get_file_hash(local_path) == file_hash:
+            continue
+
+        _copy_file(os.path.join(library_path, file_name), local_dir)
+
+    _logger.debug("Installed inline library %s from %s", library.name, library_path)
+
+    return True
+
+
+def prime_library(library: _InlineLibrary, cache_dir: str) -> str:
+    """Compile a library and store it in the shared cache.
+
+    Only the compiled file the library was loaded from is stored.  Existing
+    cache entries which fail verification are replaced.  If another process
+    stores the library at the same time the first valid entry is kept.
+
+    :param library: The library to compile.
+    :param cache_dir: The shared cache directory.
+    :return: The cached library directory.
+
+    """
+    library_path = get_library_cache_path(cache_dir, library)
+
+    # Nothing to do if the library has already been cached.
+    if _verify_cached_library(library, library_path) is not None:
+        return library_path
+
+    local_dir = _get_local_library_dir()
+
+    existing_files = _get_library_files(local_dir, library.name)
+
+    # Accessing a function forces inlinecpp to compile or load the library.
+    getattr(library.library, library.function_names[0])
+
+    local_files = _get_library_files(local_dir, library.name)
+
+    if not local_files:
+        raise RuntimeError(
+            f"Could not find compiled files for {library.name} in {local_dir}"
+        )
+
+    loaded_file = _get_loaded_library_file(library, local_files, existing_files)
+
+    parent_dir = os.path.dirname(library_path)
+
+    os.makedirs(parent_dir, exist_ok=True)
+
+    # Build the cache entry in a temporary directory so sessions never see a
+    # partially written entry.
+    temp_dir = tempfile.mkdtemp(dir=parent_dir, suffix=".tmp")
+
+    try:
+        shutil.copy2(loaded_file, temp_dir)
+
+        files = {os.path.basename(loaded_file): _get_file_hash(loaded_file)}
+
+        manifest = {
+            "content_hash": library.content_hash,
+            "files": files,
+            "houdini_version": hou.applicationVersionString(),
+            "library": library.name,
+            "platform": sys.platform,
+        }
+
+        with open(
+            os.path.join(temp_dir, _MANIFEST_FILE), "w", encoding="utf-8"
+        ) as handle:
+            json.dump(manifest, handle, indent=4)
+
+        # Move an invalid entry aside before removing it so it is never seen
+        # partially removed.  Another primer may already have replaced it.
+        if (
+            os.path.isdir(library_path)
+            and _verify_cached_library(library, library_path) is None
+        ):
+            stale_dir = f"{temp_dir}.stale"
+
+            try:
+                os.replace(library_path, stale_dir)
+
+            except OSError:
+                pass
+
+            shutil.rmtree(stale_dir, ignore_errors=True)
+
+        try:
+            os.replace(temp_dir, library_path)
+
+        except OSError:
+            # Another primer published the library first.  It was built from
+            # the same sources so keep it as long as it is valid.
+            if _verify_cached_library(library, library_path) is None:
+                raise
+
+    finally:
+        if os.path.isdir(temp_dir):
+            shutil.rmtree(temp_dir)
+
+    return library_path
@@ -5,19 +5,137 @@ The functions in this module are not mean to be called directly.  This module
 uses Python decorators to attach the functions to the corresponding HOM classes
 and modules they are meant to extend.
 
+The functions are split into themed libraries which are only compiled, or
+loaded from the inlinecpp cache, when one of their functions is first used.
+Previously compiled libraries can also be installed from a shared cache, see
+houdini_toolbox.inline.cache.
+
 """
 
 # =============================================================================
 # IMPORTS
 # =============================================================================
 
+# Standard Library
+import hashlib
+import re
+import sys
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Houdini Toolbox
+from houdini_toolbox.inline.cache import install_cached_library
+
 # Houdini
+import hou
 import inlinecpp
 
 # flake8: noqa: E501
 # =============================================================================
+# GLOBALS
+# =============================================================================
+
+# Includes shared by all the libraries.
+_INCLUDES = """
+#include <CMD/CMD_Variable.h>
+#include <CH/CH_Channel.h>
+#include <CH/CH_Collection.h>
+#include <CH/CH_Manager.h>
+#include <GA/GA_AttributeRefMap.h>
+#include <GA/GA_AttributeInstanceMatrix.h>
+#include <GA/GA_Primitive.h>
+#include <GA/GA_SplittableRange.h>
+#include <GEO/GEO_Face.h>
+#include <GEO/GEO_Hull.h>
+#include <GEO/GEO_PointTree.h>
+#include <GQ/GQ_Detail.h>
+#include <GU/GU_Detail.h>
+#include <GU/GU_PackedGeometry.h>
+#include <GU/GU_PrimPacked.h>
+#include <OBJ/OBJ_Node.h>
+#include <OP/OP_CommandManager.h>
+#include <OP/OP_Context.h>
+#include <OP/OP_Director.h>
+#include <OP/OP_Expression.h>
+#include <OP/OP_InterestRef.h>
+#include <OP/OP_Node.h>
+#include <OP/OP_OTLDefinition.h>
+#include <OP/OP_OTLLibrary.h>
+#include <OP/OP_OTLManager.h>
+#include <PRM/PRM_Name.h>
+#include <PRM/PRM_Parm.h>
+#include <PRM/PRM_Template.h>
+#include <PY/PY_Python.h>
+#include <ROP/ROP_RenderManager.h>
+#include <UT/UT_Map.h>
+#include <UT/UT_ParallelUtil.h>
+#include <UT/UT_StdUtil.h>
+#include <UT/UT_Version.h>
+#include <UT/UT_WorkArgs.h>
+#include <UT/UT_WorkBuffer.h>
+
+#include <algorithm>
+#include <atomic>
+#include <climits>
+
+using namespace std;
+
+// Validate a vector of strings so that it can be returned as a StringArray.
+// Currently we cannot return an empty vector.
+void validateStringVector(std::vector<std::string> &string_vec)
+{
+    // Check for an empty vector.
+    if (string_vec.size() == 0)
+    {
+        // An an empty string.
+        string_vec.push_back("");
+    }
+}
+
+"""
+
+# Structs shared by all the libraries.
+_STRUCTS = [
+    ("IntArray", "*i"),
+    ("FloatArray", "*d"),
+    ("StringArray", "**c"),
+    ("StringTuple", "*StringArray"),
+    ("VertexMap", (("prims", "*i"), ("indices", "*i"))),
+    ("Position3D", (("x", "d"), ("y", "d"), ("z", "d"))),
+    (
+        "HdaIndex",
+        (
+            ("library_paths", "**c"),
+            ("meta_sources", "**c"),
+            ("definition_libraries", "*i"),
+            ("definition_categories", "**c"),
+            ("definition_names", "**c"),
+            ("definition_dummies", "*i"),
+        ),
+    ),
+    (
+        "ParmSnapshot",
+        (
+            ("paths", "**c"),
+            ("raw_values", "**c"),
+            ("values", "*d"),
+            ("flags", "*i"),
+        ),
+    ),
+    (
+        "RunPythonException",
+        (
+            ("occurred", "i"),
+            ("name", "*c"),
+            ("value", "*c"),
+            ("detailed", "*c"),
+        ),
+    ),
+]
 
-_FUNCTION_SOURCES = [
+# Python execution, hashing, caches, variables, ranges, bounding boxes and
+# matrices.
+_CORE_SOURCES = [
     """
 RunPythonException run_python_statements(const char *code)
 {
@@ -59,41 +177,6 @@ RunPythonException run_python_statements_in_new_context(const char *code)
 
     return exc;
 }
-""",
-    """
-void
-clearUserData(OP_Node *node)
-{
-    node->clearUserData(false);
-}
-""",
-    """
-bool
-hasUserData(OP_Node *node, const char *data_name)
-{
-    UT_StringHolder name(data_name);
-
-    return node->hasUserData(name);
-}
-""",
-    """
-void
-setUserData(OP_Node *node, const char *data_name, const char *data_value)
-{
-    UT_StringHolder name(data_name);
-    UT_StringHolder value(data_value);
-
-    node->setUserData(name, value, false);
-}
-""",
-    """
-void
-deleteUserData(OP_Node *node, const char *data_name)
-{
-    UT_StringHolder name(data_name);
-
-    node->deleteUserData(name, false);
-}
 """,
     """
 int
@@ -132,34 +215,6 @@ clearCacheByName(const char* cache_name)
         }
     }
 }
-""",
-    """
-FloatArray
-point_instance_transform(const GU_Detail *gdp, int ptnum)
-{
-    std::vector<double>         result;
-
-    GA_AttributeInstanceMatrix  instance_attribs;
-    GA_Offset                   pt_off;
-
-    UT_Matrix4D                 instance_transform;
-
-    instance_attribs.initialize(gdp->pointAttribs());
-
-    pt_off = gdp->pointOffset(ptnum);
-
-    instance_attribs.getMatrix(instance_transform, gdp->getPos3(pt_off), pt_off);
-
-    for (int i=0; i<4; ++i)
-    {
-        for (int j=0; j<4; ++j)
-        {
-            result.push_back(instance_transform.matx[i][j]);
-        }
-    }
-
-    return result;
-}
 """,
     """
 bool
@@ -393,119 +448,426 @@ expandRange(const char *pattern)
 }
 """,
     """
-const char *
-getNodeAuthor(OP_Node *node)
+bool
+boundingBoxIsInside(const UT_BoundingBoxD *bbox1, const UT_BoundingBoxD *bbox2)
 {
-    const OP_Stat &stat = node->getStat();
-    return stat.getAuthor();
+    return bbox1->isInside(*bbox2);
 }
 """,
     """
-void
-sortGeometryByValues(GU_Detail *gdp, int attribute_type, fpreal *values)
+bool
+boundingBoxesIntersect(UT_BoundingBoxD *bbox1, const UT_BoundingBoxD *bbox2)
 {
-    GA_AttributeOwner owner = static_cast<GA_AttributeOwner>(attribute_type);
-
-    switch(owner)
-    {
-        case GA_ATTRIB_POINT:
-            gdp->sortPointList(values);
-            break;
-
-        case GA_ATTRIB_PRIMITIVE:
-            gdp->sortPrimitiveList(values);
-            break;
-    }
+    return bbox1->intersects(*bbox2);
 }
 """,
     """
 bool
-isNodeTypeSubnetType(OP_Operator *op)
+computeBoundingBoxIntersection(UT_BoundingBoxD *bbox1, const UT_BoundingBoxD *bbox2)
 {
-    return op->getIsPrimarySubnetType();
+    return bbox1->computeIntersection(*bbox2);
 }
 """,
     """
-bool
-isNodeTypePythonType(OP_Operator *op)
+void
+expandBoundingBoxBounds(UT_BoundingBoxD *bbox, float dltx, float dlty, float dltz)
 {
-    return op->getScriptIsPython();
+    bbox->expandBounds(dltx, dlty, dltz);
 }
 """,
     """
 void
-createPointAtPosition(GU_Detail *gdp, UT_Vector3D *position)
+addToBoundingBoxMin(UT_BoundingBoxD *bbox, const UT_Vector3D *vec)
 {
-    GA_Offset                   ptOff;
-
-    // Add a new point.
-    ptOff = gdp->appendPointOffset();
-
-    // Set the position for the point.
-    gdp->setPos3(ptOff, *position);
-
+    bbox->addToMin(*vec);
 }
 """,
     """
 void
-createNPoints(GU_Detail *gdp, int npoints)
+addToBoundingBoxMax(UT_BoundingBoxD *bbox, const UT_Vector3D *vec)
 {
-    GA_Offset                   ptOff;
-
-    // Build a block of points.
-    ptOff = gdp->appendPointBlock(npoints);
+    bbox->addToMax(*vec);
+}
+""",
+    """
+double
+boundingBoxArea(const UT_BoundingBoxD *bbox)
+{
+    return bbox->area();
+}
+""",
+    """
+double
+boundingBoxVolume(const UT_BoundingBoxD *bbox)
+{
+    return bbox->volume();
 }
 """,
     """
 void
-mergePointGroup(GU_Detail *gdp, const GU_Detail *src, const char *group_name)
+buildLookatMatrix(UT_DMatrix3 *mat,
+            const UT_Vector3D *from,
+            const UT_Vector3D *to,
+            const UT_Vector3D *up)
 {
-    const GA_PointGroup         *group;
-
-    group = src->findPointGroup(group_name);
-
-    gdp->mergePoints(*src, GA_Range(*group));
+    mat->lookat(*from, *to, *up);
 }
 """,
     """
 void
-mergePoints(GU_Detail *gdp, const GU_Detail *src, int *vals, int num_vals)
+vector3GetDual(const UT_Vector3D *vec, UT_DMatrix3 *mat)
 {
-    GA_OffsetList               points;
+    vec->getDual(*mat);
+}
+""",
+]
 
-    for (int i=0; i<num_vals; ++i)
+# Geometry creation, merging, attributes, topology and primitives.
+_GEOMETRY_SOURCES = [
+    """
+FloatArray
+point_instance_transform(const GU_Detail *gdp, int ptnum)
+{
+    std::vector<double>         result;
+
+    GA_AttributeInstanceMatrix  instance_attribs;
+    GA_Offset                   pt_off;
+
+    UT_Matrix4D                 instance_transform;
+
+    instance_attribs.initialize(gdp->pointAttribs());
+
+    pt_off = gdp->pointOffset(ptnum);
+
+    instance_attribs.getMatrix(instance_transform, gdp->getPos3(pt_off), pt_off);
+
+    for (int i=0; i<4; ++i)
     {
-        points.append(gdp->pointOffset(vals[i]));
+        for (int j=0; j<4; ++j)
+        {
+            result.push_back(instance_transform.matx[i][j]);
+        }
     }
 
-    gdp->mergePoints(*src, GA_Range(src->getPointMap(), points));
+    return result;
 }
 """,
     """
-void
-mergePrimGroup(GU_Detail *gdp, const GU_Detail *src, const char *group_name)
+int
+pointInstanceTransforms(const GU_Detail *gdp,
+                        bool use_prims,
+                        double *values,
+                        int num_values)
 {
-    const GA_PrimitiveGroup     *group;
+    GA_AttributeInstanceMatrix  instance_attribs;
 
-    group = src->findPrimitiveGroup(group_name);
+    // The lowest numbered point bound to raw geometry, if any.
+    std::atomic<int>            raw_pt_num(INT_MAX);
 
-    gdp->mergePrimitives(*src, GA_Range(*group));
+    instance_attribs.initialize(gdp->pointAttribs());
+
+    exint num_points = SYSmin((exint)gdp->getNumPoints(), (exint)(num_values / 16));
+
+    UTparallelFor(
+        UT_BlockedRange<exint>(0, num_points),
+        [&](const UT_BlockedRange<exint> &range)
+        {
+            GA_OffsetArray      prims;
+
+            UT_Matrix3D         rot_matrix;
+            UT_Matrix4D         transform;
+
+            for (exint i = range.begin(); i < range.end(); ++i)
+            {
+                GA_Offset pt_off = gdp->pointOffset(i);
+
+                UT_Vector3D pos = gdp->getPos3(pt_off);
+
+                prims.clear();
+
+                if (use_prims)
+                {
+                    gdp->getPrimitivesReferencingPoint(prims, pt_off);
+                }
+
+                if (prims.size())
+                {
+                    // Use the lowest numbered primitive.
+                    GA_Offset prim_off = prims(0);
+
+                    for (exint j = 1; j < prims.size(); ++j)
+                    {
+                        prim_off = SYSmin(prim_off, prims(j));
+                    }
+
+                    const GEO_Primitive *prim = gdp->getGEOPrimitive(prim_off);
+
+                    // Faces and surfaces do not have a transform.
+                    if (dynamic_cast<const GEO_Face *>(prim) || dynamic_cast<const GEO_Hull *>(prim))
+                    {
+                        int pt_num = i;
+                        int current = raw_pt_num.load();
+
+                        while (pt_num < current && !raw_pt_num.compare_exchange_weak(current, pt_num))
+                        {
+                        }
+
+                        transform.identity();
+                    }
+                    else
+                    {
+                        prim->getLocalTransform(rot_matrix);
+
+                        transform = UT_Matrix4D(rot_matrix);
+                        transform.translate(pos.x(), pos.y(), pos.z());
+                    }
+                }
+                else
+                {
+                    instance_attribs.getMatrix(transform, pos, pt_off);
+                }
+
+                double *value = values + i * 16;
+
+                for (int row=0; row<4; ++row)
+                {
+                    for (int col=0; col<4; ++col)
+                    {
+                        value[row * 4 + col] = transform(row, col);
+                    }
+                }
+            }
+        }
+    );
+
+    int result = raw_pt_num.load();
+
+    return (result == INT_MAX) ? -1 : result;
 }
 """,
     """
 void
-mergePrims(GU_Detail *gdp, const GU_Detail *src, int *vals, int num_vals)
+getSortPermutation(double *keys, int num_keys, int num_elements, int *order)
 {
-    GA_OffsetList               prims;
+    UT_Array<exint>             indices(num_elements, num_elements);
 
-    for (int i=0; i<num_vals; ++i)
+    for (exint i = 0; i < num_elements; ++i)
     {
-        prims.append(gdp->primitiveOffset(vals[i]));
+        indices(i) = i;
     }
 
-    gdp->mergePrimitives(*src, GA_Range(src->getPrimitiveMap(), prims));
-}
-""",
+    // Compare by each key in turn.  Elements with equal keys keep their
+    // original order.
+    UTparallelStableSort(
+        indices.begin(),
+        indices.end(),
+        [&](exint a, exint b)
+        {
+            for (int k = 0; k < num_keys; ++k)
+            {
+                const double *key = keys + (exint)k * num_elements;
+
+                if (key[a] < key[b])
+                {
+                    return true;
+                }
+
+                if (key[b] < key[a])
+                {
+                    return false;
+                }
+            }
+
+            return false;
+        }
+    );
+
+    for (exint i = 0; i < num_elements; ++i)
+    {
+        order[i] = indices(i);
+    }
+}
+""",
+    """
+void
+sortGeometryByPermutation(GU_Detail *gdp, int attribute_type, int *order, int num_elements)
+{
+    UT_Array<fpreal>            ranks(num_elements, num_elements);
+
+    GA_AttributeOwner owner = static_cast<GA_AttributeOwner>(attribute_type);
+
+    // Sort using the new position of each element as its value.
+    for (exint i = 0; i < num_elements; ++i)
+    {
+        ranks(order[i]) = i;
+    }
+
+    switch(owner)
+    {
+        case GA_ATTRIB_POINT:
+            gdp->sortPointList(ranks.array());
+            break;
+
+        case GA_ATTRIB_PRIMITIVE:
+            gdp->sortPrimitiveList(ranks.array());
+            break;
+    }
+}
+""",
+    """
+void
+createPointAtPosition(GU_Detail *gdp, UT_Vector3D *position)
+{
+    GA_Offset                   ptOff;
+
+    // Add a new point.
+    ptOff = gdp->appendPointOffset();
+
+    // Set the position for the point.
+    gdp->setPos3(ptOff, *position);
+
+}
+""",
+    """
+void
+createNPoints(GU_Detail *gdp, int npoints)
+{
+    GA_Offset                   ptOff;
+
+    // Build a block of points.
+    ptOff = gdp->appendPointBlock(npoints);
+}
+""",
+    """
+int
+createPointsFromArrays(GU_Detail *gdp,
+                       double *positions,
+                       int num_positions,
+                       const char **attrib_names,
+                       int *attrib_sizes,
+                       int num_attribs,
+                       double *values,
+                       int num_values)
+{
+    exint num_points = num_positions / 3;
+
+    if (num_points == 0)
+    {
+        return -1;
+    }
+
+    // Appended points always have a contiguous block of offsets.
+    GA_Offset start = gdp->appendPointBlock(num_points);
+
+    GA_SplittableRange range(GA_Range(gdp->getPointMap(), start, start + num_points));
+
+    UTparallelFor(
+        range,
+        [&](const GA_SplittableRange &r)
+        {
+            GA_Offset           block_start, block_end;
+
+            for (GA_Iterator it(r); it.blockAdvance(block_start, block_end); )
+            {
+                for (GA_Offset pt_off = block_start; pt_off < block_end; ++pt_off)
+                {
+                    const double *pos = positions + (pt_off - start) * 3;
+
+                    gdp->setPos3(pt_off, UT_Vector3D(pos[0], pos[1], pos[2]));
+                }
+            }
+        }
+    );
+
+    const double *attrib_values = values;
+
+    for (int i = 0; i < num_attribs; ++i)
+    {
+        int size = attrib_sizes[i];
+
+        GA_Attribute *attrib = gdp->findPointAttribute(attrib_names[i]);
+
+        const GA_AIFTuple *tuple = attrib ? attrib->getAIFTuple() : 0;
+
+        if (tuple && attrib_values + num_points * size <= values + num_values)
+        {
+            UTparallelFor(
+                range,
+                [&](const GA_SplittableRange &r)
+                {
+                    GA_Offset   block_start, block_end;
+
+                    for (GA_Iterator it(r); it.blockAdvance(block_start, block_end); )
+                    {
+                        for (GA_Offset pt_off = block_start; pt_off < block_end; ++pt_off)
+                        {
+                            tuple->set(attrib, pt_off, attrib_values + (pt_off - start) * size, size);
+                        }
+                    }
+                }
+            );
+
+            attrib->bumpDataId();
+        }
+
+        attrib_values += num_points * size;
+    }
+
+    gdp->getP()->bumpDataId();
+
+    return gdp->pointIndex(start);
+}
+""",
+    """
+void
+mergePointGroup(GU_Detail *gdp, const GU_Detail *src, const char *group_name)
+{
+    const GA_PointGroup         *group;
+
+    group = src->findPointGroup(group_name);
+
+    gdp->mergePoints(*src, GA_Range(*group));
+}
+""",
+    """
+void
+mergePoints(GU_Detail *gdp, const GU_Detail *src, int *vals, int num_vals)
+{
+    GA_OffsetList               points;
+
+    for (int i=0; i<num_vals; ++i)
+    {
+        points.append(src->pointOffset(vals[i]));
+    }
+
+    gdp->mergePoints(*src, GA_Range(src->getPointMap(), points));
+}
+""",
+    """
+void
+mergePrimGroup(GU_Detail *gdp, const GU_Detail *src, const char *group_name)
+{
+    const GA_PrimitiveGroup     *group;
+
+    group = src->findPrimitiveGroup(group_name);
+
+    gdp->mergePrimitives(*src, GA_Range(*group));
+}
+""",
+    """
+void
+mergePrims(GU_Detail *gdp, const GU_Detail *src, int *vals, int num_vals)
+{
+    GA_OffsetList               prims;
+
+    for (int i=0; i<num_vals; ++i)
+    {
+        prims.append(src->primitiveOffset(vals[i]));
+    }
+
+    gdp->mergePrimitives(*src, GA_Range(src->getPrimitiveMap(), prims));
+}
+""",
     """
 void
 copyAttributeValues(GU_Detail *dest_gdp,
@@ -899,6 +1261,210 @@ connectedPoints(const GU_Detail *gdp, int pt_num)
 
     return pt_nums;
 }
+""",
+    """
+int
+buildAdjacency(const GU_Detail *gdp,
+               int adjacency_type,
+               int *offsets,
+               int num_offsets,
+               int *indices,
+               int num_indices)
+{
+    // Rows are processed in fixed size chunks so each task owns the buffer
+    // for its chunk and the results can be copied out in order.
+    const exint chunk_size = 1024;
+
+    exint num_rows = num_offsets - 1;
+    exint num_chunks = (num_rows + chunk_size - 1) / chunk_size;
+
+    std::vector<std::vector<int> >      chunk_columns(num_chunks);
+
+    offsets[0] = 0;
+
+    UTparallelFor(
+        UT_BlockedRange<exint>(0, num_chunks),
+        [&](const UT_BlockedRange<exint> &range)
+        {
+            GA_OffsetArray      prims;
+            std::vector<int>    row;
+
+            for (exint chunk = range.begin(); chunk < range.end(); ++chunk)
+            {
+                std::vector<int> &columns = chunk_columns[chunk];
+
+                exint end = SYSmin(num_rows, (chunk + 1) * chunk_size);
+
+                for (exint i = chunk * chunk_size; i < end; ++i)
+                {
+                    row.clear();
+
+                    switch (adjacency_type)
+                    {
+                        // Points sharing an edge with the point.
+                        case 0:
+                        {
+                            GA_Offset pt_off = gdp->pointOffset(i);
+
+                            prims.clear();
+                            gdp->getPrimitivesReferencingPoint(prims, pt_off);
+
+                            for (exint j = 0; j < prims.size(); ++j)
+                            {
+                                const GEO_Face *face = dynamic_cast<const GEO_Face *>(gdp->getGEOPrimitive(prims(j)));
+
+                                if (face == 0)
+                                {
+                                    continue;
+                                }
+
+                                GA_Size num_vertices = face->getVertexCount();
+
+                                for (GA_Size k = 0; k < num_vertices; ++k)
+                                {
+                                    if (face->getPointOffset(k) != pt_off)
+                                    {
+                                        continue;
+                                    }
+
+                                    if (k > 0 || face->isClosed())
+                                    {
+                                        row.push_back(gdp->pointIndex(face->getPointOffset((k + num_vertices - 1) % num_vertices)));
+                                    }
+
+                                    if (k + 1 < num_vertices || face->isClosed())
+                                    {
+                                        row.push_back(gdp->pointIndex(face->getPointOffset((k + 1) % num_vertices)));
+                                    }
+                                }
+                            }
+
+                            break;
+                        }
+
+                        // Primitives sharing a point with the primitive.
+                        case 1:
+                        {
+                            const GEO_Primitive *prim = gdp->getGEOPrimitive(gdp->primitiveOffset(i));
+
+                            GA_Size num_vertices = prim->getVertexCount();
+
+                            for (GA_Size k = 0; k < num_vertices; ++k)
+                            {
+                                prims.clear();
+                                gdp->getPrimitivesReferencingPoint(prims, prim->getPointOffset(k));
+
+                                for (exint j = 0; j < prims.size(); ++j)
+                                {
+                                    row.push_back(gdp->primitiveIndex(prims(j)));
+                                }
+                            }
+
+                            break;
+                        }
+
+                        // Primitives sharing an edge with the primitive.
+                        case 2:
+                        {
+                            const GEO_Face *face = dynamic_cast<const GEO_Face *>(gdp->getGEOPrimitive(gdp->primitiveOffset(i)));
+
+                            if (face == 0)
+                            {
+                                break;
+                            }
+
+                            GA_Size num_vertices = face->getVertexCount();
+
+                            GA_Size num_edges = face->isClosed() ? num_vertices : num_vertices - 1;
+
+                            for (GA_Size k = 0; k < num_edges; ++k)
+                            {
+                                GA_Offset pt_off1 = face->getPointOffset(k);
+                                GA_Offset pt_off2 = face->getPointOffset((k + 1) % num_vertices);
+
+                                if (pt_off1 == pt_off2)
+                                {
+                                    continue;
+                                }
+
+                                GA_Edge edge(pt_off1, pt_off2);
+
+                                prims.clear();
+                                gdp->getPrimitivesReferencingPoint(prims, pt_off1);
+
+                                for (exint j = 0; j < prims.size(); ++j)
+                                {
+                                    const GEO_Face *other = dynamic_cast<const GEO_Face *>(gdp->getGEOPrimitive(prims(j)));
+
+                                    if (other != 0 && other->hasEdge(edge))
+                                    {
+                                        row.push_back(gdp->primitiveIndex(prims(j)));
+                                    }
+                                }
+                            }
+
+                            break;
+                        }
+
+                        // Primitives referencing the point.
+                        case 3:
+                        {
+                            prims.clear();
+                            gdp->getPrimitivesReferencingPoint(prims, gdp->pointOffset(i));
+
+                            for (exint j = 0; j < prims.size(); ++j)
+                            {
+                                row.push_back(gdp->primitiveIndex(prims(j)));
+                            }
+
+                            break;
+                        }
+                    }
+
+                    std::sort(row.begin(), row.end());
+                    row.erase(std::unique(row.begin(), row.end()), row.end());
+
+                    // Elements are never adjacent to themselves.
+                    if (adjacency_type != 3)
+                    {
+                        row.erase(std::remove(row.begin(), row.end(), (int)i), row.end());
+                    }
+
+                    offsets[i + 1] = row.size();
+
+                    columns.insert(columns.end(), row.begin(), row.end());
+                }
+            }
+        }
+    );
+
+    for (exint i = 1; i < num_offsets; ++i)
+    {
+        offsets[i] += offsets[i - 1];
+    }
+
+    int num_entries = num_rows > 0 ? offsets[num_rows] : 0;
+
+    // Only copy the columns if they all fit, otherwise the caller needs to
+    // provide a larger buffer.
+    if (num_entries <= num_indices)
+    {
+        UTparallelFor(
+            UT_BlockedRange<exint>(0, num_chunks),
+            [&](const UT_BlockedRange<exint> &range)
+            {
+                for (exint chunk = range.begin(); chunk < range.end(); ++chunk)
+                {
+                    const std::vector<int> &columns = chunk_columns[chunk];
+
+                    std::copy(columns.begin(), columns.end(), indices + offsets[chunk * chunk_size]);
+                }
+            }
+        );
+    }
+
+    return num_entries;
+}
 """,
     """
 VertexMap
@@ -1046,96 +1612,245 @@ setVertexStringAttribValues(GU_Detail *gdp,
 }
 """,
     """
-void
-setSharedStringAttrib(GU_Detail *gdp,
-                      int attribute_type,
-                      const char *attrib_name,
-                      const char *value,
-                      const char *group_name)
+StringArray
+getIndexedStringAttribValues(const GU_Detail *gdp,
+                             int attribute_type,
+                             const char *attrib_name,
+                             int *indices,
+                             int num_elements)
 {
-    const GA_AIFSharedStringTuple       *s_t;
-    GA_Attribute                *attrib;
+    std::vector<std::string>    result;
 
-    GA_ElementGroup             *group = 0;
+    const GA_AIFSharedStringTuple       *s_t;
+    const GA_Attribute          *attrib;
 
     GA_Range                    range;
 
+    UT_Map<GA_StringIndexType, int>     table_map;
 
     GA_AttributeOwner owner = static_cast<GA_AttributeOwner>(attribute_type);
 
-    // Find the point group if necessary.
-    if (group_name)
+    attrib = gdp->findStringTuple(owner, attrib_name);
+
+    // Figure out the range of elements we need to iterate over.
+    switch(owner)
     {
-        switch(owner)
-        {
-            case GA_ATTRIB_VERTEX:
-                group = gdp->findVertexGroup(group_name);
-                range = GA_Range(*group);
-                break;
+        case GA_ATTRIB_VERTEX:
+            range = gdp->getVertexRange();
+            break;
 
-            case GA_ATTRIB_POINT:
-                group = gdp->findPointGroup(group_name);
-                range = GA_Range(*group);
-                break;
+        case GA_ATTRIB_POINT:
+            range = gdp->getPointRange();
+            break;
 
-            case GA_ATTRIB_PRIMITIVE:
-                group = gdp->findPrimitiveGroup(group_name);
-                range = GA_Range(*group);
-                break;
+        case GA_ATTRIB_PRIMITIVE:
+            range = gdp->getPrimitiveRange();
+            break;
+    }
+
+    // Get a shared string tuple from the attribute.
+    s_t = attrib->getAIFSharedStringTuple();
+
+    // Build a table of the strings in use without any holes.
+    for (GA_AIFSharedStringTuple::iterator it = s_t->begin(attrib); !it.atEnd(); ++it)
+    {
+        if (!UTisstring(it.getString()))
+        {
+            continue;
         }
+
+        table_map[it.getIndex()] = result.size();
+        result.push_back(it.getString());
     }
 
-    else
+    int tuple_size = attrib->getTupleSize();
+
+    int i = 0;
+
+    for (GA_Iterator it(range); !it.atEnd() && i < num_elements; ++it, ++i)
     {
-        // Figure out the range of elements we need to iterate over.
-        switch(owner)
+        for (int component=0; component < tuple_size; ++component)
         {
-            case GA_ATTRIB_VERTEX:
-                range = gdp->getVertexRange();
-                break;
+            GA_StringIndexType handle = s_t->getHandle(attrib, *it, component);
 
-            case GA_ATTRIB_POINT:
-                range = gdp->getPointRange();
-                break;
+            auto entry = table_map.find(handle);
 
-            case GA_ATTRIB_PRIMITIVE:
-                range = gdp->getPrimitiveRange();
-                break;
+            indices[i * tuple_size + component] =
+                (entry == table_map.end()) ? -1 : entry->second;
         }
     }
 
-    // Try to find the string attribute.
-    attrib = gdp->findStringTuple(owner, attrib_name);
-
-    // Get a shared string tuple from the attribute.
-    s_t = attrib->getAIFSharedStringTuple();
+    validateStringVector(result);
 
-    // Set all the specified elements to the value.
-    s_t->setString(attrib, range, value, 0);
+    return result;
 }
 """,
     """
-bool
-hasUninitializedStringValues(const GU_Detail *gdp, int attribute_type, const char *attrib_name)
+void
+setIndexedStringAttribValues(GU_Detail *gdp,
+                             int attribute_type,
+                             const char *attrib_name,
+                             const char **strings,
+                             int num_strings,
+                             int *indices,
+                             int num_elements)
 {
     const GA_AIFSharedStringTuple       *s_t;
-    const GA_Attribute          *attrib;
-    GA_StringIndexType          handle;
-
-    GA_Range                    elements;
+    GA_Attribute                *attrib;
 
-    bool has_uninitialized = false;
+    GA_Range                    range;
 
     GA_AttributeOwner owner = static_cast<GA_AttributeOwner>(attribute_type);
 
-    switch (owner)
+    attrib = gdp->findStringTuple(owner, attrib_name);
+
+    // Figure out the range of elements we need to iterate over.
+    switch(owner)
     {
         case GA_ATTRIB_VERTEX:
-            elements = gdp->getVertexRange();
+            range = gdp->getVertexRange();
             break;
 
         case GA_ATTRIB_POINT:
-            elements = gdp->getPointRange();
+            range = gdp->getPointRange();
+            break;
+
+        case GA_ATTRIB_PRIMITIVE:
+            range = gdp->getPrimitiveRange();
+            break;
+    }
+
+    // Get a shared string tuple from the attribute.
+    s_t = attrib->getAIFSharedStringTuple();
+
+    int tuple_size = attrib->getTupleSize();
+
+    // The string table handle for each string, added to the table when it is
+    // first used so each string is only looked up once.
+    std::vector<GA_StringIndexType>     handles(num_strings, GA_INVALID_STRING_INDEX);
+    std::vector<bool>                   resolved(num_strings, false);
+
+    int i = 0;
+
+    for (GA_Iterator it(range); !it.atEnd() && i < num_elements; ++it, ++i)
+    {
+        for (int component=0; component < tuple_size; ++component)
+        {
+            int index = indices[i * tuple_size + component];
+
+            GA_StringIndexType handle = GA_INVALID_STRING_INDEX;
+
+            if (index >= 0 && index < num_strings)
+            {
+                if (!resolved[index])
+                {
+                    if (UTisstring(strings[index]))
+                    {
+                        handles[index] = s_t->addString(attrib, strings[index]);
+                    }
+
+                    resolved[index] = true;
+                }
+
+                handle = handles[index];
+            }
+
+            s_t->setHandle(attrib, *it, handle, component);
+        }
+    }
+}
+""",
+    """
+void
+setSharedStringAttrib(GU_Detail *gdp,
+                      int attribute_type,
+                      const char *attrib_name,
+                      const char *value,
+                      const char *group_name)
+{
+    const GA_AIFSharedStringTuple       *s_t;
+    GA_Attribute                *attrib;
+
+    GA_ElementGroup             *group = 0;
+
+    GA_Range                    range;
+
+
+    GA_AttributeOwner owner = static_cast<GA_AttributeOwner>(attribute_type);
+
+    // Find the point group if necessary.
+    if (group_name)
+    {
+        switch(owner)
+        {
+            case GA_ATTRIB_VERTEX:
+                group = gdp->findVertexGroup(group_name);
+                range = GA_Range(*group);
+                break;
+
+            case GA_ATTRIB_POINT:
+                group = gdp->findPointGroup(group_name);
+                range = GA_Range(*group);
+                break;
+
+            case GA_ATTRIB_PRIMITIVE:
+                group = gdp->findPrimitiveGroup(group_name);
+                range = GA_Range(*group);
+                break;
+        }
+    }
+
+    else
+    {
+        // Figure out the range of elements we need to iterate over.
+        switch(owner)
+        {
+            case GA_ATTRIB_VERTEX:
+                range = gdp->getVertexRange();
+                break;
+
+            case GA_ATTRIB_POINT:
+                range = gdp->getPointRange();
+                break;
+
+            case GA_ATTRIB_PRIMITIVE:
+                range = gdp->getPrimitiveRange();
+                break;
+        }
+    }
+
+    // Try to find the string attribute.
+    attrib = gdp->findStringTuple(owner, attrib_name);
+
+    // Get a shared string tuple from the attribute.
+    s_t = attrib->getAIFSharedStringTuple();
+
+    // Set all the specified elements to the value.
+    s_t->setString(attrib, range, value, 0);
+}
+""",
+    """
+bool
+hasUninitializedStringValues(const GU_Detail *gdp, int attribute_type, const char *attrib_name)
+{
+    const GA_AIFSharedStringTuple       *s_t;
+    const GA_Attribute          *attrib;
+    GA_StringIndexType          handle;
+
+    GA_Range                    elements;
+
+    bool has_uninitialized = false;
+
+    GA_AttributeOwner owner = static_cast<GA_AttributeOwner>(attribute_type);
+
+    switch (owner)
+    {
+        case GA_ATTRIB_VERTEX:
+            elements = gdp->getVertexRange();
+            break;
+
+        case GA_ATTRIB_POINT:
+            elements = gdp->getPointRange();
             break;
 
         case GA_ATTRIB_PRIMITIVE:
@@ -1275,6 +1990,203 @@ makePrimitiveUnique(GU_Detail *gdp, unsigned prim_num)
 """,
     """
 bool
+measurePrimitives(const GU_Detail *gdp,
+                  const char *group_name,
+                  int measurement,
+                  double *values,
+                  int num_values)
+{
+    const GA_PrimitiveGroup     *group = 0;
+
+    GA_OffsetList               offsets;
+
+    // Only measure primitives in the group, if one was passed.
+    if (UTisstring(group_name))
+    {
+        group = gdp->findPrimitiveGroup(group_name);
+
+        if (!group)
+        {
+            return false;
+        }
+    }
+
+    // Gather the offsets first so each primitive's position in the output is
+    // known when measuring in parallel.
+    for (GA_Iterator it(gdp->getPrimitiveRange(group)); !it.atEnd(); ++it)
+    {
+        offsets.append(*it);
+    }
+
+    // The number of values for each primitive.
+    int width = 1;
+
+    if (measurement == 3)
+    {
+        width = 3;
+    }
+    else if (measurement == 4)
+    {
+        width = 6;
+    }
+
+    exint num_prims = SYSmin(offsets.size(), (exint)(num_values / width));
+
+    UTparallelFor(
+        UT_BlockedRange<exint>(0, num_prims),
+        [&](const UT_BlockedRange<exint> &range)
+        {
+            UT_BoundingBox      bbox;
+            UT_Vector3          center;
+
+            // The intrinsic handle depends on the primitive type so look it up
+            // again whenever the type changes.
+            int                 intrinsic_type = -1;
+            GA_LocalIntrinsic   intrinsic_handle = -1;
+            fpreal64            measured;
+
+            for (exint i = range.begin(); i < range.end(); ++i)
+            {
+                const GEO_Primitive *prim = gdp->getGEOPrimitive(offsets(i));
+
+                double *value = values + i * width;
+
+                switch (measurement)
+                {
+                    // Use the same values as the "measuredarea",
+                    // "measuredperimeter" and "measuredvolume" intrinsics.
+                    case 0:
+                    case 1:
+                    case 2:
+                        if (prim->getTypeId().get() != intrinsic_type)
+                        {
+                            intrinsic_type = prim->getTypeId().get();
+                            intrinsic_handle = prim->findIntrinsic(
+                                measurement == 0 ? "measuredarea" :
+                                measurement == 1 ? "measuredperimeter" : "measuredvolume"
+                            );
+                        }
+
+                        measured = 0;
+                        prim->getIntrinsic(intrinsic_handle, &measured, 1);
+
+                        value[0] = measured;
+                        break;
+
+                    case 3:
+                        center = prim->baryCenter();
+
+                        value[0] = center.x();
+                        value[1] = center.y();
+                        value[2] = center.z();
+                        break;
+
+                    case 4:
+                        prim->getBBox(&bbox);
+
+                        value[0] = bbox.xmin();
+                        value[1] = bbox.ymin();
+                        value[2] = bbox.zmin();
+                        value[3] = bbox.xmax();
+                        value[4] = bbox.ymax();
+                        value[5] = bbox.zmax();
+                        break;
+                }
+            }
+        }
+    );
+
+    return true;
+}
+""",
+    """
+bool
+check_minimum_polygon_vertex_count(const GU_Detail *gdp, int count, bool ignore_open)
+{
+
+    const GA_Primitive                 *prim;
+    const GEO_Face                     *face;
+
+    GA_FOR_ALL_PRIMITIVES(gdp, prim)
+    {
+        if (prim->getVertexCount() < count)
+        {
+            // Check if we're dealing with a polygons.
+            face = reinterpret_cast<const GEO_Face *>(prim);
+
+            // Ignore non-polygons
+            if (face == nullptr)
+                continue;
+
+            // Ignore open faces.
+            if (ignore_open && !face->isClosed())
+                continue;
+
+            return false;
+        }
+    }
+
+    return true;
+}
+""",
+    """
+bool
+hasPrimsWithSharedVertexPoints(const GU_Detail *gdp)
+{
+    const GA_Primitive  *prim;
+
+    GA_FOR_ALL_PRIMITIVES(gdp, prim)
+    {
+        GA_OffsetArray seen_points;
+
+        for (GA_Iterator pt_it(prim->getPointRange()); !pt_it.atEnd(); ++pt_it)
+        {
+            if (seen_points.find(*pt_it) != -1)
+            {
+                return true;
+            }
+
+            seen_points.append(*pt_it);
+        }
+
+    }
+
+    return false;
+}
+""",
+    """
+IntArray
+getPrimsWithSharedVertexPoints(const GU_Detail *gdp)
+{
+    std::vector<int>            prim_nums;
+
+    const GA_Primitive  *prim;
+
+    GA_FOR_ALL_PRIMITIVES(gdp, prim)
+    {
+        GA_OffsetArray seen_points;
+
+        for (GA_Iterator pt_it(prim->getPointRange()); !pt_it.atEnd(); ++pt_it)
+        {
+            if (seen_points.find(*pt_it) != -1)
+            {
+                prim_nums.push_back(prim->getMapIndex());
+                break;
+            }
+            seen_points.append(*pt_it);
+        }
+
+    }
+
+    return prim_nums;
+}
+""",
+]
+
+# Geometry groups.
+_GROUP_SOURCES = [
+    """
+bool
 renameGroup(GU_Detail *gdp, const char *from_name, const char *to_name, int group_type)
 {
     GA_GroupType owner = static_cast<GA_GroupType>(group_type);
@@ -1329,6 +2241,69 @@ groupBoundingBox(const GU_Detail *gdp, int group_type, const char *group_name)
 """,
     """
 void
+groupBoundingBoxes(const GU_Detail *gdp,
+                   int *group_types,
+                   const char **group_names,
+                   int num_groups,
+                   double *values,
+                   int num_values)
+{
+    exint num_bboxes = SYSmin((exint)num_groups, (exint)(num_values / 6));
+
+    UTparallelFor(
+        UT_BlockedRange<exint>(0, num_bboxes),
+        [&](const UT_BlockedRange<exint> &range)
+        {
+            UT_BoundingBox      bbox;
+
+            for (exint i = range.begin(); i < range.end(); ++i)
+            {
+                const GA_Group *group = 0;
+
+                GA_GroupType type = static_cast<GA_GroupType>(group_types[i]);
+
+                switch (type)
+                {
+                    case GA_GROUP_POINT:
+                        group = gdp->findPointGroup(group_names[i]);
+                        break;
+
+                    case GA_GROUP_PRIMITIVE:
+                        group = gdp->findPrimitiveGroup(group_names[i]);
+                        break;
+
+                    case GA_GROUP_EDGE:
+                        group = gdp->findEdgeGroup(group_names[i]);
+                        break;
+                }
+
+                // A null group would give the bounds of the whole geometry so
+                // use empty bounds instead.
+                if (group)
+                {
+                    gdp->getGroupBBox(&bbox, group);
+                }
+
+                else
+                {
+                    bbox.initBounds();
+                }
+
+                double *value = values + i * 6;
+
+                value[0] = bbox.xmin();
+                value[1] = bbox.ymin();
+                value[2] = bbox.zmin();
+                value[3] = bbox.xmax();
+                value[4] = bbox.ymax();
+                value[5] = bbox.zmax();
+            }
+        }
+    );
+}
+""",
+    """
+void
 destroyEmptyGroups(GU_Detail *gdp, int attribute_type)
 {
     GA_AttributeOwner owner = static_cast<GA_AttributeOwner>(attribute_type);
@@ -1367,22 +2342,173 @@ groupSize(const GU_Detail *gdp, const char *group_name, int group_type)
 """,
     """
 void
-toggleGroupEntries(GU_Detail *gdp, const char *group_name, int group_type)
+getGroupMembership(const GU_Detail *gdp,
+                   int group_type,
+                   const char *group_name,
+                   int *values,
+                   int num_values)
 {
-    GA_EdgeGroup                *egroup;
-    GA_ElementGroup             *group;
+    GA_Index                    index;
 
     GA_GroupType type = static_cast<GA_GroupType>(group_type);
 
+    std::fill(values, values + num_values, 0);
+
     switch (type)
     {
         case GA_GROUP_POINT:
-            group = gdp->findPointGroup(group_name);
-            group->toggleEntries();
-            break;
+        {
+            const GA_PointGroup *group = gdp->findPointGroup(group_name);
 
-        case GA_GROUP_PRIMITIVE:
-            group = gdp->findPrimitiveGroup(group_name);
+            for (GA_Iterator it(gdp->getPointRange(group)); !it.atEnd(); ++it)
+            {
+                index = gdp->pointIndex(*it);
+
+                if (index < num_values)
+                {
+                    values[index] = 1;
+                }
+            }
+
+            break;
+        }
+
+        case GA_GROUP_PRIMITIVE:
+        {
+            const GA_PrimitiveGroup *group = gdp->findPrimitiveGroup(group_name);
+
+            for (GA_Iterator it(gdp->getPrimitiveRange(group)); !it.atEnd(); ++it)
+            {
+                index = gdp->primitiveIndex(*it);
+
+                if (index < num_values)
+                {
+                    values[index] = 1;
+                }
+            }
+
+            break;
+        }
+
+        case GA_GROUP_VERTEX:
+        {
+            const GA_VertexGroup *group = gdp->findVertexGroup(group_name);
+
+            for (GA_Iterator it(gdp->getVertexRange(group)); !it.atEnd(); ++it)
+            {
+                index = gdp->vertexIndex(*it);
+
+                if (index < num_values)
+                {
+                    values[index] = 1;
+                }
+            }
+
+            break;
+        }
+    }
+}
+""",
+    """
+void
+setGroupMembership(GU_Detail *gdp,
+                   int group_type,
+                   const char *group_name,
+                   int *values,
+                   int num_values)
+{
+    GA_ElementGroup             *group = 0;
+
+    GA_Range                    range;
+
+    GA_GroupType type = static_cast<GA_GroupType>(group_type);
+
+    switch (type)
+    {
+        case GA_GROUP_POINT:
+            group = gdp->findPointGroup(group_name);
+            range = gdp->getPointRange();
+            break;
+
+        case GA_GROUP_PRIMITIVE:
+            group = gdp->findPrimitiveGroup(group_name);
+            range = gdp->getPrimitiveRange();
+            break;
+
+        case GA_GROUP_VERTEX:
+            group = gdp->findVertexGroup(group_name);
+            range = gdp->getVertexRange();
+            break;
+    }
+
+    int i = 0;
+
+    // Elements are iterated in index order so the values line up.
+    for (GA_Iterator it(range); !it.atEnd() && i < num_values; ++it, ++i)
+    {
+        group->setElement(*it, values[i] != 0);
+    }
+}
+""",
+    """
+void
+getEdgeGroupPoints(const GU_Detail *gdp,
+                   const char *group_name,
+                   int *values,
+                   int num_values)
+{
+    const GA_EdgeGroup          *group;
+
+    group = gdp->findEdgeGroup(group_name);
+
+    int i = 0;
+
+    for (GA_EdgeGroup::const_iterator it = group->begin(); !it.atEnd() && i + 1 < num_values; ++it)
+    {
+        const GA_Edge &edge = it.getEdge();
+
+        values[i++] = gdp->pointIndex(edge.p0());
+        values[i++] = gdp->pointIndex(edge.p1());
+    }
+}
+""",
+    """
+void
+setEdgeGroupPoints(GU_Detail *gdp,
+                   const char *group_name,
+                   int *values,
+                   int num_values)
+{
+    GA_EdgeGroup                *group;
+
+    group = gdp->findEdgeGroup(group_name);
+
+    group->clear();
+
+    for (int i = 0; i + 1 < num_values; i += 2)
+    {
+        group->add(gdp->pointOffset(values[i]), gdp->pointOffset(values[i + 1]));
+    }
+}
+""",
+    """
+void
+toggleGroupEntries(GU_Detail *gdp, const char *group_name, int group_type)
+{
+    GA_EdgeGroup                *egroup;
+    GA_ElementGroup             *group;
+
+    GA_GroupType type = static_cast<GA_GroupType>(group_type);
+
+    switch (type)
+    {
+        case GA_GROUP_POINT:
+            group = gdp->findPointGroup(group_name);
+            group->toggleEntries();
+            break;
+
+        case GA_GROUP_PRIMITIVE:
+            group = gdp->findPrimitiveGroup(group_name);
             group->toggleEntries();
             break;
 
@@ -1645,142 +2771,325 @@ groupUngroupedPrims(GU_Detail *gdp, const char *ungrouped_name)
     }
 }
 """,
+]
+
+# Digital asset definitions and meta sources.
+_HDA_SOURCES = [
     """
-bool
-check_minimum_polygon_vertex_count(const GU_Detail *gdp, int count, bool ignore_open)
+HdaIndex
+getHdaIndex()
 {
+    std::vector<std::string>    library_paths, meta_sources;
+    std::vector<std::string>    definition_categories, definition_names;
+    std::vector<int>            definition_libraries, definition_dummies;
 
-    const GA_Primitive                 *prim;
-    const GEO_Face                     *face;
+    HdaIndex                    index;
 
-    GA_FOR_ALL_PRIMITIVES(gdp, prim)
+    OP_OTLManager &manager = OPgetDirector()->getOTLManager();
+
+    for (int i=0; i<manager.getNumLibraries(); ++i)
     {
-        if (prim->getVertexCount() < count)
-        {
-            // Check if we're dealing with a polygons.
-            face = reinterpret_cast<const GEO_Face *>(prim);
+        OP_OTLLibrary *library = manager.getLibrary(i);
 
-            // Ignore non-polygons
-            if (face == nullptr)
-                continue;
+        library_paths.push_back(UT_StringHolder(library->getSource()).toStdString());
+        meta_sources.push_back(UT_StringHolder(library->getMetaSource()).toStdString());
 
-            // Ignore open faces.
-            if (ignore_open && !face->isClosed())
-                continue;
+        for (int j=0; j<library->getNumDefinitions(); ++j)
+        {
+            const OP_OTLDefinition &definition = library->getDefinition(j);
 
-            return false;
+            definition_libraries.push_back(i);
+            definition_categories.push_back(
+                UT_StringHolder(definition.getOpTableName()).toStdString()
+            );
+            definition_names.push_back(UT_StringHolder(definition.getName()).toStdString());
+            definition_dummies.push_back(library->getDefinitionIsDummy(j));
         }
     }
 
-    return true;
+    index.library_paths.set(library_paths);
+    index.meta_sources.set(meta_sources);
+    index.definition_libraries.set(definition_libraries);
+    index.definition_categories.set(definition_categories);
+    index.definition_names.set(definition_names);
+    index.definition_dummies.set(definition_dummies);
+
+    return index;
 }
 """,
     """
-bool
-hasPrimsWithSharedVertexPoints(const GU_Detail *gdp)
+const char *
+getMetaSourceForPath(const char *filename)
 {
-    const GA_Primitive  *prim;
+    int                         idx;
 
-    GA_FOR_ALL_PRIMITIVES(gdp, prim)
-    {
-        GA_OffsetArray seen_points;
+    OP_OTLLibrary               *lib;
 
-        for (GA_Iterator pt_it(prim->getPointRange()); !pt_it.atEnd(); ++pt_it)
-        {
-            if (seen_points.find(*pt_it) != -1)
-            {
-                return true;
-            }
+    UT_String                   test;
 
-            seen_points.append(*pt_it);
-        }
+    OP_OTLManager &manager = OPgetDirector()->getOTLManager();
+    idx = manager.findLibrary(filename);
+
+    lib = (idx >= 0) ? manager.getLibrary(idx): NULL;
 
+    if (lib)
+    {
+        return lib->getMetaSource();
     }
 
-    return false;
+    return "";
 }
 """,
     """
-IntArray
-getPrimsWithSharedVertexPoints(const GU_Detail *gdp)
+bool
+removeMetaSource(const char *metasrc)
 {
-    std::vector<int>            prim_nums;
+    OP_OTLManager &manager = OPgetDirector()->getOTLManager();
 
-    const GA_Primitive  *prim;
+    // Try to remove the meta source and return whether or not it was
+    // successful.
+    return manager.removeMetaSource(metasrc);
+}
+""",
+    """
+StringArray
+getLibrariesInMetaSource(const char *metasrc)
+{
+    std::vector<std::string>    result;
 
-    GA_FOR_ALL_PRIMITIVES(gdp, prim)
+    OP_OTLLibrary               *library;
+
+    OP_OTLManager &manager = OPgetDirector()->getOTLManager();
+
+    // Iterate through the list of libraries.
+    for (int i=0; i<manager.getNumLibraries(); ++i)
     {
-        GA_OffsetArray seen_points;
+        // Get the current library.
+        library = manager.getLibrary(i);
 
-        for (GA_Iterator pt_it(prim->getPointRange()); !pt_it.atEnd(); ++pt_it)
+        // Check if the meta source is equal to the target one.  If so, add
+        // the library file path to the string list.
+        if (library->getMetaSource() == metasrc)
         {
-            if (seen_points.find(*pt_it) != -1)
-            {
-                prim_nums.push_back(prim->getMapIndex());
-                break;
-            }
-            seen_points.append(*pt_it);
+            result.push_back(library->getSource().toStdString());
         }
 
     }
 
-    return prim_nums;
+    // Check for an empty vector.
+    validateStringVector(result);
+
+    return result;
 }
 """,
     """
 bool
-boundingBoxIsInside(const UT_BoundingBoxD *bbox1, const UT_BoundingBoxD *bbox2)
+isDummyDefinition(const char *filename,
+                  const char *tablename,
+                  const char *opname)
 {
-    return bbox1->isInside(*bbox2);
+    int                         def_idx, lib_idx;
+
+    OP_OTLDefinition            definition;
+    OP_OTLLibrary               *lib;
+
+    // Get the OTL manager.
+    OP_OTLManager &manager = OPgetDirector()->getOTLManager();
+
+    // Try to find the library with the file name.
+    lib_idx = manager.findLibrary(filename);
+
+    // Get the library.
+    lib = (lib_idx >= 0) ? manager.getLibrary(lib_idx): NULL;
+
+    if (lib)
+    {
+        // Try to find a definition for the operator type.
+        def_idx = lib->getDefinitionIndex(tablename, opname);
+
+        // If it exists, query if it is a dummy definition.
+        if (def_idx >= 0)
+        {
+            return lib->getDefinitionIsDummy(def_idx);
+        }
+    }
+
+    // Couldn't find the library or definition inside is, so return false.
+    return false;
 }
 """,
+]
+
+# Nodes, node types and node user data.
+_NODE_SOURCES = [
     """
-bool
-boundingBoxesIntersect(UT_BoundingBoxD *bbox1, const UT_BoundingBoxD *bbox2)
+void
+clearUserData(OP_Node *node)
 {
-    return bbox1->intersects(*bbox2);
+    node->clearUserData(false);
 }
 """,
     """
 bool
-computeBoundingBoxIntersection(UT_BoundingBoxD *bbox1, const UT_BoundingBoxD *bbox2)
+hasUserData(OP_Node *node, const char *data_name)
 {
-    return bbox1->computeIntersection(*bbox2);
+    UT_StringHolder name(data_name);
+
+    return node->hasUserData(name);
 }
 """,
     """
 void
-expandBoundingBoxBounds(UT_BoundingBoxD *bbox, float dltx, float dlty, float dltz)
+setUserData(OP_Node *node, const char *data_name, const char *data_value)
 {
-    bbox->expandBounds(dltx, dlty, dltz);
+    UT_StringHolder name(data_name);
+    UT_StringHolder value(data_value);
+
+    node->setUserData(name, value, false);
 }
 """,
     """
 void
-addToBoundingBoxMin(UT_BoundingBoxD *bbox, const UT_Vector3D *vec)
+deleteUserData(OP_Node *node, const char *data_name)
 {
-    bbox->addToMin(*vec);
+    UT_StringHolder name(data_name);
+
+    node->deleteUserData(name, false);
 }
 """,
     """
-void
-addToBoundingBoxMax(UT_BoundingBoxD *bbox, const UT_Vector3D *vec)
+IntArray
+batchModifyUserData(const char **paths,
+                    int num_paths,
+                    int operation,
+                    int *node_indices,
+                    const char **names,
+                    const char **values,
+                    int num_items,
+                    bool block_events)
 {
-    bbox->addToMax(*vec);
+    std::vector<int>            missing;
+
+    UT_Array<OP_Node *>         nodes;
+
+    OP_Director *director = OPgetDirector();
+
+    for (int i = 0; i < num_paths; ++i)
+    {
+        OP_Node *node = director->findNode(paths[i]);
+
+        if (!node)
+        {
+            missing.push_back(i);
+        }
+
+        nodes.append(node);
+    }
+
+    // Nothing is modified if any of the nodes could not be found.
+    if (!missing.empty())
+    {
+        return missing;
+    }
+
+    if (block_events)
+    {
+        for (exint i = 0; i < nodes.size(); ++i)
+        {
+            nodes(i)->blockModify(1);
+        }
+    }
+
+    switch (operation)
+    {
+        // Set data.
+        case 0:
+            for (int i = 0; i < num_items; ++i)
+            {
+                nodes(node_indices[i])->setUserData(
+                    UT_StringHolder(names[i]), UT_StringHolder(values[i]), false
+                );
+            }
+            break;
+
+        // Delete data.
+        case 1:
+            for (int i = 0; i < num_items; ++i)
+            {
+                nodes(node_indices[i])->deleteUserData(UT_StringHolder(names[i]), false);
+            }
+            break;
+
+        // Clear data.
+        case 2:
+            for (exint i = 0; i < nodes.size(); ++i)
+            {
+                nodes(i)->clearUserData(false);
+            }
+            break;
+    }
+
+    // Unblocking sends a single change event for each modified node.
+    if (block_events)
+    {
+        for (exint i = 0; i < nodes.size(); ++i)
+        {
+            nodes(i)->blockModify(0);
+        }
+    }
+
+    return missing;
 }
 """,
     """
-double
-boundingBoxArea(const UT_BoundingBoxD *bbox)
+IntArray
+batchHasUserData(const char **paths, int num_paths, const char *data_name)
 {
-    return bbox->area();
+    std::vector<int>            result;
+
+    UT_StringHolder name(data_name);
+
+    OP_Director *director = OPgetDirector();
+
+    for (int i = 0; i < num_paths; ++i)
+    {
+        OP_Node *node = director->findNode(paths[i]);
+
+        // Use -1 for nodes which could not be found.
+        if (!node)
+        {
+            result.push_back(-1);
+        }
+
+        else
+        {
+            result.push_back(node->hasUserData(name));
+        }
+    }
+
+    return result;
 }
 """,
     """
-double
-boundingBoxVolume(const UT_BoundingBoxD *bbox)
+const char *
+getNodeAuthor(OP_Node *node)
 {
-    return bbox->volume();
+    const OP_Stat &stat = node->getStat();
+    return stat.getAuthor();
+}
+""",
+    """
+bool
+isNodeTypeSubnetType(OP_Operator *op)
+{
+    return op->getIsPrimarySubnetType();
+}
+""",
+    """
+bool
+isNodeTypePythonType(OP_Operator *op)
+{
+    return op->getScriptIsPython();
 }
 """,
     """
@@ -1789,6 +3098,116 @@ disconnectAllOutputs(OP_Node *node)
 {
     node->disconnectAllOutputs();
 }
+""",
+]
+
+# Parameters and multiparms.
+_PARM_SOURCES = [
+    """
+ParmSnapshot
+getParmSnapshot(OP_Node *root, int recurse, double time)
+{
+    std::vector<std::string>    paths, raw_values;
+    std::vector<double>         values;
+    std::vector<int>            flags;
+
+    UT_Array<OP_Node *>         nodes;
+
+    UT_String                   node_path;
+    UT_WorkBuffer               parm_path;
+
+    fpreal                      value;
+
+    ParmSnapshot                snapshot;
+
+    int thread = SYSgetSTID();
+
+    nodes.append(root);
+
+    // Walk the nodes depth first.
+    while (nodes.size())
+    {
+        OP_Node *node = nodes.last();
+        nodes.removeLast();
+
+        if (recurse)
+        {
+            // Add the children in reverse so they are processed in order.
+            for (int i = node->getNchildren() - 1; i >= 0; --i)
+            {
+                nodes.append(node->getChild(i));
+            }
+        }
+
+        node->getFullPath(node_path);
+
+        PRM_ParmList *parms = node->getParmList();
+
+        for (int i = 0; i < parms->getEntries(); ++i)
+        {
+            PRM_Parm *parm = parms->getParmPtr(i);
+
+            if (!parm)
+            {
+                continue;
+            }
+
+            for (int j = 0; j < parm->getVectorSize(); ++j)
+            {
+                UT_String       raw_value;
+
+                int flag = 0;
+
+                parm_path.sprintf("%s/%s", node_path.buffer(), parm->getChannelToken(j).c_str());
+
+                if (parm->isStringType())
+                {
+                    flag |= 1;
+
+                    parm->getValue(time, raw_value, j, false, thread);
+                    values.push_back(0);
+                }
+
+                else
+                {
+                    parm->getValue(time, value, j, thread);
+                    values.push_back(value);
+                }
+
+                if (parm->getChannel(j))
+                {
+                    flag |= 2;
+
+                    if (!parm->isStringType())
+                    {
+                        parm->getExpressionOnly(time, raw_value, j, thread);
+                    }
+                }
+
+                if (parm->isTimeDependent())
+                {
+                    flag |= 4;
+                }
+
+                if (parm->isMultiParmInstance())
+                {
+                    flag |= 8;
+                }
+
+                paths.push_back(parm_path.toStdString());
+                raw_values.push_back(raw_value.toStdString());
+                flags.push_back(flag);
+            }
+        }
+    }
+
+    snapshot.paths.set(paths);
+    snapshot.raw_values.set(raw_values);
+    snapshot.values.set(values);
+    snapshot.flags.set(flags);
+
+    return snapshot;
+}
 """,
     """
 IntArray
@@ -1822,6 +3241,32 @@ resolve_multiparm_tokens(const char *parm_name, int *indices, int num_indices)
 
     return value.toStdString();
 }
+""",
+    """
+StringArray
+resolveMultiparmTokensBulk(const char *parm_name, int *indices, int num_indices, int num_names)
+{
+    std::vector<std::string>    result;
+
+    result.reserve(num_names);
+
+    // Each name has a row of indices.
+    for (int i = 0; i < num_names; ++i)
+    {
+        UT_String value(parm_name);
+
+        PRM_Parm::instanceMultiString(
+            value,
+            indices + i * num_indices,
+            num_indices,
+            false
+        );
+
+        result.push_back(value.toStdString());
+    }
+
+    return result;
+}
 """,
     """
 inlinecpp::BinaryString
@@ -1840,196 +3285,189 @@ get_multiparm_template_name(const PRM_Parm *parm)
     return std::string();
 }
 """,
-    """
-void
-buildLookatMatrix(UT_DMatrix3 *mat,
-            const UT_Vector3D *from,
-            const UT_Vector3D *to,
-            const UT_Vector3D *up)
-{
-    mat->lookat(*from, *to, *up);
-}
-""",
-    """
-void
-vector3GetDual(const UT_Vector3D *vec, UT_DMatrix3 *mat)
-{
-    vec->getDual(*mat);
-}
-""",
-    """
-const char *
-getMetaSourceForPath(const char *filename)
-{
-    int                         idx;
+]
 
-    OP_OTLLibrary               *lib;
+# Pattern to find the name of the function defined by a source.
+_FUNCTION_NAME_PATTERN = re.compile(r"(\w+)\s*\(")
 
-    UT_String                   test;
 
-    OP_OTLManager &manager = OPgetDirector()->getOTLManager();
-    idx = manager.findLibrary(filename);
+# =============================================================================
+# NON-PUBLIC FUNCTIONS
+# =============================================================================
 
-    lib = (idx >= 0) ? manager.getLibrary(idx): NULL;
 
-    if (lib)
-    {
-        return lib->getMetaSource();
-    }
+def _get_function_name(source: str) -> str:
+    """Get the name of the function defined by a function source.
+
+    :param source: The function source.
+    :return: The function name.
 
-    return "";
-}
-""",
     """
-bool
-removeMetaSource(const char *metasrc)
-{
-    OP_OTLManager &manager = OPgetDirector()->getOTLManager();
+    result = _FUNCTION_NAME_PATTERN.search(source)
+
+    if result is None:
+        raise ValueError(f"Could not find function name in source: {source}")
+
+    return result.group(1)
+
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class _InlineLibrary:
+    """An inline library which is only created when it is first used.
+
+    :param name: The library name.
+    :param function_sources: The sources of the functions in the library.
+    :return:
 
-    // Try to remove the meta source and return whether or not it was
-    // successful.
-    return manager.removeMetaSource(metasrc);
-}
-""",
     """
-StringArray
-getLibrariesInMetaSource(const char *metasrc)
-{
-    std::vector<std::string>    result;
 
-    OP_OTLLibrary               *library;
+    def __init__(self, name: str, function_sources: List[str]):
+        self._content_hash: Optional[str] = None
+        self._function_sources = function_sources
+        self._library: Optional[Any] = None
+        self._lock = threading.Lock()
+        self._name = name
 
-    OP_OTLManager &manager = OPgetDirector()->getOTLManager();
+        self._function_names = tuple(
+            _get_function_name(source) for source in function_sources
+        )
 
-    // Iterate through the list of libraries.
-    for (int i=0; i<manager.getNumLibraries(); ++i)
-    {
-        // Get the current library.
-        library = manager.getLibrary(i);
+    # -------------------------------------------------------------------------
+    # SPECIAL METHODS
+    # -------------------------------------------------------------------------
 
-        // Check if the meta source is equal to the target one.  If so, add
-        // the library file path to the string list.
-        if (library->getMetaSource() == metasrc)
-        {
-            result.push_back(library->getSource().toStdString());
-        }
+    def __repr__(self):
+        return f"<_InlineLibrary {self.name} created={self.is_created}>"
 
-    }
+    # -------------------------------------------------------------------------
+    # PROPERTIES
+    # -------------------------------------------------------------------------
 
-    // Check for an empty vector.
-    validateStringVector(result);
+    @property
+    def content_hash(self) -> str:
+        """A hash of the library source and the Houdini build it is for."""
+        if self._content_hash is None:
+            digest = hashlib.sha256()
+
+            for value in (
+                self._name,
+                hou.applicationVersionString(),
+                sys.platform,
+                _INCLUDES,
+                repr(_STRUCTS),
+                *self._function_sources,
+            ):
+                digest.update(value.encode("utf-8"))
+                digest.update(b"\0")
+
+            self._content_hash = digest.hexdigest()
+
+        return self._content_hash
+
+    @property
+    def function_names(self) -> Tuple[str, ...]:
+        """The names of the functions in the library."""
+        return self._function_names
+
+    @property
+    def function_sources(self) -> List[str]:
+        """The sources of the functions in the library."""
+        return self._function_sources
+
+    @property
+    def is_created(self) -> bool:
+        """Whether the library has been created."""
+        return self._library is not None
+
+    @property
+    def library(self) -> Any:
+        """The inlinecpp library, creating it if necessary."""
+        if self._library is None:
+            with self._lock:
+                if self._library is None:
+                    # Install any prebuilt copy of the library so inlinecpp
+                    # can load it instead of compiling.
+                    install_cached_library(self)
+
+                    self._library = inlinecpp.createLibrary(
+                        self._name,
+                        acquire_hom_lock=True,
+                        catch_crashes=True,
+                        includes=_INCLUDES,
+                        structs=_STRUCTS,
+                        function_sources=self._function_sources,
+                    )
+
+        return self._library
+
+    @property
+    def name(self) -> str:
+        """The library name."""
+        return self._name
+
+
+class _LibraryDispatcher:
+    """Provide access to the functions of a set of inline libraries.
+
+    Accessing a function creates the library containing it.
+
+    :param libraries: The libraries to dispatch to.
+    :return:
 
-    return result;
-}
-""",
     """
-bool
-isDummyDefinition(const char *filename,
-                  const char *tablename,
-                  const char *opname)
-{
-    int                         def_idx, lib_idx;
 
-    OP_OTLDefinition            definition;
-    OP_OTLLibrary               *lib;
+    def __init__(self, libraries: List[_InlineLibrary]):
+        self._libraries = tuple(libraries)
 
-    // Get the OTL manager.
-    OP_OTLManager &manager = OPgetDirector()->getOTLManager();
+        self._function_map: Dict[str, _InlineLibrary] = {}
 
-    // Try to find the library with the file name.
-    lib_idx = manager.findLibrary(filename);
+        for library in libraries:
+            for function_name in library.function_names:
+                self._function_map[function_name] = library
 
-    // Get the library.
-    lib = (lib_idx >= 0) ? manager.getLibrary(lib_idx): NULL;
+    # -------------------------------------------------------------------------
+    # SPECIAL METHODS
+    # -------------------------------------------------------------------------
 
-    if (lib)
-    {
-        // Try to find a definition for the operator type.
-        def_idx = lib->getDefinitionIndex(tablename, opname);
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._function_map))
 
-        // If it exists, query if it is a dummy definition.
-        if (def_idx >= 0)
-        {
-            return lib->getDefinitionIsDummy(def_idx);
-        }
-    }
+    def __getattr__(self, name: str) -> Any:
+        # Guard against lookups while unpickling or before initialization.
+        if name.startswith("__") or name == "_function_map":
+            raise AttributeError(name)
 
-    // Couldn't find the library or definition inside is, so return false.
-    return false;
-}
-""",
-]
+        library = self._function_map.get(name)
 
-# Create the library as a private object.
-cpp_methods = inlinecpp.createLibrary(
-    "cpp_methods",
-    acquire_hom_lock=True,
-    catch_crashes=True,
-    includes="""
-#include <CMD/CMD_Variable.h>
-#include <CH/CH_Channel.h>
-#include <CH/CH_Collection.h>
-#include <CH/CH_Manager.h>
-#include <GA/GA_AttributeRefMap.h>
-#include <GA/GA_AttributeInstanceMatrix.h>
-#include <GA/GA_Primitive.h>
-#include <GEO/GEO_Face.h>
-#include <GEO/GEO_PointTree.h>
-#include <GQ/GQ_Detail.h>
-#include <GU/GU_Detail.h>
-#include <GU/GU_PackedGeometry.h>
-#include <GU/GU_PrimPacked.h>
-#include <OBJ/OBJ_Node.h>
-#include <OP/OP_CommandManager.h>
-#include <OP/OP_Context.h>
-#include <OP/OP_Director.h>
-#include <OP/OP_Expression.h>
-#include <OP/OP_InterestRef.h>
-#include <OP/OP_Node.h>
-#include <OP/OP_OTLDefinition.h>
-#include <OP/OP_OTLLibrary.h>
-#include <OP/OP_OTLManager.h>
-#include <PRM/PRM_Name.h>
-#include <PRM/PRM_Parm.h>
-#include <PRM/PRM_Template.h>
-#include <PY/PY_Python.h>
-#include <ROP/ROP_RenderManager.h>
-#include <UT/UT_StdUtil.h>
-#include <UT/UT_Version.h>
-#include <UT/UT_WorkArgs.h>
-#include <UT/UT_WorkBuffer.h>
+        if library is None:
+            raise AttributeError(f"No inline function named {name}")
 
-using namespace std;
+        return getattr(library.library, name)
 
-// Validate a vector of strings so that it can be returned as a StringArray.
-// Currently we cannot return an empty vector.
-void validateStringVector(std::vector<std::string> &string_vec)
-{
-    // Check for an empty vector.
-    if (string_vec.size() == 0)
-    {
-        // An an empty string.
-        string_vec.push_back("");
-    }
-}
+    # -------------------------------------------------------------------------
+    # PROPERTIES
+    # -------------------------------------------------------------------------
 
-""",
-    structs=[
-        ("IntArray", "*i"),
-        ("FloatArray", "*d"),
-        ("StringArray", "**c"),
-        ("StringTuple", "*StringArray"),
-        ("VertexMap", (("prims", "*i"), ("indices", "*i"))),
-        ("Position3D", (("x", "d"), ("y", "d"), ("z", "d"))),
-        (
-            "RunPythonException",
-            (
-                ("occurred", "i"),
-                ("name", "*c"),
-                ("value", "*c"),
-                ("detailed", "*c"),
-            ),
-        ),
-    ],
-    function_sources=_FUNCTION_SOURCES,
+    @property
+    def libraries(self) -> Tuple[_InlineLibrary, ...]:
+        """The libraries being dispatched to."""
+        return self._libraries
+
+
+# =============================================================================
+
+# Create the libraries as a private object.
+cpp_methods = _LibraryDispatcher(
+    [
+        _InlineLibrary("cpp_methods_core", _CORE_SOURCES),
+        _InlineLibrary("cpp_methods_geometry", _GEOMETRY_SOURCES),
+        _InlineLibrary("cpp_methods_groups", _GROUP_SOURCES),
+        _InlineLibrary("cpp_methods_hda", _HDA_SOURCES),
+        _InlineLibrary("cpp_methods_nodes", _NODE_SOURCES),
+        _InlineLibrary("cpp_methods_parms", _PARM_SOURCES),
+    ]
 )
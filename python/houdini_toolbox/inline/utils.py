@@ -8,7 +8,10 @@ from __future__ import annotations
 
 # Standard Library
 import ctypes
-from typing import List, Optional, Sequence, Tuple, Union
+from typing import Any, List, Optional, Sequence, Tuple, Type, Union
+
+# Third Party
+import numpy
 
 # Houdini
 import hou
@@ -70,32 +73,97 @@ _GROUP_TYPE_MAP = {
 
 
 # =============================================================================
-# FUNCTIONS
+# NON-PUBLIC FUNCTIONS
 # =============================================================================
 
 
-def build_c_double_array(values: Sequence[float]) -> ctypes.Array:
-    """Convert a list of numbers to a ctypes c_double array.
+def _build_c_array(values: Any, c_type: Type, dtype: Type) -> ctypes.Array:
+    """Convert numbers to a ctypes array.
+
+    Objects supporting the buffer protocol, such as numpy arrays, are viewed as
+    a ctypes array of their memory.  Memory which is already contiguous,
+    writable and of the matching type is shared, otherwise it is converted with
+    a single numpy call.  Other sequences are converted element by element.
+
+    Buffers of values which cannot be converted without losing information,
+    such as floats for an int array or ints outside of the range of the
+    type, are rejected.
 
-    :param values: A list of floats.
+    :param values: The numbers to convert.
+    :param c_type: The ctypes type of the array elements.
+    :param dtype: The numpy type matching the ctypes type.
     :return: The values as ctypes compatible values.
 
     """
-    arr = (ctypes.c_double * len(values))(*values)
+    if isinstance(values, (list, tuple)):
+        return (c_type * len(values))(*values)
 
-    return arr
+    try:
+        view = memoryview(values)
+
+    except TypeError:
+        return (c_type * len(values))(*values)
 
+    source = numpy.asarray(view)
 
-def build_c_int_array(values: Sequence[int]) -> ctypes.Array:
-    """Convert a list of numbers to a ctypes c_int array.
+    if not numpy.can_cast(source.dtype, dtype, casting="same_kind"):
+        raise ValueError(f"Cannot convert {source.dtype} values to {c_type.__name__}")
 
-    :param values: A list of ints.
+    # Integers which don't fit the target type would silently wrap around.
+    if (
+        source.dtype.kind in "iu"
+        and source.size
+        and not numpy.can_cast(source.dtype, dtype)
+    ):
+        type_info = numpy.iinfo(dtype)
+
+        if source.min() < type_info.min or source.max() > type_info.max:
+            raise ValueError(f"Values are out of range for {c_type.__name__}")
+
+    arr = numpy.ascontiguousarray(source, dtype=dtype).reshape(-1)
+
+    # ctypes can only share writable memory.
+    if not arr.flags.writeable:
+        arr = arr.copy()
+
+    # The ctypes array keeps a reference to the numpy array so the memory
+    # stays valid for as long as it is used.
+    return (c_type * len(arr)).from_buffer(arr)
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def build_c_double_array(
+    values: Union[Sequence[float], numpy.ndarray]
+) -> ctypes.Array:
+    """Convert numbers to a ctypes c_double array.
+
+    numpy arrays and other buffer protocol objects are passed without per
+    element conversion, and without copying if they already contain contiguous
+    float64 values.
+
+    :param values: A list or array of floats.
     :return: The values as ctypes compatible values.
 
     """
-    arr = (ctypes.c_int * len(values))(*values)
+    return _build_c_array(values, ctypes.c_double, numpy.float64)
 
-    return arr
+
+def build_c_int_array(values: Union[Sequence[int], numpy.ndarray]) -> ctypes.Array:
+    """Convert numbers to a ctypes c_int array.
+
+    numpy arrays and other buffer protocol objects are passed without per
+    element conversion, and without copying if they already contain contiguous
+    C int values.
+
+    :param values: A list or array of ints.
+    :return: The values as ctypes compatible values.
+
+    """
+    return _build_c_array(values, ctypes.c_int, numpy.intc)
 
 
 def build_c_string_array(values: Sequence[str]) -> ctypes.Array:
@@ -0,0 +1,181 @@
+"""Benchmark the point cloud search engines on synthetic clouds.
+
+Measures the build time and query throughput of each engine for uniformly
+distributed clouds of increasing size.  Run with hython or any interpreter
+with numpy and scipy available:
+
+    python tests/benchmarks/benchmark_pointcloud.py --sizes 1000 100000
+
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Library
+import argparse
+import time
+from typing import Callable, List, Tuple
+
+# Third Party
+import numpy
+
+# Houdini Toolbox
+from houdini_toolbox.geometry.engines import (
+    BruteForceEngine,
+    GridEngine,
+    KDTreeEngine,
+    SpatialEngine,
+)
+
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+# Default cloud sizes to benchmark.
+_DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Brute force searches are skipped for clouds larger than this.
+_MAX_BRUTE_FORCE_SIZE = 10_000
+
+# The average number of points expected inside each radius query.
+_POINTS_PER_RADIUS = 8
+
+
+# =============================================================================
+# NON-PUBLIC FUNCTIONS
+# =============================================================================
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser.
+
+    :return: The argument parser.
+
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=_DEFAULT_SIZES,
+        help="The cloud sizes to benchmark",
+    )
+
+    parser.add_argument(
+        "--queries", type=int, default=10_000, help="The number of query positions"
+    )
+
+    parser.add_argument(
+        "--num-points",
+        type=int,
+        default=8,
+        help="The number of points to find for nearest point queries",
+    )
+
+    parser.add_argument(
+        "--workers", type=int, default=1, help="The number of query workers"
+    )
+
+    parser.add_argument("--seed", type=int, default=0, help="The random seed")
+
+    return parser
+
+
+def _time_call(func: Callable) -> Tuple[float, object]:
+    """Time a function call.
+
+    :param func: The function to call.
+    :return: The time taken in seconds and the function result.
+
+    """
+    start = time.perf_counter()
+
+    result = func()
+
+    return time.perf_counter() - start, result
+
+
+def _benchmark_engine(
+    build: Callable[[], SpatialEngine],
+    positions: numpy.ndarray,
+    num_points: int,
+    radius: float,
+    workers: int,
+) -> List[str]:
+    """Benchmark a single engine.
+
+    :param build: A function which builds the engine.
+    :param positions: The query positions.
+    :param num_points: The number of points to find for nearest point queries.
+    :param radius: The radius for fixed radius queries.
+    :param workers: The number of query workers.
+    :return: The formatted build time and query rates.
+
+    """
+    build_time, engine = _time_call(build)
+
+    try:
+        nearest_time, _ = _time_call(
+            lambda: engine.query(positions, num_points, workers=workers)  # type: ignore
+        )
+        nearest = f"{len(positions) / nearest_time:,.0f}/s"
+
+    except NotImplementedError:
+        nearest = "-"
+
+    radius_time, _ = _time_call(
+        lambda: engine.query_ball_point(positions, radius, workers=workers)  # type: ignore
+    )
+
+    return [
+        f"{build_time:.4f}s",
+        nearest,
+        f"{len(positions) / radius_time:,.0f}/s",
+    ]
+
+
+# =============================================================================
+# FUNCTIONS
+# =============================================================================
+
+
+def main():
+    """Run the benchmarks.
+
+    :return:
+
+    """
+    args = _build_parser().parse_args()
+
+    rng = numpy.random.default_rng(args.seed)
+
+    queries = rng.random((args.queries, 3))
+
+    print(f"{'size':>12} {'engine':>8} {'build':>10} {'nearest':>14} {'radius':>14}")
+
+    for size in args.sizes:
+        data = rng.random((size, 3)).astype(numpy.float32)
+
+        # Pick a radius which contains a constant number of points on average.
+        radius = (_POINTS_PER_RADIUS / size * 3 / (4 * numpy.pi)) ** (1 / 3)
+
+        engines = [
+            ("kdtree", lambda data=data: KDTreeEngine(data)),
+            ("grid", lambda data=data, radius=radius: GridEngine(data, radius)),
+        ]
+
+        if size <= _MAX_BRUTE_FORCE_SIZE:
+            engines.append(("brute", lambda data=data: BruteForceEngine(data)))
+
+        for name, build in engines:
+            results = _benchmark_engine(
+                build, queries, args.num_points, radius, args.workers
+            )
+
+            print(f"{size:>12,} {name:>8} {results[0]:>10} {results[1]:>14} {results[2]:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,13 @@
 # =============================================================================
 
 # Third Party
+import numpy
 import pytest
 
 # Houdini Toolbox
-from houdini_toolbox.geometry.pointcloud import PointCloud
+from houdini_toolbox.geometry.cache import PointCloudCache
+from houdini_toolbox.geometry.engines import KDTreeEngine
+from houdini_toolbox.geometry.pointcloud import PointCloud, TiledPointCloud
 
 # Houdini
 import hou
@@ -143,3 +146,494 @@ class Test_PointCloud:
         assert len(result) == len(geo.iterPoints())
 
         assert tuple(pt.number() for pt in result) == geo.intListAttribValue(attr)
+
+    def test_find_all_close_points_batch(self):
+        """Test find_all_close_points_batch with multiple query positions."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(10)])
+
+        pc = PointCloud(geo)
+
+        result = pc.find_all_close_points_batch([(0, 0, 0), (5, 0, 0)], 1.5)
+
+        assert [numbers.tolist() for numbers in result] == [[0, 1], [4, 5, 6]]
+
+    def test_find_nearest_points_batch(self):
+        """Test find_nearest_points_batch with multiple query positions."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(10)])
+
+        pc = PointCloud(geo)
+
+        numbers, distances = pc.find_nearest_points_batch(
+            numpy.array([(0.1, 0, 0), (8.9, 0, 0)]), num_points=2
+        )
+
+        assert numbers.tolist() == [[0, 1], [9, 8]]
+        assert distances.shape == (2, 2)
+
+    def test_find_nearest_points_batch_maxdist(self):
+        """Test find_nearest_points_batch where not enough points are within the max distance."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(10)])
+
+        pc = PointCloud(geo)
+
+        numbers, distances = pc.find_nearest_points_batch(
+            [(0, 0, 0)], num_points=3, maxdist=1.5
+        )
+
+        assert numbers.tolist() == [[0, 1, -1]]
+        assert numpy.isinf(distances[0][2])
+
+    def test_find_all_close_points_return_numbers(self):
+        """Test find_all_close_points returning point numbers using a point mask."""
+        geo = hou.Geometry()
+        points = geo.createPoints([(float(i), 0, 0) for i in range(10)])
+
+        group = geo.createPointGroup("odd")
+        group.add(points[1::2])
+
+        pc = PointCloud(geo, "odd")
+
+        result = pc.find_all_close_points(hou.Vector3(4, 0, 0), 1.5, return_numbers=True)
+
+        assert isinstance(result, numpy.ndarray)
+        assert result.tolist() == [3, 5]
+
+        assert pc.get_points(result) == (points[3], points[5])
+
+    def test_cache(self):
+        """Test reusing trees from a PointCloudCache."""
+        container = hou.node("/obj").createNode("geo")
+        sop = container.createNode("box")
+
+        cache = PointCloudCache()
+
+        pc1 = PointCloud(sop.geometry(), cache=cache)
+        pc2 = PointCloud(sop.geometry(), cache=cache)
+
+        assert pc1._tree is pc2._tree
+
+        # Changing the positions should cause a new tree to be built.
+        xform = sop.createOutputNode("xform")
+        xform.parm("tx").set(1)
+
+        pc3 = PointCloud(xform.geometry(), cache=cache)
+
+        assert pc3._tree is not pc1._tree
+
+        container.destroy()
+
+    def test_cache_dir(self, tmp_path):
+        """Test loading trees from a PointCloudCache directory."""
+        container = hou.node("/obj").createNode("geo")
+        sop = container.createNode("box")
+
+        PointCloud(sop.geometry(), cache=PointCloudCache(cache_dir=str(tmp_path)))
+
+        assert len(list(tmp_path.iterdir())) == 1
+
+        pc = PointCloud(
+            sop.geometry(), cache=PointCloudCache(cache_dir=str(tmp_path))
+        )
+
+        expected = PointCloud(sop.geometry()).find_nearest_points(
+            hou.Vector3(0.5, 0.5, 0.5), return_numbers=True
+        )
+
+        assert pc.find_nearest_points(
+            hou.Vector3(0.5, 0.5, 0.5), return_numbers=True
+        ).tolist() == expected.tolist()
+
+        container.destroy()
+
+    def test_cache_dir_content_key(self, tmp_path):
+        """Test that trees are stored on disk by the positions they were built from."""
+        container = hou.node("/obj").createNode("geo")
+        sop = container.createNode("box")
+
+        PointCloud(sop.geometry(), cache=PointCloudCache(cache_dir=str(tmp_path)))
+
+        # A different node with identical positions should reuse the stored tree.
+        null = sop.createOutputNode("null")
+
+        cache = PointCloudCache(cache_dir=str(tmp_path))
+
+        pc = PointCloud(null.geometry(), cache=cache)
+
+        assert len(list(tmp_path.iterdir())) == 1
+        assert cache.build_key(null.geometry(), None, 10) in cache
+
+        # Changing the positions should store a new tree.
+        xform = sop.createOutputNode("xform")
+        xform.parm("tx").set(1)
+
+        PointCloud(xform.geometry(), cache=cache)
+
+        assert len(list(tmp_path.iterdir())) == 2
+
+        expected = PointCloud(null.geometry()).find_nearest_points(
+            hou.Vector3(0.5, 0.5, 0.5), return_numbers=True
+        )
+
+        assert pc.find_nearest_points(
+            hou.Vector3(0.5, 0.5, 0.5), return_numbers=True
+        ).tolist() == expected.tolist()
+
+        container.destroy()
+
+    def test_cache_dir_invalid_file(self, tmp_path):
+        """Test that stored files which cannot be read are rebuilt."""
+        container = hou.node("/obj").createNode("geo")
+        sop = container.createNode("box")
+
+        PointCloud(sop.geometry(), cache=PointCloudCache(cache_dir=str(tmp_path)))
+
+        (file_path,) = tmp_path.iterdir()
+
+        file_path.write_bytes(b"invalid")
+
+        pc = PointCloud(
+            sop.geometry(), cache=PointCloudCache(cache_dir=str(tmp_path))
+        )
+
+        expected = PointCloud(sop.geometry()).find_nearest_points(
+            hou.Vector3(0.5, 0.5, 0.5), return_numbers=True
+        )
+
+        assert pc.find_nearest_points(
+            hou.Vector3(0.5, 0.5, 0.5), return_numbers=True
+        ).tolist() == expected.tolist()
+
+        # The invalid file is replaced by the rebuilt tree.
+        assert numpy.load(str(file_path)).shape == (8, 3)
+
+        container.destroy()
+
+    def test_invalid_engine(self):
+        """Test trying to create a PointCloud with an invalid engine."""
+        geo = hou.Geometry()
+        geo.createPoint()
+
+        with pytest.raises(ValueError):
+            PointCloud(geo, engine="foo")
+
+    @pytest.mark.parametrize("engine", ("auto", "brute", "grid", "kdtree"))
+    def test_engines(self, engine):
+        """Test that all engines return the same results."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(100)])
+
+        pc = PointCloud(geo, engine=engine)
+
+        close = pc.find_all_close_points_batch([(10, 0, 0), (50.5, 0, 0)], 1.5)
+
+        assert [numbers.tolist() for numbers in close] == [[9, 10, 11], [49, 50, 51, 52]]
+
+        numbers, _ = pc.find_nearest_points_batch([(20.1, 0, 0)], num_points=2)
+
+        assert numbers.tolist() == [[20, 21]]
+
+    def test_auto_grid_fallback(self):
+        """Test that auto radius queries use a tree when a grid cannot be built."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(199)] + [(1e9, 1e9, 1e9)])
+
+        with pytest.raises(ValueError):
+            PointCloud(geo, engine="grid").find_all_close_points_batch(
+                [(10, 0, 0)], 1e-6
+            )
+
+        pc = PointCloud(geo)
+
+        close = pc.find_all_close_points_batch([(10, 0, 0)], 1e-6)
+
+        assert [numbers.tolist() for numbers in close] == [[10]]
+        assert pc._tree is not None
+
+    def test_grid_cell_sizes(self):
+        """Test that grids are kept for each query radius."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(100)])
+
+        pc = PointCloud(geo, engine="grid")
+
+        pc.find_all_close_points_batch([(10, 0, 0)], 1.5)
+        grid = pc._grids[1.5]
+
+        pc.find_all_close_points_batch([(10, 0, 0)], 2.5)
+        pc.find_all_close_points_batch([(10, 0, 0)], 1.5)
+
+        assert list(pc._grids) == [2.5, 1.5]
+        assert pc._grids[1.5] is grid
+
+    def test_update(self):
+        """Test updating and adding point positions."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(100)])
+
+        pc = PointCloud(geo, engine="kdtree")
+
+        # Move point 10 far away and add a new point near the origin.
+        pc.update([10, 100], [(50, 10, 0), (0, 0.1, 0)])
+
+        assert pc.num_dirty == 2
+        assert pc.num_elements == 101
+
+        close = pc.find_all_close_points_batch([(10, 0, 0), (0, 0, 0)], 1.5)
+
+        assert [numbers.tolist() for numbers in close] == [[9, 11], [0, 1, 100]]
+
+        numbers, _ = pc.find_nearest_points_batch([(50, 9, 0)], num_points=1)
+
+        assert numbers.tolist() == [[10]]
+
+    def test_update_in_place(self):
+        """Test that updates write positions into the same buffer."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(100)])
+
+        pc = PointCloud(geo, engine="kdtree", max_dirty_ratio=0.5)
+
+        pc.update([5], [(5, 1, 0)])
+
+        buffer = pc._buffer
+
+        pc.update([6, 7], [(6, 1, 0), (7, 1, 0)])
+
+        assert pc._buffer is buffer
+        assert pc.num_dirty == 3
+
+        # Adding points grows the buffer to leave room for more.
+        pc.update([100], [(100, 0, 0)])
+
+        assert len(pc._buffer) >= 2 * len(buffer)
+
+        numbers, _ = pc.find_nearest_points_batch([(6, 1, 0), (100, 0, 0)])
+
+        assert numbers.tolist() == [[6], [100]]
+
+    def test_update_existing_engines(self):
+        """Test that updates do not modify the positions of built engines."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(100)])
+
+        pc = PointCloud(geo, engine="kdtree", max_dirty_ratio=0.5)
+
+        # Updating enough points rebuilds the tree from the updatable positions.
+        pc.update(range(60), [(float(i), 0, 0) for i in range(60)])
+
+        assert pc.num_dirty == 0
+
+        tree = pc._get_tree()
+
+        pc.update([5], [(5, 1, 0)])
+
+        overlay = pc._get_overlay()
+
+        pc.update([5], [(5, 2, 0)])
+
+        assert tree.data[5].tolist() == [5, 0, 0]
+        assert overlay.data[0].tolist() == [5, 1, 0]
+
+        distances, indexes = tree.query(numpy.array([(5, 0, 0)]), 1)
+
+        assert indexes.tolist() == [[5]]
+        assert distances.tolist() == [[0]]
+
+        numbers, _ = pc.find_nearest_points_batch([(4.9, 0, 0), (5, 2, 0)], 1)
+
+        assert numbers.tolist() == [[4], [5]]
+
+    def test_update_nearest_scaling(self, mocker):
+        """Test nearest point queries after many points have been changed."""
+        rng = numpy.random.default_rng(0)
+
+        positions = rng.random((20000, 3), dtype=numpy.float32)
+
+        geo = hou.Geometry()
+        geo.createPoints(positions.tolist())
+
+        pc = PointCloud(geo, engine="kdtree", max_dirty_ratio=0.2)
+
+        moved = rng.choice(len(positions), 2000, replace=False)
+        positions[moved] = rng.random((len(moved), 3), dtype=numpy.float32)
+
+        pc.update(moved, positions[moved])
+
+        spy = mocker.spy(KDTreeEngine, "query")
+
+        queries = rng.random((5000, 3))
+
+        numbers, distances = pc.find_nearest_points_batch(queries, 8)
+
+        # Only positions which found changed points should search further, and
+        # not by enough points to skip every changed point.
+        assert max(call.args[2] for call in spy.call_args_list) <= 64
+
+        expected_geo = hou.Geometry()
+        expected_geo.createPoints(positions.tolist())
+
+        expected_numbers, expected_distances = PointCloud(
+            expected_geo, engine="kdtree"
+        ).find_nearest_points_batch(queries, 8)
+
+        assert numbers.tolist() == expected_numbers.tolist()
+        assert numpy.allclose(distances, expected_distances)
+
+    def test_update_rebuild(self):
+        """Test that updating enough points rebuilds the engines."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(100)])
+
+        pc = PointCloud(geo, engine="kdtree", max_dirty_ratio=0.1)
+
+        pc.update(range(20), [(float(i), 1, 0) for i in range(20)])
+
+        assert pc.num_dirty == 0
+
+        numbers, _ = pc.find_nearest_points_batch([(5, 1, 0)], num_points=1)
+
+        assert numbers.tolist() == [[5]]
+
+    @pytest.mark.parametrize(
+        "method, expected",
+        [
+            ("idw", [(2, 4, 0), (30 / 13, 60 / 13, 0), (7, 7, 7)]),
+            ("nearest", [(2, 4, 0), (2, 4, 0), (7, 7, 7)]),
+        ],
+    )
+    def test_transfer_attribute(self, method, expected):
+        """Test transferring a point attribute to another geometry."""
+        source = hou.Geometry()
+        source.createPoints([(float(i), 0, 0) for i in range(10)])
+        source.addAttrib(hou.attribType.Point, "Cd", (0.0, 0.0, 0.0))
+        source.setPointFloatAttribValues(
+            "Cd", [value for i in range(10) for value in (i, i * 2, 0)]
+        )
+
+        target = hou.Geometry()
+        target.createPoints([(2, 0, 0), (2.4, 0, 0), (100, 0, 0)])
+        target.addAttrib(hou.attribType.Point, "Cd", (7.0, 7.0, 7.0))
+
+        pc = PointCloud(source)
+
+        pc.transfer_attribute(target, "Cd", method, num_points=2, maxdist=5)
+
+        values = numpy.array(target.pointFloatAttribValues("Cd")).reshape((-1, 3))
+
+        assert numpy.allclose(values, expected)
+
+    @pytest.mark.parametrize("engine", ("brute", "grid", "kdtree"))
+    def test_find_point_pairs(self, engine):
+        """Test finding all pairs of points within a distance."""
+        geo = hou.Geometry()
+        geo.createPoints([(0, 0, 0), (0.5, 0, 0), (5, 0, 0), (1, 0, 0)])
+
+        pc = PointCloud(geo, engine=engine)
+
+        result = pc.find_point_pairs(0.6)
+
+        assert result.dtype == numpy.int32
+        assert result.tolist() == [[0, 1], [1, 3]]
+
+    def test_find_nearest_points_batch_chunks(self):
+        """Test that chunked parallel queries match a single query."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(100)])
+
+        pc = PointCloud(geo)
+
+        positions = [(i + 0.25, 0, 0) for i in range(50)]
+
+        expected = pc.find_nearest_points_batch(positions, 3)
+
+        result = pc.find_nearest_points_batch(positions, 3, workers=4, chunk_size=7)
+
+        assert result[0].tolist() == expected[0].tolist()
+        assert numpy.allclose(result[1], expected[1])
+
+        stats = pc.last_query_stats
+
+        assert stats.name == "find_nearest_points_batch"
+        assert stats.num_queries == 50
+        assert stats.chunk_size == 7
+        assert stats.num_chunks == 8
+        assert stats.workers == 4
+        assert len(stats.chunk_times) == 8
+
+    def test_find_all_close_points_batch_invalid_chunk_size(self):
+        """Test querying with an invalid chunk size."""
+        geo = hou.Geometry()
+        geo.createPoints([(0, 0, 0)])
+
+        pc = PointCloud(geo)
+
+        with pytest.raises(ValueError):
+            pc.find_all_close_points_batch([(0, 0, 0)], 1, chunk_size=0)
+
+    def test_sparse_distance_matrix(self):
+        """Test building a sparse distance matrix."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(10)])
+
+        pc = PointCloud(geo)
+
+        rows, numbers, distances = pc.sparse_distance_matrix(
+            [(0, 0, 0), (5.5, 0, 0)], 1
+        )
+
+        assert rows.tolist() == [0, 0, 1, 1]
+        assert numbers.tolist() == [0, 1, 5, 6]
+        assert numpy.allclose(distances, [0, 1, 0.5, 0.5])
+
+
+class Test_TiledPointCloud:
+    """Test houdini_toolbox.geometry.pointcloud.TiledPointCloud."""
+
+    def test___init__(self):
+        """Test object initialization."""
+        geo = hou.Geometry()
+        geo.createPoints([(float(i), 0, 0) for i in range(10)])
+
+        pc = TiledPointCloud(geo, 2.5)
+
+        assert pc.num_elements == 10
+        assert pc.num_bricks == 4
+        assert pc.num_trees == 0
+
+    def test___init___invalid_brick_size(self):
+        """Test object initialization with an invalid brick size."""
+        geo = hou.Geometry()
+        geo.createPoints([(0, 0, 0)])
+
+        with pytest.raises(ValueError):
+            TiledPointCloud(geo, 0)
+
+    def test_matches_point_cloud(self):
+        """Test that results match an untiled point cloud."""
+        geo = hou.Geometry()
+        geo.createPoints(
+            [((i * 7) % 11, (i * 3) % 13, (i * 5) % 17) for i in range(200)]
+        )
+
+        positions = [(0.5, 0.5, 0.5), (6, 3, 9), (-20, 4, 4)]
+
+        pc = PointCloud(geo)
+        tiled = TiledPointCloud(geo, 2, memory_budget=1024)
+
+        expected = pc.find_nearest_points_batch(positions, 5)
+        result = tiled.find_nearest_points_batch(positions, 5)
+
+        assert numpy.allclose(result[1], expected[1])
+
+        expected = pc.find_all_close_points_batch(positions, 3)
+        result = tiled.find_all_close_points_batch(positions, 3)
+
+        assert [value.tolist() for value in result] == [
+            value.tolist() for value in expected
+        ]
+
+        # The small budget should have caused trees to be discarded.
+        assert tiled.num_trees < tiled.num_bricks
@@ -8,6 +8,7 @@
 import os
 
 # Third Party
+import numpy
 import pytest
 
 # Houdini Toolbox
@@ -27,6 +28,96 @@ pytestmark = pytest.mark.usefixtures("load_module_test_file")
 OBJ = hou.node("/obj")
 
 
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+
+@pytest.fixture
+def user_data_nodes():
+    """Fixture to provide null nodes in /obj which have user data.
+
+    The nodes are destroyed after the test.
+
+    """
+    nodes = [OBJ.createNode("null") for _ in range(3)]
+
+    for node in nodes:
+        node.setUserData("existing", "value")
+
+    yield nodes
+
+    for node in nodes:
+        node.destroy()
+
+
+@pytest.fixture
+def adjacency_geo():
+    """Fixture to provide geometry containing two triangles sharing an edge, a
+    third sharing a point and an unused point.
+
+    """
+    geo = hou.Geometry()
+
+    points = geo.createPoints(
+        [(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0), (2, 1, 0), (2, 2, 0), (5, 5, 5)]
+    )
+
+    for numbers in ((0, 1, 2), (1, 3, 2), (3, 4, 5)):
+        prim = geo.createPolygon()
+
+        for number in numbers:
+            prim.addVertex(points[number])
+
+    return geo
+
+
+@pytest.fixture
+def points_geo():
+    """Fixture to provide geometry containing 10 points."""
+    geo = hou.Geometry()
+
+    geo.createPoints([hou.Vector3(val, 0, 0) for val in range(10)])
+
+    return geo
+
+
+@pytest.fixture
+def polyline_geo():
+    """Fixture to provide geometry containing an open polygon with 4 points."""
+    geo = hou.Geometry()
+    points = geo.createPoints([hou.Vector3(val, 0, 0) for val in range(4)])
+
+    prim = geo.createPolygon(is_closed=False)
+
+    for point in points:
+        prim.addVertex(point)
+
+    return geo
+
+
+@pytest.fixture
+def squares_geo():
+    """Fixture to provide geometry containing two unit squares, the second in a
+    primitive group named "group".
+
+    """
+    geo = hou.Geometry()
+
+    for offset in (0, 5):
+        prim = geo.createPolygon()
+
+        for position in ((0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)):
+            point = geo.createPoint()
+            point.setPosition(hou.Vector3(position) + hou.Vector3(offset, 0, 0))
+            prim.addVertex(point)
+
+    group = geo.createPrimGroup("group")
+    group.add(geo.prims()[1])
+
+    return geo
+
+
 # =============================================================================
 # TESTS
 # =============================================================================
@@ -170,6 +261,85 @@ def test_delete_user_data(obj_test_node):
     assert hou.undos.undoLabels() == current_undo_stack
 
 
+class Test_batch_user_data:
+    """Test the houdini_toolbox.inline.api batch user data functions."""
+
+    def test_missing_nodes(self, user_data_nodes):
+        """Test passing paths which do not exist."""
+        nodes = user_data_nodes
+        paths = [node.path() for node in nodes] + ["/obj/missing_node"]
+
+        with pytest.raises(hou.OperationFailed):
+            houdini_toolbox.inline.api.batch_set_user_data(paths, {"data": "value"})
+
+        # No nodes should have been modified.
+        for node in nodes:
+            assert "data" not in node.userDataDict()
+
+        with pytest.raises(hou.OperationFailed):
+            houdini_toolbox.inline.api.batch_has_user_data(paths, "existing")
+
+    def test_set_user_data(self, user_data_nodes):
+        """Test setting user data on multiple nodes."""
+        nodes = user_data_nodes
+        paths = [node.path() for node in nodes]
+
+        current_undo_stack = hou.undos.undoLabels()
+
+        houdini_toolbox.inline.api.batch_set_user_data(paths, {"a": "1", "b": "2"})
+
+        for node in nodes:
+            assert node.userData("a") == "1"
+            assert node.userData("b") == "2"
+
+        houdini_toolbox.inline.api.batch_set_user_data(
+            paths, [{"c": str(idx)} for idx in range(3)], block_events=False
+        )
+
+        assert [node.userData("c") for node in nodes] == ["0", "1", "2"]
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.batch_set_user_data(paths, [{"c": "0"}])
+
+        # Ensure no entries were created.
+        assert hou.undos.undoLabels() == current_undo_stack
+
+    def test_has_user_data(self, user_data_nodes):
+        """Test checking user data on multiple nodes."""
+        nodes = user_data_nodes
+        nodes[1].destroyUserData("existing")
+
+        paths = [node.path() for node in nodes]
+
+        result = houdini_toolbox.inline.api.batch_has_user_data(paths, "existing")
+
+        assert result == (True, False, True)
+
+    def test_delete_user_data(self, user_data_nodes):
+        """Test deleting user data on multiple nodes."""
+        nodes = user_data_nodes
+
+        for node in nodes:
+            node.setUserData("other", "value")
+
+        paths = [node.path() for node in nodes]
+
+        houdini_toolbox.inline.api.batch_delete_user_data(paths, ["existing"])
+
+        for node in nodes:
+            assert node.userDataDict() == {"other": "value"}
+
+    def test_clear_user_data(self, user_data_nodes):
+        """Test clearing user data on multiple nodes."""
+        nodes = user_data_nodes
+        paths = [node.path() for node in nodes]
+
+        houdini_toolbox.inline.api.batch_clear_user_data(paths)
+
+        for node in nodes:
+            assert node.userDataDict() == {}
+
+
 @pytest.mark.parametrize(
     "value_to_hash, expected",
     [
@@ -441,6 +611,60 @@ class Test_sort_geometry_by_values:
 
         assert list(obj_test_geo_copy.primFloatAttribValues("id")) == sorted(values)
 
+    def test_invalid_keys(self):
+        """Test passing keys that are not a list of values or keys."""
+        geo = hou.Geometry()
+        geo.createPoints([hou.Vector3()] * 2)
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.sort_geometry_by_values(
+                geo, hou.geometryType.Points, numpy.zeros((1, 2, 2))
+            )
+
+    @pytest.mark.parametrize("value", (numpy.nan, numpy.inf))
+    def test_non_finite_keys(self, value):
+        """Test passing keys which are not finite."""
+        geo = hou.Geometry()
+        geo.createPoints([hou.Vector3()] * 3)
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.sort_geometry_by_values(
+                geo, hou.geometryType.Points, [[0, 1, 2], [1, value, 0]]
+            )
+
+    def test_multiple_keys(self):
+        """Test sorting points by multiple keys."""
+        geo = hou.Geometry()
+        geo.createPoints([hou.Vector3(val, 0, 0) for val in range(6)])
+
+        clusters = numpy.array([1, 0, 1, 0, 1, 0])
+        distances = numpy.array([0.5, 0.2, 0.1, 0.9, 0.5, 0.2])
+
+        houdini_toolbox.inline.api.sort_geometry_by_values(
+            geo, hou.geometryType.Points, [clusters, distances]
+        )
+
+        # Equal keys keep their original order.
+        assert [point.position()[0] for point in geo.points()] == [1, 5, 3, 2, 0, 4]
+
+    def test_return_permutation(self):
+        """Test getting the sorted order without sorting the geometry."""
+        geo = hou.Geometry()
+
+        for _ in range(4):
+            geo.createPolygon()
+
+        geo = geo.freeze(True)
+
+        values = numpy.array([[2, 1, 2, 1], [0, 3, -1, 3]])
+
+        result = houdini_toolbox.inline.api.sort_geometry_by_values(
+            geo, hou.geometryType.Primitives, values, return_permutation=True
+        )
+
+        assert result.dtype == numpy.int32
+        assert result.tolist() == [1, 3, 2, 0]
+
 
 def test_create_point_at_position():
     """Test houdini_toolbox.inline.api.create_point_at_position."""
@@ -484,6 +708,83 @@ def test_create_n_points():
         houdini_toolbox.inline.api.create_n_points(geo, -4)
 
 
+class Test_create_points_from_arrays:
+    """Test houdini_toolbox.inline.api.create_points_from_arrays."""
+
+    def test_read_only(self):
+        """Test when the geometry is read only."""
+        geo = hou.Geometry().freeze(True)
+
+        with pytest.raises(hou.GeometryPermissionError):
+            houdini_toolbox.inline.api.create_points_from_arrays(
+                geo, numpy.zeros((2, 3))
+            )
+
+    def test_invalid_positions(self):
+        """Test passing positions that are not an (N, 3) array."""
+        geo = hou.Geometry()
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.create_points_from_arrays(
+                geo, numpy.zeros((2, 2))
+            )
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.create_points_from_arrays(
+                geo, numpy.zeros((0, 3))
+            )
+
+    def test_invalid_attribs(self):
+        """Test passing invalid attribute values."""
+        geo = hou.Geometry()
+        geo.addAttrib(hou.attribType.Point, "id", 0)
+        geo.addAttrib(hou.attribType.Point, "name", "")
+
+        positions = numpy.zeros((2, 3))
+
+        with pytest.raises(hou.OperationFailed):
+            houdini_toolbox.inline.api.create_points_from_arrays(
+                geo, positions, {"missing": [1, 2]}
+            )
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.create_points_from_arrays(
+                geo, positions, {"name": [1, 2]}
+            )
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.create_points_from_arrays(
+                geo, positions, {"id": [1, 2, 3]}
+            )
+
+    def test(self):
+        """Test creating points with positions and attribute values."""
+        geo = hou.Geometry()
+        geo.createPoint()
+
+        geo.addAttrib(hou.attribType.Point, "id", 0)
+        geo.addAttrib(hou.attribType.Point, "Cd", (1.0, 1.0, 1.0))
+
+        positions = numpy.arange(12, dtype=float).reshape(4, 3)
+
+        result = houdini_toolbox.inline.api.create_points_from_arrays(
+            geo,
+            positions,
+            {"id": numpy.array([5, 6, 7, 8]), "Cd": numpy.full((4, 3), 0.5)},
+        )
+
+        assert result == 1
+        assert len(geo.points()) == 5
+
+        points = geo.points()[1:]
+
+        assert [point.position() for point in points] == [
+            hou.Vector3(tuple(pos)) for pos in positions
+        ]
+        assert [point.attribValue("id") for point in points] == [5, 6, 7, 8]
+        assert points[0].attribValue("Cd") == (0.5, 0.5, 0.5)
+
+
 def test_merge_point_group(obj_test_geo):
     """Test houdini_toolbox.inline.api.merge_point_group."""
     geo = hou.Geometry()
@@ -526,6 +827,35 @@ def test_merge_points(obj_test_geo):
     assert len(geo.iterPoints()) == len(points)
 
 
+def test_merge_points_by_indices():
+    """Test houdini_toolbox.inline.api.merge_points_by_indices."""
+    source_geo = hou.Geometry()
+    source_geo.createPoints([(float(i), 0, 0) for i in range(10)])
+
+    geo = hou.Geometry()
+
+    indices = numpy.array([0, 3, 4, 9])
+
+    # Read only
+    frozen_geo = geo.freeze(True)
+
+    with pytest.raises(hou.GeometryPermissionError):
+        houdini_toolbox.inline.api.merge_points_by_indices(
+            frozen_geo, source_geo, indices
+        )
+
+    # Invalid indices
+    with pytest.raises(IndexError):
+        houdini_toolbox.inline.api.merge_points_by_indices(
+            geo, source_geo, numpy.array([-1])
+        )
+
+    # Success
+    houdini_toolbox.inline.api.merge_points_by_indices(geo, source_geo, indices)
+
+    assert len(geo.iterPoints()) == len(indices)
+
+
 def test_merge_prim_group(obj_test_geo):
     """Test houdini_toolbox.inline.api.merge_prim_group."""
     geo = hou.Geometry()
@@ -568,6 +898,37 @@ def test_merge_prims(obj_test_geo):
     assert len(geo.iterPrims()) == len(prims)
 
 
+def test_merge_prims_by_indices():
+    """Test houdini_toolbox.inline.api.merge_prims_by_indices."""
+    source_geo = hou.Geometry()
+
+    for _ in range(10):
+        source_geo.createPolygon()
+
+    geo = hou.Geometry()
+
+    indices = numpy.array([0, 3, 4, 9])
+
+    # Read only
+    frozen_geo = geo.freeze(True)
+
+    with pytest.raises(hou.GeometryPermissionError):
+        houdini_toolbox.inline.api.merge_prims_by_indices(
+            frozen_geo, source_geo, indices
+        )
+
+    # Invalid indices
+    with pytest.raises(IndexError):
+        houdini_toolbox.inline.api.merge_prims_by_indices(
+            geo, source_geo, numpy.array([10])
+        )
+
+    # Success
+    houdini_toolbox.inline.api.merge_prims_by_indices(geo, source_geo, indices)
+
+    assert len(geo.iterPrims()) == len(indices)
+
+
 class Test_copy_packed_prims_to_points:
     """Test houdini_toolbox.inline.api.copy_packed_prims_to_points."""
 
@@ -1610,6 +1971,129 @@ class Test_set_vertex_string_attrib_values:
             )
 
 
+class Test_indexed_string_attrib_values:
+    """Test houdini_toolbox.inline.api.indexed_string_attrib_values."""
+
+    def test(self):
+        """Test getting indexed values."""
+        geo = hou.Geometry()
+        geo.createPoints([(0, 0, 0)] * 5)
+
+        attrib = geo.addAttrib(hou.attribType.Point, "name", "")
+        geo.setPointStringAttribValues("name", ("foo", "bar", "", "foo", "bar"))
+
+        strings, indices = houdini_toolbox.inline.api.indexed_string_attrib_values(
+            attrib
+        )
+
+        assert indices.dtype == numpy.int32
+        assert [strings[index] if index >= 0 else "" for index in indices] == [
+            "foo",
+            "bar",
+            "",
+            "foo",
+            "bar",
+        ]
+
+    def test_tuple(self):
+        """Test getting indexed values for each tuple component."""
+        geo = hou.Geometry()
+        geo.createPoints([(0, 0, 0)] * 2)
+
+        attrib = geo.addAttrib(hou.attribType.Point, "names", ("", ""))
+        geo.setPointStringAttribValues("names", ("foo", "bar", "", "foo"))
+
+        strings, indices = houdini_toolbox.inline.api.indexed_string_attrib_values(
+            attrib
+        )
+
+        assert indices.shape == (2, 2)
+        assert [strings[index] if index >= 0 else "" for index in indices.flat] == [
+            "foo",
+            "bar",
+            "",
+            "foo",
+        ]
+
+    def test_not_string(self):
+        """Test when the attribute is not a string attribute."""
+        geo = hou.Geometry()
+        attrib = geo.addAttrib(hou.attribType.Point, "value", 0)
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.indexed_string_attrib_values(attrib)
+
+
+class Test_set_indexed_string_attrib_values:
+    """Test houdini_toolbox.inline.api.set_indexed_string_attrib_values."""
+
+    def test(self):
+        """Test setting indexed values."""
+        geo = hou.Geometry()
+
+        for _ in range(3):
+            geo.createPolygon()
+
+        attrib = geo.addAttrib(hou.attribType.Prim, "name", "")
+
+        houdini_toolbox.inline.api.set_indexed_string_attrib_values(
+            attrib, ("foo", "bar"), numpy.array([1, -1, 0])
+        )
+
+        assert geo.primStringAttribValues("name") == ("bar", "", "foo")
+
+    def test_tuple(self):
+        """Test setting indexed values for each tuple component."""
+        geo = hou.Geometry()
+        geo.createPoints([(0, 0, 0)] * 2)
+
+        attrib = geo.addAttrib(hou.attribType.Point, "names", ("", ""))
+
+        houdini_toolbox.inline.api.set_indexed_string_attrib_values(
+            attrib, ("foo", "bar"), numpy.array([[1, 0], [-1, 1]])
+        )
+
+        assert geo.pointStringAttribValues("names") == ("bar", "foo", "", "bar")
+
+        # Each component needs an index.
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.set_indexed_string_attrib_values(
+                attrib, ("foo", "bar"), numpy.array([1, 0])
+            )
+
+    def test_read_only(self):
+        """Test when the geometry is read only."""
+        geo = hou.Geometry()
+        geo.createPoints([(0, 0, 0)])
+        geo.addAttrib(hou.attribType.Point, "name", "")
+
+        frozen_geo = geo.freeze(True)
+
+        with pytest.raises(hou.GeometryPermissionError):
+            houdini_toolbox.inline.api.set_indexed_string_attrib_values(
+                frozen_geo.findPointAttrib("name"), ("foo",), [0]
+            )
+
+    def test_invalid_indices(self):
+        """Test when the indices are invalid."""
+        geo = hou.Geometry()
+        geo.createPoints([(0, 0, 0)] * 2)
+
+        attrib = geo.addAttrib(hou.attribType.Point, "name", "")
+
+        # Wrong size.
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.set_indexed_string_attrib_values(
+                attrib, ("foo",), [0]
+            )
+
+        # Out of range.
+        with pytest.raises(IndexError):
+            houdini_toolbox.inline.api.set_indexed_string_attrib_values(
+                attrib, ("foo",), [0, 1]
+            )
+
+
 class Test_set_shared_point_string_attrib:
     """Test houdini_toolbox.inline.api.set_shared_point_string_attrib."""
 
@@ -2009,43 +2493,256 @@ def test_primitive_bounding_box(obj_test_geo):
     assert houdini_toolbox.inline.api.primitive_bounding_box(prim) == target
 
 
-def test_destroy_empty_groups():
-    """Test houdini_toolbox.inline.api.destroy_empty_groups."""
-    geo = hou.Geometry()
+class Test_point_transforms:
+    """Test the houdini_toolbox.inline.api whole geometry point transforms."""
 
-    # Read only
-    frozen_geo = geo.freeze(True)
+    def test_point_instance_transforms(self):
+        """Test houdini_toolbox.inline.api.point_instance_transforms."""
+        geo = hou.Geometry()
+        geo.createPoints([(1, 2, 3), (4, 5, 6)])
 
-    with pytest.raises(hou.GeometryPermissionError):
-        houdini_toolbox.inline.api.destroy_empty_groups(
-            frozen_geo, hou.attribType.Point
-        )
+        geo.addAttrib(hou.attribType.Point, "pscale", 1.0)
+        geo.setPointFloatAttribValues("pscale", (2.0, 3.0))
 
-    # Global attribute
-    with pytest.raises(ValueError):
-        houdini_toolbox.inline.api.destroy_empty_groups(geo, hou.attribType.Global)
+        result = houdini_toolbox.inline.api.point_instance_transforms(geo)
 
-    # Point group
-    geo.createPointGroup("empty")
+        assert result.shape == (2, 4, 4)
 
-    houdini_toolbox.inline.api.destroy_empty_groups(geo, hou.attribType.Point)
+        for point, matrix in zip(geo.points(), result):
+            expected = houdini_toolbox.inline.api.point_instance_transform(point)
 
-    assert not geo.pointGroups()
+            assert numpy.allclose(matrix, expected.asTupleOfTuples())
 
-    # Prim group
-    geo.createPrimGroup("empty")
+    def test_get_oriented_point_transforms(self):
+        """Test houdini_toolbox.inline.api.get_oriented_point_transforms."""
+        geo = hou.Geometry()
+        geo.createPoints([(1, 2, 3)])
 
-    houdini_toolbox.inline.api.destroy_empty_groups(geo, hou.attribType.Prim)
+        result = houdini_toolbox.inline.api.get_oriented_point_transforms(geo)
 
-    assert not geo.primGroups()
+        assert numpy.allclose(result[0], hou.hmath.buildTranslate(1, 2, 3).asTupleOfTuples())
 
+    def test_get_oriented_point_transforms_raw_geometry(self):
+        """Test get_oriented_point_transforms with points bound to raw geometry."""
+        geo = hou.Geometry()
+        points = geo.createPoints([(0, 0, 0), (1, 0, 0), (0, 1, 0)])
 
-class Test_rename_group:
-    """Test houdini_toolbox.inline.api.rename_group."""
+        prim = geo.createPolygon()
 
-    def test_read_only(self, obj_test_geo):
-        """Test when the geometry is read only."""
-        group = obj_test_geo.pointGroups()[0]
+        for point in points:
+            prim.addVertex(point)
+
+        with pytest.raises(hou.OperationFailed):
+            houdini_toolbox.inline.api.get_oriented_point_transforms(geo)
+
+
+class Test_adjacency:
+    """Test the houdini_toolbox.inline.api compressed sparse row adjacency."""
+
+    @staticmethod
+    def _to_lists(offsets, indices):
+        """Convert adjacency arrays to a list of lists."""
+        return [
+            indices[start:end].tolist() for start, end in zip(offsets[:-1], offsets[1:])
+        ]
+
+    def test_point_point_adjacency(self, adjacency_geo):
+        """Test houdini_toolbox.inline.api.point_point_adjacency."""
+        geo = adjacency_geo
+
+        offsets, indices = houdini_toolbox.inline.api.point_point_adjacency(geo)
+
+        assert offsets.dtype == numpy.int32
+        assert self._to_lists(offsets, indices) == [
+            [1, 2],
+            [0, 2, 3],
+            [0, 1, 3],
+            [1, 2, 4, 5],
+            [3, 5],
+            [3, 4],
+            [],
+        ]
+
+    def test_point_prim_adjacency(self, adjacency_geo):
+        """Test houdini_toolbox.inline.api.point_prim_adjacency."""
+        geo = adjacency_geo
+
+        offsets, indices = houdini_toolbox.inline.api.point_prim_adjacency(geo)
+
+        assert self._to_lists(offsets, indices) == [
+            [0],
+            [0, 1],
+            [0, 1],
+            [1, 2],
+            [2],
+            [2],
+            [],
+        ]
+
+    def test_prim_prim_by_edge_adjacency(self, adjacency_geo):
+        """Test houdini_toolbox.inline.api.prim_prim_by_edge_adjacency."""
+        geo = adjacency_geo
+
+        offsets, indices = houdini_toolbox.inline.api.prim_prim_by_edge_adjacency(geo)
+
+        assert self._to_lists(offsets, indices) == [[1], [0], []]
+
+    def test_prim_prim_by_edge_adjacency_non_manifold(self):
+        """Test houdini_toolbox.inline.api.prim_prim_by_edge_adjacency where the
+        entries outnumber the vertices.
+
+        """
+        geo = hou.Geometry()
+
+        points = geo.createPoints([(0, 0, 0), (1, 0, 0)])
+
+        for i in range(5):
+            prim = geo.createPolygon()
+
+            prim.addVertex(points[0])
+            prim.addVertex(points[1])
+            prim.addVertex(geo.createPoint())
+
+        offsets, indices = houdini_toolbox.inline.api.prim_prim_by_edge_adjacency(geo)
+
+        assert len(indices) == 20
+        assert self._to_lists(offsets, indices) == [
+            [j for j in range(5) if j != i] for i in range(5)
+        ]
+
+    def test_prim_prim_by_point_adjacency(self, adjacency_geo):
+        """Test houdini_toolbox.inline.api.prim_prim_by_point_adjacency."""
+        geo = adjacency_geo
+
+        offsets, indices = houdini_toolbox.inline.api.prim_prim_by_point_adjacency(geo)
+
+        assert self._to_lists(offsets, indices) == [[1], [0, 2], [1]]
+
+
+class Test_primitive_measurements:
+    """Test the houdini_toolbox.inline.api whole geometry primitive measurements."""
+
+    def test_primitive_areas(self, squares_geo):
+        """Test houdini_toolbox.inline.api.primitive_areas."""
+        geo = squares_geo
+        group = geo.findPrimGroup("group")
+
+        assert numpy.allclose(houdini_toolbox.inline.api.primitive_areas(geo), [1, 1])
+        assert houdini_toolbox.inline.api.primitive_areas(geo, group).shape == (1,)
+
+    def test_primitive_perimeters(self, squares_geo):
+        """Test houdini_toolbox.inline.api.primitive_perimeters."""
+        geo = squares_geo
+
+        result = houdini_toolbox.inline.api.primitive_perimeters(geo)
+
+        assert numpy.allclose(result, [4, 4])
+
+    @pytest.mark.parametrize(
+        "measure, measure_prim",
+        [
+            ("primitive_areas", "primitive_area"),
+            ("primitive_perimeters", "primitive_perimeter"),
+            ("primitive_volumes", "primitive_volume"),
+        ],
+    )
+    def test_mixed_primitives(self, measure, measure_prim, squares_geo):
+        """Test that measurements match the single primitive intrinsics."""
+        geo = squares_geo
+
+        sphere = hou.Geometry()
+        hou.sopNodeTypeCategory().nodeVerb("sphere").execute(sphere, [])
+
+        geo.merge(sphere)
+
+        packed = hou.Geometry()
+        packed.createPacked("PackedGeometry").setEmbeddedGeometry(sphere.freeze())
+
+        geo.merge(packed)
+
+        result = getattr(houdini_toolbox.inline.api, measure)(geo)
+
+        assert numpy.allclose(
+            result,
+            [
+                getattr(houdini_toolbox.inline.api, measure_prim)(prim)
+                for prim in geo.prims()
+            ],
+        )
+
+    def test_primitive_bary_centers(self, squares_geo):
+        """Test houdini_toolbox.inline.api.primitive_bary_centers."""
+        geo = squares_geo
+        group = geo.findPrimGroup("group")
+
+        result = houdini_toolbox.inline.api.primitive_bary_centers(geo, group)
+
+        assert numpy.allclose(result, [[5.5, 0.5, 0]])
+
+    def test_primitive_bounding_boxes(self, squares_geo):
+        """Test houdini_toolbox.inline.api.primitive_bounding_boxes."""
+        geo = squares_geo
+
+        result = houdini_toolbox.inline.api.primitive_bounding_boxes(geo)
+
+        assert numpy.allclose(result[1], [[5, 0, 0], [6, 1, 0]])
+
+    def test_invalid_group(self, squares_geo):
+        """Test passing a group which is not a primitive group."""
+        geo = squares_geo
+
+        point_group = geo.createPointGroup("points")
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.primitive_areas(geo, point_group)
+
+    def test_missing_group(self, squares_geo):
+        """Test passing a group which does not exist on the geometry."""
+        geo = squares_geo
+
+        other_group = hou.Geometry().createPrimGroup("missing")
+
+        with pytest.raises(hou.OperationFailed):
+            houdini_toolbox.inline.api.primitive_areas(geo, other_group)
+
+
+def test_destroy_empty_groups():
+    """Test houdini_toolbox.inline.api.destroy_empty_groups."""
+    geo = hou.Geometry()
+
+    # Read only
+    frozen_geo = geo.freeze(True)
+
+    with pytest.raises(hou.GeometryPermissionError):
+        houdini_toolbox.inline.api.destroy_empty_groups(
+            frozen_geo, hou.attribType.Point
+        )
+
+    # Global attribute
+    with pytest.raises(ValueError):
+        houdini_toolbox.inline.api.destroy_empty_groups(geo, hou.attribType.Global)
+
+    # Point group
+    geo.createPointGroup("empty")
+
+    houdini_toolbox.inline.api.destroy_empty_groups(geo, hou.attribType.Point)
+
+    assert not geo.pointGroups()
+
+    # Prim group
+    geo.createPrimGroup("empty")
+
+    houdini_toolbox.inline.api.destroy_empty_groups(geo, hou.attribType.Prim)
+
+    assert not geo.primGroups()
+
+
+class Test_rename_group:
+    """Test houdini_toolbox.inline.api.rename_group."""
+
+    def test_read_only(self, obj_test_geo):
+        """Test when the geometry is read only."""
+        group = obj_test_geo.pointGroups()[0]
 
         with pytest.raises(hou.GeometryPermissionError):
             houdini_toolbox.inline.api.rename_group(group, "test_group")
@@ -2140,6 +2837,73 @@ class Test_group_bounding_box:
         assert bbox == target
 
 
+class Test_group_bounding_boxes:
+    """Test houdini_toolbox.inline.api.group_bounding_boxes."""
+
+    def test_different_geometry(self):
+        """Test passing groups from different geometry."""
+        geo1 = hou.Geometry()
+        geo2 = hou.Geometry()
+
+        groups = [geo1.createPointGroup("test"), geo2.createPointGroup("test")]
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.group_bounding_boxes(groups)
+
+    def test(self):
+        """Test getting the bounding boxes of groups."""
+        geo = hou.Geometry()
+        points = geo.createPoints(
+            [hou.Vector3(0, 0, 0), hou.Vector3(1, 2, 3), hou.Vector3(-1, -1, -1)]
+        )
+
+        group1 = geo.createPointGroup("group1")
+        group1.add(points[:2])
+
+        group2 = geo.createPointGroup("group2")
+        group2.add(points[1:])
+
+        result = houdini_toolbox.inline.api.group_bounding_boxes([group1, group2])
+
+        assert result.shape == (2, 2, 3)
+        assert result[0].tolist() == [[0, 0, 0], [1, 2, 3]]
+        assert result[1].tolist() == [[-1, -1, -1], [1, 2, 3]]
+
+        expected = houdini_toolbox.inline.api.group_bounding_box(group2)
+
+        assert hou.BoundingBox(*result[1].flatten()).isAlmostEqual(expected)
+
+    def test_empty(self):
+        """Test passing no groups."""
+        result = houdini_toolbox.inline.api.group_bounding_boxes([])
+
+        assert result.shape == (0, 2, 3)
+
+    def test_vertex_group(self):
+        """Test passing a vertex group."""
+        geo = hou.Geometry()
+
+        group = geo.createVertexGroup("test")
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.group_bounding_boxes([group])
+
+    def test_empty_group(self):
+        """Test passing a group which contains no points."""
+        geo = hou.Geometry()
+        point = geo.createPoint()
+
+        group1 = geo.createPointGroup("group1")
+        group1.add(point)
+
+        group2 = geo.createPointGroup("group2")
+
+        result = houdini_toolbox.inline.api.group_bounding_boxes([group1, group2])
+
+        assert result[0].tolist() == [[0, 0, 0], [0, 0, 0]]
+        assert numpy.isnan(result[1]).all()
+
+
 class Test_group_size:
     """Test houdini_toolbox.inline.api.group_size."""
 
@@ -2162,6 +2926,218 @@ class Test_group_size:
         assert houdini_toolbox.inline.api.group_size(group) == 52
 
 
+class Test_group_membership:
+    """Test houdini_toolbox.inline.api.group_membership."""
+
+    def test_point_group(self, points_geo):
+        """Test getting point group membership."""
+        geo = points_geo
+
+        group = geo.createPointGroup("test")
+        group.add(geo.globPoints("1 3 4 9"))
+
+        result = houdini_toolbox.inline.api.group_membership(group)
+
+        assert result.dtype == bool
+        assert numpy.flatnonzero(result).tolist() == [1, 3, 4, 9]
+
+    def test_packed(self, points_geo):
+        """Test getting packed point group membership."""
+        geo = points_geo
+
+        group = geo.createPointGroup("test")
+        group.add(geo.globPoints("1 3 4 9"))
+
+        result = houdini_toolbox.inline.api.group_membership(group, packed=True)
+
+        assert result.dtype == numpy.uint8
+        assert len(result) == 2
+        assert numpy.flatnonzero(numpy.unpackbits(result, count=10)).tolist() == [
+            1,
+            3,
+            4,
+            9,
+        ]
+
+    def test_prim_group(self):
+        """Test getting prim group membership."""
+        geo = hou.Geometry()
+
+        for _ in range(4):
+            geo.createPolygon()
+
+        group = geo.createPrimGroup("test")
+        group.add(geo.globPrims("0 2"))
+
+        result = houdini_toolbox.inline.api.group_membership(group)
+
+        assert result.tolist() == [True, False, True, False]
+
+    def test_edge_group(self, points_geo):
+        """Test getting membership of an edge group."""
+        geo = points_geo
+
+        group = geo.createEdgeGroup("test")
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.group_membership(group)
+
+
+class Test_set_group_membership:
+    """Test houdini_toolbox.inline.api.set_group_membership."""
+
+    def test_read_only(self, points_geo):
+        """Test when the geometry is read only."""
+        geo = points_geo
+        geo.createPointGroup("test")
+
+        geo = geo.freeze(True)
+        group = geo.findPointGroup("test")
+
+        with pytest.raises(hou.GeometryPermissionError):
+            houdini_toolbox.inline.api.set_group_membership(
+                group, numpy.zeros(10, dtype=bool)
+            )
+
+    def test_size_mismatch(self, points_geo):
+        """Test when the array size does not match the number of points."""
+        geo = points_geo
+        group = geo.createPointGroup("test")
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.set_group_membership(
+                group, numpy.zeros(5, dtype=bool)
+            )
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.set_group_membership(
+                group, numpy.zeros(1, dtype=numpy.uint8), packed=True
+            )
+
+    def test_point_group(self, points_geo):
+        """Test setting point group membership."""
+        geo = points_geo
+
+        group = geo.createPointGroup("test")
+        group.add(geo.globPoints("0 1"))
+
+        values = numpy.zeros(10, dtype=bool)
+        values[[2, 5, 7]] = True
+
+        houdini_toolbox.inline.api.set_group_membership(group, values)
+
+        assert group.points() == geo.globPoints("2 5 7")
+
+    def test_packed(self, points_geo):
+        """Test setting packed point group membership."""
+        geo = points_geo
+
+        group = geo.createPointGroup("test")
+
+        values = numpy.zeros(10, dtype=bool)
+        values[[0, 8, 9]] = True
+
+        houdini_toolbox.inline.api.set_group_membership(
+            group, numpy.packbits(values), packed=True
+        )
+
+        assert group.points() == geo.globPoints("0 8 9")
+
+    def test_vertex_group(self, points_geo):
+        """Test setting vertex group membership."""
+        geo = points_geo
+
+        prim = geo.createPolygon()
+
+        for point in geo.points()[:4]:
+            prim.addVertex(point)
+
+        group = geo.createVertexGroup("test")
+
+        houdini_toolbox.inline.api.set_group_membership(
+            group, numpy.array([0, 1, 1, 0])
+        )
+
+        assert group.vertices() == (prim.vertex(1), prim.vertex(2))
+        assert houdini_toolbox.inline.api.group_membership(group).tolist() == [
+            False,
+            True,
+            True,
+            False,
+        ]
+
+
+class Test_edge_group_points:
+    """Test houdini_toolbox.inline.api.edge_group_points."""
+
+    def test_not_edge_group(self):
+        """Test passing a group that is not an edge group."""
+        geo = hou.Geometry()
+        group = geo.createPointGroup("test")
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.edge_group_points(group)
+
+    def test(self, polyline_geo):
+        """Test getting edge group points."""
+        geo = polyline_geo
+
+        group = geo.createEdgeGroup("test")
+        group.add(geo.globEdges("p0-1 p2-3"))
+
+        result = houdini_toolbox.inline.api.edge_group_points(group)
+
+        assert result.shape == (2, 2)
+        assert sorted(sorted(pair) for pair in result.tolist()) == [[0, 1], [2, 3]]
+
+
+class Test_set_edge_group_points:
+    """Test houdini_toolbox.inline.api.set_edge_group_points."""
+
+    def test_read_only(self, polyline_geo):
+        """Test when the geometry is read only."""
+        geo = polyline_geo
+        geo.createEdgeGroup("test")
+
+        geo = geo.freeze(True)
+        group = geo.findEdgeGroup("test")
+
+        with pytest.raises(hou.GeometryPermissionError):
+            houdini_toolbox.inline.api.set_edge_group_points(group, [[0, 1]])
+
+    def test_invalid_shape(self, polyline_geo):
+        """Test passing points that are not pairs."""
+        geo = polyline_geo
+        group = geo.createEdgeGroup("test")
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.set_edge_group_points(group, [0, 1, 2])
+
+    def test_invalid_index(self, polyline_geo):
+        """Test passing an invalid point number."""
+        geo = polyline_geo
+        group = geo.createEdgeGroup("test")
+
+        with pytest.raises(IndexError):
+            houdini_toolbox.inline.api.set_edge_group_points(group, [[0, 10]])
+
+    def test(self, polyline_geo):
+        """Test setting edge group points."""
+        geo = polyline_geo
+
+        group = geo.createEdgeGroup("test")
+        group.add(geo.globEdges("p0-1"))
+
+        houdini_toolbox.inline.api.set_edge_group_points(
+            group, numpy.array([[1, 2], [2, 3]])
+        )
+
+        result = houdini_toolbox.inline.api.edge_group_points(group)
+
+        assert len(group.edges()) == 2
+        assert sorted(sorted(pair) for pair in result.tolist()) == [[1, 2], [2, 3]]
+
+
 class Test_toggle_group_entries:
     """Test houdini_toolbox.inline.api.toggle_group_entries."""
 
@@ -2686,6 +3662,89 @@ def test_bounding_box_volume():
     assert houdini_toolbox.inline.api.bounding_box_volume(bbox) == 42
 
 
+class Test_batch_bounding_box_functions:
+    """Test the houdini_toolbox.inline.api batch bounding box functions."""
+
+    BBOXES1 = numpy.array(
+        [
+            [[0, 0, 0], [1, 1, 1]],
+            [[2, 2, 2], [3, 3, 3]],
+            [[-1, -1.75, -3], [1, 1.75, 3]],
+        ]
+    )
+
+    BBOXES2 = numpy.array(
+        [
+            [[-1, -1, -1], [2, 2, 2]],
+            [[5, 5, 5], [6, 6, 6]],
+            [[0, 0, 0], [4, 4, 4]],
+        ]
+    )
+
+    def test_invalid_shape(self):
+        """Test passing arrays which are not bounding boxes."""
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.batch_bounding_box_area(numpy.zeros((2, 3)))
+
+    def test_is_inside(self):
+        """Test houdini_toolbox.inline.api.batch_bounding_box_is_inside."""
+        result = houdini_toolbox.inline.api.batch_bounding_box_is_inside(
+            self.BBOXES1, self.BBOXES2
+        )
+
+        assert result.tolist() == [True, False, False]
+
+    def test_intersect(self):
+        """Test houdini_toolbox.inline.api.batch_bounding_boxes_intersect."""
+        result = houdini_toolbox.inline.api.batch_bounding_boxes_intersect(
+            self.BBOXES1, self.BBOXES2
+        )
+
+        assert result.tolist() == [True, False, True]
+
+        # Test every pair of boxes.
+        result = houdini_toolbox.inline.api.batch_bounding_boxes_intersect(
+            self.BBOXES1[:, None], self.BBOXES2[None]
+        )
+
+        assert result.shape == (3, 3)
+
+        for i, bbox1 in enumerate(self.BBOXES1):
+            for j, bbox2 in enumerate(self.BBOXES2):
+                expected = houdini_toolbox.inline.api.bounding_boxes_intersect(
+                    hou.BoundingBox(*bbox1.flatten()),
+                    hou.BoundingBox(*bbox2.flatten()),
+                )
+
+                assert result[i, j] == expected
+
+    def test_compute_intersection(self):
+        """Test houdini_toolbox.inline.api.batch_compute_bounding_box_intersection."""
+        (
+            result,
+            intersects,
+        ) = houdini_toolbox.inline.api.batch_compute_bounding_box_intersection(
+            self.BBOXES1, self.BBOXES2
+        )
+
+        assert intersects.tolist() == [True, False, True]
+        assert result.shape == (3, 2, 3)
+        assert result[0].tolist() == [[0, 0, 0], [1, 1, 1]]
+        assert result[2].tolist() == [[0, 0, 0], [1, 1.75, 3]]
+
+    def test_area(self):
+        """Test houdini_toolbox.inline.api.batch_bounding_box_area."""
+        result = houdini_toolbox.inline.api.batch_bounding_box_area(self.BBOXES1)
+
+        assert result.tolist() == [6, 6, 80]
+
+    def test_volume(self):
+        """Test houdini_toolbox.inline.api.batch_bounding_box_volume."""
+        result = houdini_toolbox.inline.api.batch_bounding_box_volume(self.BBOXES1)
+
+        assert result.tolist() == [1, 1, 42]
+
+
 # =========================================================================
 # PARMS
 # =========================================================================
@@ -3053,6 +4112,95 @@ def test_eval_multiparm_instance():
         houdini_toolbox.inline.api.eval_multiparm_instance(node, "vecparm#", 10)
 
 
+class Test_eval_multiparm_instances:
+    """Test houdini_toolbox.inline.api.eval_multiparm_instances."""
+
+    def test_invalid_names(self):
+        """Test passing invalid names."""
+        node = OBJ.node("test_eval_multiparm_instance/null")
+
+        # Test name with no tokens.
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.eval_multiparm_instances(node, "base")
+
+        # Test name which does not exist.
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.eval_multiparm_instances(node, "foo#")
+
+    def test_invalid_parent_indices(self):
+        """Test passing the wrong number of parent indices."""
+        node = OBJ.node("test_eval_multiparm_instance/null")
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.eval_multiparm_instances(node, "leaf#_#")
+
+        with pytest.raises(ValueError):
+            houdini_toolbox.inline.api.eval_multiparm_instances(
+                node, "vecparm#", parent_indices=[0]
+            )
+
+    def test_invalid_indices(self):
+        """Test passing indices which do not exist."""
+        node = OBJ.node("test_eval_multiparm_instance/null")
+
+        with pytest.raises(IndexError):
+            houdini_toolbox.inline.api.eval_multiparm_instances(
+                node, "vecparm#", [0, 10]
+            )
+
+    def test_all_instances(self):
+        """Test evaluating all instances."""
+        node = OBJ.node("test_eval_multiparm_instance/null")
+
+        result = houdini_toolbox.inline.api.eval_multiparm_instances(node, "vecparm#")
+
+        assert result == ((1.1, 2.2, 3.3, 4.4), (5.5, 6.6, 7.7, 8.8))
+
+        result = houdini_toolbox.inline.api.eval_multiparm_instances(
+            node, "leaf#_#", parent_indices=[1]
+        )
+
+        assert result == (5, 6, 7, 8, 9)
+
+    def test_index_range(self):
+        """Test evaluating a range of instances."""
+        node = OBJ.node("test_eval_multiparm_instance/null")
+
+        result = houdini_toolbox.inline.api.eval_multiparm_instances(
+            node, "leaf#_#", range(1, 3), parent_indices=[0]
+        )
+
+        assert result == (2, 3)
+
+        result = houdini_toolbox.inline.api.eval_multiparm_instances(
+            node, "leaf#_#", [1, 2], parent_indices=[0], raw_indices=True
+        )
+
+        assert result == (1, 2)
+
+        result = houdini_toolbox.inline.api.eval_multiparm_instances(
+            node, "string#", []
+        )
+
+        assert result == ()
+
+    def test_cache(self):
+        """Test that resolved multiparm data is cached."""
+        node = OBJ.node("test_eval_multiparm_instance/null")
+
+        houdini_toolbox.inline.api.clear_multiparm_cache()
+
+        houdini_toolbox.inline.api.eval_multiparm_instances(node, "vecparm#")
+
+        key = houdini_toolbox.inline.api._MULTIPARM_NODE_KEYS[node.sessionId()]
+
+        assert "vecparm#" in houdini_toolbox.inline.api._MULTIPARM_RESOLVERS[key]
+
+        houdini_toolbox.inline.api.clear_multiparm_cache()
+
+        assert not houdini_toolbox.inline.api._MULTIPARM_RESOLVERS
+
+
 def test_unexpanded_string_multiparm_instance():
     """Test houdini_toolbox.inline.api.unexpanded_string_multiparm_instance."""
     node = OBJ.node("test_unexpanded_string_multiparm_instance/null")
@@ -3145,6 +4293,91 @@ def test_disconnect_all_outputs():
     assert not node.outputs()
 
 
+class Test_get_parm_snapshot:
+    """Test houdini_toolbox.inline.api.get_parm_snapshot."""
+
+    def test(self):
+        """Test getting a snapshot of a node and its children."""
+        geo = OBJ.createNode("geo")
+        null = geo.createNode("null")
+
+        geo.parm("tx").set(2)
+        geo.parm("ty").setExpression("$F")
+        null.parm("copyinput").set(0)
+
+        result = houdini_toolbox.inline.api.get_parm_snapshot(geo)
+
+        paths = result["path"].tolist()
+
+        for column in result.values():
+            assert len(column) == len(paths)
+
+        tx_index = paths.index(f"{geo.path()}/tx")
+        assert result["value"][tx_index] == 2
+        assert not result["has_channel"][tx_index]
+
+        ty_index = paths.index(f"{geo.path()}/ty")
+        assert result["raw_value"][ty_index] == "$F"
+        assert result["has_channel"][ty_index]
+        assert result["is_time_dependent"][ty_index]
+
+        assert f"{null.path()}/copyinput" in paths
+
+        # Strings do not have numeric values.
+        assert all(numpy.isnan(result["value"][result["is_string"]]))
+
+        result = houdini_toolbox.inline.api.get_parm_snapshot(geo, recurse=False)
+
+        assert f"{null.path()}/copyinput" not in result["path"].tolist()
+
+        geo.destroy()
+
+    def test_long_string(self):
+        """Test a snapshot containing a long string parameter value."""
+        geo = OBJ.createNode("geo")
+
+        value = "a" * 100000
+        geo.parm("shop_materialpath").set(value)
+
+        result = houdini_toolbox.inline.api.get_parm_snapshot(geo)
+
+        assert result["path"].dtype == object
+        assert result["raw_value"].dtype == object
+
+        index = result["path"].tolist().index(f"{geo.path()}/shop_materialpath")
+        assert result["raw_value"][index] == value
+
+        assert all(isinstance(raw_value, str) for raw_value in result["raw_value"])
+
+        geo.destroy()
+
+
+def test_diff_parm_snapshots():
+    """Test houdini_toolbox.inline.api.diff_parm_snapshots."""
+    geo = OBJ.createNode("geo")
+    null = geo.createNode("null")
+
+    snapshot1 = houdini_toolbox.inline.api.get_parm_snapshot(geo)
+
+    geo.parm("tx").set(5)
+    geo.parm("ty").setExpression("$F")
+
+    null.destroy()
+    null = geo.createNode("null", "other")
+
+    snapshot2 = houdini_toolbox.inline.api.get_parm_snapshot(geo)
+
+    added, removed, changed = houdini_toolbox.inline.api.diff_parm_snapshots(
+        snapshot1, snapshot2
+    )
+
+    assert f"{null.path()}/copyinput" in added.tolist()
+    assert f"{geo.path()}/null1/copyinput" in removed.tolist()
+    assert changed.tolist() == [f"{geo.path()}/tx", f"{geo.path()}/ty"]
+
+    geo.destroy()
+
+
 def test_disconnect_all_inputs():
     """Test houdini_toolbox.inline.api.disconnect_all_outputs."""
     node = OBJ.node("test_disconnect_all_inputs/merge")
@@ -3534,6 +4767,27 @@ def test_asset_file_meta_source():
     assert houdini_toolbox.inline.api.asset_file_meta_source("/some/fake/pat") is None
 
 
+@pytest.mark.parametrize(
+    "path",
+    [
+        "$HH/otls/OPlibSop.hda",
+        "$HH/otls/../otls/OPlibSop.hda",
+        "$HH/otls//OPlibSop.hda",
+    ],
+)
+def test_asset_file_meta_source_unnormalized(path):
+    """Test houdini_toolbox.inline.api.asset_file_meta_source with paths which
+    are not expanded or normalized.
+
+    """
+    target = "Scanned Asset Library Directories"
+
+    assert houdini_toolbox.inline.api.asset_file_meta_source(path) == target
+    assert houdini_toolbox.inline.api.batch_asset_file_meta_source([path]) == (
+        target,
+    )
+
+
 def test_get_definition_meta_source():
     """Test houdini_toolbox.inline.api.get_definition_meta_source."""
     target = "Scanned Asset Library Directories"
@@ -3546,6 +4800,32 @@ def test_get_definition_meta_source():
     )
 
 
+def test_batch_asset_file_meta_source():
+    """Test houdini_toolbox.inline.api.batch_asset_file_meta_source."""
+    target = "Scanned Asset Library Directories"
+
+    path = hou.text.expandString("$HH/otls/OPlibSop.hda")
+
+    result = houdini_toolbox.inline.api.batch_asset_file_meta_source(
+        [path, "/some/fake/pat", path]
+    )
+
+    assert result == (target, None, target)
+
+
+def test_batch_get_definition_meta_source():
+    """Test houdini_toolbox.inline.api.batch_get_definition_meta_source."""
+    target = "Scanned Asset Library Directories"
+
+    node_type = hou.nodeType(hou.sopNodeTypeCategory(), "explodedview")
+
+    result = houdini_toolbox.inline.api.batch_get_definition_meta_source(
+        [node_type.definition()] * 2
+    )
+
+    assert result == (target, target)
+
+
 def test_libraries_in_meta_source():
     """Test houdini_toolbox.inline.api.libraries_in_meta_source."""
     libs = houdini_toolbox.inline.api.libraries_in_meta_source(
@@ -3593,3 +4873,48 @@ def test_is_dummy_definition():
 
     # Destroy the dummy definition.
     node_type.definition().destroy()
+
+
+def test_batch_is_dummy_definition():
+    """Test houdini_toolbox.inline.api.batch_is_dummy_definition."""
+    geo = OBJ.createNode("geo")
+    subnet = geo.createNode("subnet")
+
+    asset = subnet.createDigitalAsset("batchdummyop", "Embedded", "Batch Dummy")
+    node_type = asset.type()
+
+    other_definition = hou.nodeType(
+        hou.sopNodeTypeCategory(), "explodedview"
+    ).definition()
+
+    result = houdini_toolbox.inline.api.batch_is_dummy_definition(
+        [node_type.definition(), other_definition]
+    )
+
+    assert result == (False, False)
+
+    # Destroying the definition should clear the cached index.
+    node_type.definition().destroy()
+
+    result = houdini_toolbox.inline.api.batch_is_dummy_definition(
+        [node_type.definition(), other_definition]
+    )
+
+    assert result == (True, False)
+
+    asset.destroy()
+    node_type.definition().destroy()
+    geo.destroy()
+
+
+def test_clear_hda_index():
+    """Test houdini_toolbox.inline.api.clear_hda_index."""
+    houdini_toolbox.inline.api.libraries_in_meta_source(
+        "Scanned Asset Library Directories"
+    )
+
+    assert houdini_toolbox.inline.api._HDA_INDEX
+
+    houdini_toolbox.inline.api.clear_hda_index()
+
+    assert not houdini_toolbox.inline.api._HDA_INDEX
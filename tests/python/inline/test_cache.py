@@ -0,0 +1,252 @@
+"""Tests for houdini_toolbox.inline.cache module."""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Library
+import ctypes
+import json
+import os
+import types
+
+# Third Party
+import pytest
+
+# Houdini Toolbox
+from houdini_toolbox.inline import cache
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+
+class Test_install_cached_library:
+    """Test houdini_toolbox.inline.cache.install_cached_library."""
+
+    def _prime(self, mocker, tmp_path):
+        """Create a cached library and a local inlinecpp directory."""
+        mocker.patch("hou.applicationVersionString", return_value="1.2.3")
+        mocker.patch("hou.getenv", return_value=str(tmp_path / "prefs"))
+
+        mock_library = mocker.MagicMock()
+        mock_library.name = "cpp_methods_core"
+        mock_library.content_hash = "abc"
+        mock_library.function_names = ("hashString",)
+
+        local_dir = tmp_path / "prefs" / "inlinecpp"
+        local_dir.mkdir(parents=True)
+        (local_dir / "cpp_methods_core_1.so").write_bytes(b"compiled")
+
+        cache_dir = str(tmp_path / "shared")
+
+        library_path = cache.prime_library(mock_library, cache_dir)
+
+        os.remove(str(local_dir / "cpp_methods_core_1.so"))
+
+        return mock_library, cache_dir, library_path, local_dir
+
+    def test(self, mocker, tmp_path):
+        """Test installing a cached library."""
+        mock_library, cache_dir, library_path, local_dir = self._prime(
+            mocker, tmp_path
+        )
+
+        assert library_path == os.path.join(
+            cache_dir, "1.2.3", "cpp_methods_core", "abc"
+        )
+
+        with open(
+            os.path.join(library_path, "manifest.json"), encoding="utf-8"
+        ) as handle:
+            manifest = json.load(handle)
+
+        assert list(manifest["files"]) == ["cpp_methods_core_1.so"]
+
+        assert cache.install_cached_library(mock_library, cache_dir)
+
+        assert (local_dir / "cpp_methods_core_1.so").read_bytes() == b"compiled"
+
+    def test_no_cache_dir(self, mocker):
+        """Test when there is no cache directory set."""
+        mocker.patch.dict(os.environ, {}, clear=True)
+
+        assert not cache.install_cached_library(mocker.MagicMock())
+
+    def test_hash_mismatch(self, mocker, tmp_path):
+        """Test that libraries for different sources are not installed."""
+        mock_library, cache_dir, _, local_dir = self._prime(mocker, tmp_path)
+
+        mock_library.content_hash = "def"
+
+        assert not cache.install_cached_library(mock_library, cache_dir)
+        assert not os.listdir(str(local_dir))
+
+    def test_failed_verification(self, mocker, tmp_path):
+        """Test that modified files are not installed."""
+        mock_library, cache_dir, library_path, local_dir = self._prime(
+            mocker, tmp_path
+        )
+
+        with open(os.path.join(library_path, "cpp_methods_core_1.so"), "wb") as handle:
+            handle.write(b"modified")
+
+        assert not cache.install_cached_library(mock_library, cache_dir)
+        assert not os.listdir(str(local_dir))
+
+    def test_corrupted_file(self, mocker, tmp_path):
+        """Test that priming replaces a cached library with corrupted files."""
+        mock_library, cache_dir, library_path, local_dir = self._prime(
+            mocker, tmp_path
+        )
+
+        cached_path = os.path.join(library_path, "cpp_methods_core_1.so")
+
+        with open(cached_path, "wb") as handle:
+            handle.write(b"corrupt")
+
+        (local_dir / "cpp_methods_core_1.so").write_bytes(b"compiled")
+
+        cache.prime_library(mock_library, cache_dir)
+
+        with open(cached_path, "rb") as handle:
+            assert handle.read() == b"compiled"
+
+        os.remove(str(local_dir / "cpp_methods_core_1.so"))
+
+        assert cache.install_cached_library(mock_library, cache_dir)
+        assert (local_dir / "cpp_methods_core_1.so").read_bytes() == b"compiled"
+
+    def test_missing_file(self, mocker, tmp_path):
+        """Test that priming replaces a cached library with missing files."""
+        mock_library, cache_dir, library_path, local_dir = self._prime(
+            mocker, tmp_path
+        )
+
+        os.remove(os.path.join(library_path, "cpp_methods_core_1.so"))
+
+        assert not cache.install_cached_library(mock_library, cache_dir)
+
+        (local_dir / "cpp_methods_core_1.so").write_bytes(b"compiled")
+
+        cache.prime_library(mock_library, cache_dir)
+
+        assert os.path.isfile(os.path.join(library_path, "cpp_methods_core_1.so"))
+
+
+class Test_prime_library:
+    """Test houdini_toolbox.inline.cache.prime_library."""
+
+    def test_loaded_file(self, mocker, tmp_path):
+        """Test that only the file the library was loaded from is cached."""
+        mocker.patch("hou.applicationVersionString", return_value="1.2.3")
+        mocker.patch("hou.getenv", return_value=str(tmp_path / "prefs"))
+
+        local_dir = tmp_path / "prefs" / "inlinecpp"
+        local_dir.mkdir(parents=True)
+        (local_dir / "cpp_methods_core_1.so").write_bytes(b"old")
+        (local_dir / "cpp_methods_core_2.so").write_bytes(b"compiled")
+
+        mock_dll = mocker.MagicMock(spec=ctypes.CDLL)
+        mock_dll._name = str(local_dir / "cpp_methods_core_2.so")
+
+        mock_library = mocker.MagicMock()
+        mock_library.name = "cpp_methods_core"
+        mock_library.content_hash = "abc"
+        mock_library.function_names = ("hashString",)
+        mock_library.library = types.SimpleNamespace(_dll=mock_dll, hashString=None)
+
+        library_path = cache.prime_library(mock_library, str(tmp_path / "shared"))
+
+        assert sorted(os.listdir(library_path)) == [
+            "cpp_methods_core_2.so",
+            "manifest.json",
+        ]
+
+    def test_compiled_file(self, mocker, tmp_path):
+        """Test that the file compiled when loading the library is cached."""
+        mocker.patch("hou.applicationVersionString", return_value="1.2.3")
+        mocker.patch("hou.getenv", return_value=str(tmp_path / "prefs"))
+
+        local_dir = tmp_path / "prefs" / "inlinecpp"
+        local_dir.mkdir(parents=True)
+        (local_dir / "cpp_methods_core_1.so").write_bytes(b"old")
+
+        class _Library:
+            """Library which compiles a new file when it is loaded."""
+
+            def __getattr__(self, name):
+                (local_dir / "cpp_methods_core_2.so").write_bytes(b"compiled")
+
+        mock_library = mocker.MagicMock()
+        mock_library.name = "cpp_methods_core"
+        mock_library.content_hash = "abc"
+        mock_library.function_names = ("hashString",)
+        mock_library.library = _Library()
+
+        library_path = cache.prime_library(mock_library, str(tmp_path / "shared"))
+
+        assert sorted(os.listdir(library_path)) == [
+            "cpp_methods_core_2.so",
+            "manifest.json",
+        ]
+
+    def test_concurrent_prime(self, mocker, tmp_path):
+        """Test priming when another process stores the library first."""
+        mocker.patch("hou.applicationVersionString", return_value="1.2.3")
+        mocker.patch("hou.getenv", return_value=str(tmp_path / "prefs"))
+
+        local_dir = tmp_path / "prefs" / "inlinecpp"
+        local_dir.mkdir(parents=True)
+        (local_dir / "cpp_methods_core_1.so").write_bytes(b"compiled")
+
+        mock_library = mocker.MagicMock()
+        mock_library.name = "cpp_methods_core"
+        mock_library.content_hash = "abc"
+        mock_library.function_names = ("hashString",)
+
+        cache_dir = str(tmp_path / "shared")
+
+        library_path = cache.prime_library(mock_library, cache_dir)
+
+        winner_path = str(tmp_path / "winner")
+        os.replace(library_path, winner_path)
+
+        # Simulate the other process publishing its entry just before this one.
+        replace = os.replace
+
+        def _replace(source, target):
+            if target == library_path and not os.path.isdir(library_path):
+                replace(winner_path, library_path)
+
+            replace(source, target)
+
+        mocker.patch("os.replace", side_effect=_replace)
+
+        assert cache.prime_library(mock_library, cache_dir) == library_path
+
+        assert sorted(os.listdir(library_path)) == [
+            "cpp_methods_core_1.so",
+            "manifest.json",
+        ]
+        assert not [
+            name for name in os.listdir(os.path.dirname(library_path)) if name != "abc"
+        ]
+
+    def test_ambiguous_files(self, mocker, tmp_path):
+        """Test priming when the loaded file cannot be determined."""
+        mocker.patch("hou.applicationVersionString", return_value="1.2.3")
+        mocker.patch("hou.getenv", return_value=str(tmp_path / "prefs"))
+
+        local_dir = tmp_path / "prefs" / "inlinecpp"
+        local_dir.mkdir(parents=True)
+        (local_dir / "cpp_methods_core_1.so").write_bytes(b"old")
+        (local_dir / "cpp_methods_core_2.so").write_bytes(b"compiled")
+
+        mock_library = mocker.MagicMock()
+        mock_library.name = "cpp_methods_core"
+        mock_library.content_hash = "abc"
+        mock_library.function_names = ("hashString",)
+
+        with pytest.raises(RuntimeError, match="Could not determine"):
+            cache.prime_library(mock_library, str(tmp_path / "shared"))
@@ -8,6 +8,7 @@
 import ctypes
 
 # Third Party
+import numpy
 import pytest
 
 # Houdini Toolbox
@@ -59,6 +60,64 @@ def test_build_c_int_array():
     assert isinstance(result, expected_type)
 
 
+def test_build_c_double_array_numpy():
+    """Test houdini_toolbox.inline.utils.build_c_double_array with numpy arrays."""
+    values = numpy.arange(5, dtype=numpy.float64)
+
+    result = utils.build_c_double_array(values)
+
+    assert list(result) == values.tolist()
+
+    # Contiguous float64 arrays share their memory.
+    result[0] = 10
+
+    assert values[0] == 10
+
+    # Other types are converted.
+    result = utils.build_c_double_array(numpy.arange(5, dtype=numpy.float32))
+
+    assert list(result) == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_build_c_int_array_numpy():
+    """Test houdini_toolbox.inline.utils.build_c_int_array with numpy arrays."""
+    values = numpy.arange(5, dtype=numpy.intc)
+
+    result = utils.build_c_int_array(values)
+
+    assert list(result) == values.tolist()
+
+    expected_type = type((ctypes.c_int * len(values))())
+    assert isinstance(result, expected_type)
+
+    # Contiguous C int arrays share their memory.
+    result[0] = 10
+
+    assert values[0] == 10
+
+    # Non-contiguous and other types are converted.
+    result = utils.build_c_int_array(numpy.arange(10, dtype=numpy.int64)[::2])
+
+    assert list(result) == [0, 2, 4, 6, 8]
+
+
+def test_build_c_int_array_numpy_invalid():
+    """Test houdini_toolbox.inline.utils.build_c_int_array with invalid arrays."""
+    with pytest.raises(ValueError):
+        utils.build_c_int_array(numpy.array([1.5, 2.0]))
+
+    with pytest.raises(ValueError):
+        utils.build_c_int_array(numpy.array([0, 2 ** 40], dtype=numpy.int64))
+
+    with pytest.raises(ValueError):
+        utils.build_c_int_array(numpy.array([2 ** 31], dtype=numpy.uint32))
+
+    # Values which fit are converted.
+    result = utils.build_c_int_array(numpy.array([-(2 ** 31), 2 ** 31 - 1]))
+
+    assert list(result) == [-(2 ** 31), 2 ** 31 - 1]
+
+
 def test_build_c_string_array():
     """Test houdini_toolbox.inline.utils.build_c_string_array."""
 